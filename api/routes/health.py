@@ -12,5 +12,9 @@ async def health_check():
     """Check if the API is healthy and all services are available."""
     return {
         "status": "healthy",
-        "services": OrchestratorService.get_status()
+        "services": OrchestratorService.get_status(),
+        "indexes": OrchestratorService.get_index_status(),
+        "retrieval_cache": OrchestratorService.get_retrieval_cache_stats(),
+        "warmup": OrchestratorService.get_warmup_status(),
+        "llm": OrchestratorService.get_llm_gateway_stats()
     }
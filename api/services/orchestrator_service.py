@@ -16,6 +16,8 @@ class OrchestratorService:
     qa_transform_orchestrator = None
     regulation_revision_orchestrator = None
     update_revision_orchestrator = None
+    # Background retriever warm-up started after initialization
+    warmup = None
     
     @classmethod
     async def initialize(cls):
@@ -30,6 +32,30 @@ class OrchestratorService:
         await cls._init_qa_transform()
         await cls._init_regulation_revision()
         await cls._init_update_revision()
+        cls._start_warmup()
+
+    @classmethod
+    def _start_warmup(cls):
+        """Warm the FAS/SS retriever caches with the popular queries without delaying startup."""
+        orchestrator = cls.regulation_revision_orchestrator
+        if orchestrator is None:
+            return
+        try:
+            from src.core.config import settings
+            from src.core.warmup import RetrieverWarmup
+            from src.orchestators.orch_drafting_shariah_compliant_regulations import SS_CONTEXT_OPTIONS
+            if not settings.WARMUP_ENABLED:
+                return
+            # Warm the SS cache with the options the orchestrator queries it with, so keys match
+            cls.warmup = RetrieverWarmup(
+                {"fas": orchestrator.fas_retriever, "ss": orchestrator.ss_retriever},
+                options={"ss": SS_CONTEXT_OPTIONS}
+            )
+            cls.warmup.start()
+            logger.info(f"Warming up retrievers with {cls.warmup.total} popular queries in the background")
+        except Exception as e:
+            logger.error(f"Failed to start retriever warm-up: {str(e)}")
+            cls.warmup = None
         
     @classmethod
     async def _init_qa_transform(cls):
@@ -82,6 +108,7 @@ class OrchestratorService:
         cls.qa_transform_orchestrator = None
         cls.regulation_revision_orchestrator = None
         cls.update_revision_orchestrator = None
+        cls.warmup = None
     
     @classmethod
     def get_status(cls) -> Dict[str, bool]:
@@ -92,6 +119,41 @@ class OrchestratorService:
             "update_revision": cls.update_revision_orchestrator is not None
         }
     
+    @classmethod
+    def get_retrieval_cache_stats(cls) -> Dict[str, Any]:
+        """Get result cache counters of the FAS and SS retrievers."""
+        orchestrator = cls.regulation_revision_orchestrator
+        if orchestrator is None:
+            return {}
+        return {
+            "fas": orchestrator.fas_retriever.cache_stats(),
+            "ss": orchestrator.ss_retriever.cache_stats()
+        }
+    
+    @classmethod
+    def get_index_status(cls) -> Dict[str, Any]:
+        """Get connection status of the FAS and SS vector indexes."""
+        orchestrator = cls.regulation_revision_orchestrator
+        if orchestrator is None:
+            return {}
+        return {
+            "fas": orchestrator.fas_retriever.index_status(),
+            "ss": orchestrator.ss_retriever.index_status()
+        }
+    
+    @classmethod
+    def get_llm_gateway_stats(cls) -> Dict[str, Any]:
+        """Get per-model call, retry and throttling counters of the shared LLM gateway."""
+        from src.core.llm_gateway import get_llm_gateway
+        return get_llm_gateway().stats()
+    
+    @classmethod
+    def get_warmup_status(cls) -> Dict[str, Any]:
+        """Get progress and coverage of the retriever warm-up."""
+        if cls.warmup is None:
+            return {"state": "disabled"}
+        return cls.warmup.status()
+    
     @classmethod
     def get_qa_transform_orchestrator(cls):
         """Get QA Transform orchestrator."""
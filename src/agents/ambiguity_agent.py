@@ -3,9 +3,9 @@ Ambiguity Detection Agent
 Purpose: Analyzes bank rules and policies for ambiguous language against AAOIFI standards.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ..core.llm_gateway import get_llm_gateway
 from ..core.config import settings
 import json
 
@@ -31,7 +31,7 @@ class AmbiguityDetectionAgent:
     
     def __init__(self):
         """Initialize the Ambiguity Detection agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are an Ambiguity Detection Agent for an Islamic Financial Compliance Advisor.  
 Your role is to review a bank's internal rule or policy and determine whether it contains ambiguous, vague, or underspecified language, especially in light of:
@@ -87,34 +87,45 @@ Always output strict, valid JSON, and make sure explanations are short but clear
             AmbiguityAnalysisResult object containing ambiguity analysis
         """
         try:
-            # Format the user message
-            user_message = self._format_user_message(input_data)
-            
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.2,
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse the response
-            analysis_data = response.choices[0].message.content
-            # Try to parse as JSON first
-            try:
-                json_data = json.loads(analysis_data)
-                return AmbiguityAnalysisResult.parse_obj(json_data)
-            except json.JSONDecodeError:
-                # If not valid JSON, try to parse as string
-                return AmbiguityAnalysisResult.parse_raw(analysis_data)
-            
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
+        except Exception as e:
+            print(f"Error during ambiguity analysis: {e}")
+            raise
+
+    async def aanalyze_ambiguity(self, input_data: AmbiguityAnalysisInput) -> AmbiguityAnalysisResult:
+        """Async counterpart of analyze_ambiguity; awaits the gateway instead of blocking a thread."""
+        try:
+            response = await self.client.achat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
         except Exception as e:
             print(f"Error during ambiguity analysis: {e}")
             raise
 
+    def _build_request(self, input_data: AmbiguityAnalysisInput) -> Dict[str, Any]:
+        """Build the chat-completion request for one input."""
+        return dict(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self._format_user_message(input_data)}
+            ],
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+
+    def _parse_response(self, response) -> AmbiguityAnalysisResult:
+        """Parse the model's answer into the result model."""
+        analysis_data = response.choices[0].message.content
+        # Try to parse as JSON first
+        try:
+            json_data = json.loads(analysis_data)
+            return AmbiguityAnalysisResult.parse_obj(json_data)
+        except json.JSONDecodeError:
+            # If not valid JSON, try to parse as string
+            return AmbiguityAnalysisResult.parse_raw(analysis_data)
+
     def _format_user_message(self, input_data: AmbiguityAnalysisInput) -> str:
         """Format the input data into a structured message for the LLM."""
         return f"""
@@ -0,0 +1,705 @@
+"""
+Base Document Retriever
+Purpose: Shared retrieval logic for the FAS and SS retrievers, independent of the vector index backend.
+"""
+
+import heapq
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Type, Union
+from pydantic import BaseModel
+from ..core.chunk_expansion import ChunkExpander
+from ..core.config import settings
+from ..core.embeddings import get_embedding_service, shorten_embedding
+from ..core.lexical_index import BM25Index
+from ..core.mapped_index import MappedVectorIndex
+from ..core.reranking import adaptive_cutoff, mmr_select, reciprocal_rank_fusion
+from ..core.retrieval_cache import RetrievalCache
+from ..core.vector_index import LocalVectorIndex, VectorIndexBackend, create_index_backend
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+
+
+class ChunkHit:
+    """
+    Lightweight search hit.
+
+    Holds a reference to the index's metadata dict instead of copying it, so each
+    chunk's text is stored once and no validation runs per hit; treat it as read-only.
+    The attributes mirror the document models, and to_document() / dict() /
+    model_dump() materialize the Pydantic model when a result is serialized.
+    """
+
+    __slots__ = ("id", "relevance_score", "metadata", "values")
+
+    # Pydantic model the hit materializes into; set by subclasses
+    document_class: Type[BaseModel]
+
+    def __init__(
+        self,
+        id: str,
+        relevance_score: float,
+        metadata: Dict[str, Any],
+        values: Optional[List[float]] = None
+    ):
+        self.id = id
+        self.relevance_score = relevance_score
+        self.metadata = metadata
+        self.values = values
+
+    @property
+    def text(self) -> str:
+        return self.metadata.get("text", "")
+
+    @property
+    def document_type(self) -> str:
+        return self.metadata.get("document_type", "")
+
+    @property
+    def section_heading(self) -> str:
+        return self.metadata.get("section_heading", "")
+
+    @property
+    def source_filename(self) -> str:
+        return self.metadata.get("source_filename", "")
+
+    @property
+    def chunk_index(self) -> int:
+        return int(self.metadata.get("chunk_index", 0))
+
+    @property
+    def total_chunks(self) -> int:
+        return int(self.metadata.get("total_chunks", 0))
+
+    def to_document(self) -> BaseModel:
+        """Materialize the hit as its Pydantic document model."""
+        return self.document_class(
+            id=self.id,
+            text=self.text,
+            relevance_score=self.relevance_score,
+            document_type=self.document_type,
+            section_heading=self.section_heading,
+            source_filename=self.source_filename,
+            chunk_index=self.chunk_index,
+            total_chunks=self.total_chunks,
+            metadata=self.metadata
+        )
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        return self.to_document().model_dump(**kwargs)
+
+    def dict(self, **kwargs) -> Dict[str, Any]:
+        return self.model_dump(**kwargs)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r}, relevance_score={self.relevance_score:.4f})"
+
+
+class CrossNamespaceResults(BaseModel):
+    """Results of one query fanned out over several namespaces."""
+    results_by_namespace: Dict[str, List[Any]]
+    merged: List[Any]
+
+
+class BaseRetriever:
+    """Retrieves standard document chunks from one vector index."""
+
+    # Hit record type returned by this retriever; set by subclasses
+    hit_class: Type[ChunkHit]
+
+    def __init__(
+        self,
+        index_name: str,
+        backend: Optional[VectorIndexBackend] = None,
+        dimensions: Optional[int] = None
+    ):
+        """
+        Initialize the retriever.
+
+        The index connection is opened lazily on first use; a background probe opens it
+        early and caches the index stats, so construction never waits on the network.
+
+        Args:
+            index_name: Name of the vector index to search
+            backend: Optional index backend; built from settings.VECTOR_INDEX_BACKEND when omitted
+            dimensions: Reduced embedding dimension the index was built with (None for full size)
+        """
+        self.index_name = index_name
+        self.dimensions = dimensions or None
+        self._index = backend
+        self._index_lock = threading.Lock()
+        self._index_stats: Optional[Dict[str, Any]] = None
+        self._index_error: Optional[str] = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.RETRIEVAL_MAX_WORKERS,
+            thread_name_prefix=f"retriever-{index_name}"
+        )
+        self.cache = RetrievalCache() if settings.RETRIEVAL_CACHE_ENABLED else None
+        self.expander = ChunkExpander()
+        self._lexical_lock = threading.Lock()
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_version: Any = None
+        self._lexical_corpus: Optional[LocalVectorIndex] = None
+
+        self._stats_probe = threading.Thread(
+            target=self._probe_index,
+            name=f"index-probe-{index_name}",
+            daemon=True
+        )
+        self._stats_probe.start()
+
+    @property
+    def index(self) -> VectorIndexBackend:
+        """The index backend, connected on first access."""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = create_index_backend(self.index_name)
+        return self._index
+
+    def _probe_index(self) -> None:
+        """Connect to the index and cache its stats; failures are recorded, not raised."""
+        try:
+            self._index_stats = self.index.describe_index_stats()
+            self._index_error = None
+        except Exception as e:
+            self._index_error = str(e)
+            print(f"Error connecting to {self.index_name} index: {e}")
+
+    def index_stats(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached index stats.
+
+        Args:
+            refresh: Re-read the stats from the index instead of using the cached copy
+
+        Returns:
+            Stats dictionary, or None if the probe has not succeeded (yet)
+        """
+        if refresh:
+            self._probe_index()
+        return self._index_stats
+
+    def index_status(self) -> Dict[str, Any]:
+        """Return a small connection summary suitable for health checks."""
+        stats = self._index_stats
+        return {
+            "index": self.index_name,
+            "connected": stats is not None,
+            "vector_count": stats.get("total_vector_count") if stats else None,
+            "error": self._index_error
+        }
+
+    def embed_query(self, query: str) -> list:
+        """
+        Embed a query string into a vector through the shared embedding service.
+        """
+        return get_embedding_service().embed(query, dimensions=self.dimensions)
+
+    def embed_queries(self, queries: List[str]) -> List[list]:
+        """
+        Embed several query strings in as few embeddings requests as possible.
+        """
+        return get_embedding_service().embed_many(queries, dimensions=self.dimensions)
+
+    def fit_query_vector(self, query_vector: List[float]) -> List[float]:
+        """Shorten a precomputed query embedding that is larger than this index's dimension."""
+        return shorten_embedding(query_vector, self.dimensions)
+
+    def _format_search_results(self, results: List[Dict]) -> List[ChunkHit]:
+        """
+        Format index matches into hit records.
+
+        Args:
+            results: Matches returned by the index backend
+
+        Returns:
+            List of hit records, sharing each match's metadata dict
+        """
+        hit_class = self.hit_class
+        return [
+            hit_class(
+                match.get('id', ''),
+                match.get('score', 0.0),
+                match.get('metadata') or {},
+                match.get('values')
+            )
+            for match in results
+        ]
+
+    @staticmethod
+    def _build_filter(
+        document_types: Optional[Union[str, List[str]]] = None,
+        section_heading: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Build the metadata filter for the given document types and section heading."""
+        filter_criteria = {}
+        if document_types:
+            if isinstance(document_types, str):
+                filter_criteria["document_type"] = {"$eq": document_types}
+            else:
+                filter_criteria["document_type"] = {"$in": document_types}
+
+        if section_heading:
+            if filter_criteria:
+                filter_criteria = {
+                    "$and": [
+                        filter_criteria,
+                        {"section_heading": {"$eq": section_heading}}
+                    ]
+                }
+            else:
+                filter_criteria["section_heading"] = {"$eq": section_heading}
+
+        return filter_criteria if filter_criteria else None
+
+    def retrieve(
+        self,
+        query: str,
+        top_n: int = 5,
+        document_types: Optional[Union[str, List[str]]] = None,
+        section_heading: Optional[str] = None,
+        namespace: str = "default",
+        query_vector: Optional[List[float]] = None,
+        expand_neighbors: int = 0,
+        diversify: bool = False,
+        adaptive: bool = False
+    ) -> List[ChunkHit]:
+        """
+        Retrieve relevant document chunks based on the query.
+
+        Args:
+            query: Search query
+            top_n: Number of top results to return
+            document_types: Optional document type(s) to filter by
+            section_heading: Optional section heading to filter by
+            namespace: Namespace to search in (defaults to "default")
+            query_vector: Optional precomputed embedding of query, to skip embedding it again
+            expand_neighbors: Widen each hit with this many neighbouring chunks on each side,
+                fetched by id; overlapping windows are merged into one hit
+            diversify: Re-rank an over-fetched candidate set by maximal marginal relevance;
+                near-duplicate chunks are dropped, so fewer than top_n may be returned
+            adaptive: Treat top_n as a ceiling and cut the ranked list at the first score
+                cliff or below the minimum similarity (see adaptive_cutoff)
+
+        Returns:
+            List of hit records for the relevant chunks
+        """
+        version = self._cache_version()
+        cache_key = self._cache_key(
+            query, top_n, document_types, section_heading, namespace,
+            *((expand_neighbors,) if expand_neighbors > 0 else ()),
+            *self._ranking_options(diversify, adaptive)
+        )
+        cached = self._cache_get(cache_key, version)
+        if cached is not None:
+            return cached
+
+        try:
+            if query_vector is None:
+                query_vector = self.embed_query(query)
+            results = self._query_index(
+                query_vector,
+                top_n,
+                self._build_filter(document_types, section_heading),
+                namespace,
+                diversify=diversify,
+                adaptive=adaptive
+            )
+        except Exception as e:
+            print(f"Error retrieving documents: {e}")
+            return []
+
+        if expand_neighbors > 0:
+            results = self.expand_hits(results, expand_neighbors, namespace, version)
+        self._cache_set(cache_key, version, results)
+        return results
+
+    def expand_hits(
+        self,
+        hits: List[ChunkHit],
+        neighbors: int,
+        namespace: str = "default",
+        version: Any = None
+    ) -> List[ChunkHit]:
+        """
+        Widen hits with their ±neighbors adjacent chunks.
+
+        Missing chunks are fetched by id in a single call and kept in a local chunk
+        cache; on failure the hits are returned unexpanded.
+
+        Args:
+            hits: Hits from this retriever, best first
+            neighbors: Number of chunks to add on each side of every hit
+            namespace: Namespace the hits come from
+            version: Index version stamp, when already known
+
+        Returns:
+            Expanded hit records, best first
+        """
+        try:
+            if version is None:
+                version = self.index.version_stamp()
+            return self.expander.expand(hits, neighbors, self.index, namespace, version)
+        except Exception as e:
+            print(f"Error expanding {self.index_name} hits: {e}")
+            return hits
+
+    def retrieve_many(
+        self,
+        queries: List[str],
+        top_n: int = 5,
+        document_types: Optional[Union[str, List[str]]] = None,
+        section_heading: Optional[str] = None,
+        namespace: str = "default",
+        adaptive: bool = False
+    ) -> List[List[ChunkHit]]:
+        """
+        Retrieve document chunks for several queries at once.
+
+        All queries are embedded in a single embeddings request, then the index
+        queries run concurrently on at most settings.RETRIEVAL_MAX_WORKERS threads.
+
+        Args:
+            queries: Search queries (for keyword lists, pass " ".join(keywords))
+            top_n: Number of top results to return per query
+            document_types: Optional document type(s) to filter by
+            section_heading: Optional section heading to filter by
+            namespace: Namespace to search in (defaults to "default")
+            adaptive: Cut each result list at its score cliff (see retrieve)
+
+        Returns:
+            One list of hit records per query, in the same order as queries
+        """
+        if not queries:
+            return []
+
+        version = self._cache_version()
+        cache_keys = [
+            self._cache_key(
+                query, top_n, document_types, section_heading, namespace, *self._ranking_options(adaptive=adaptive)
+            )
+            for query in queries
+        ]
+        results: List[Optional[List[ChunkHit]]] = [self._cache_get(key, version) for key in cache_keys]
+        pending = [position for position, cached in enumerate(results) if cached is None]
+        if not pending:
+            return results
+
+        try:
+            query_vectors = self.embed_queries([queries[position] for position in pending])
+        except Exception as e:
+            print(f"Error embedding queries: {e}")
+            return [cached if cached is not None else [] for cached in results]
+
+        filter_criteria = self._build_filter(document_types, section_heading)
+
+        def query_one(query_vector):
+            try:
+                return self._query_index(query_vector, top_n, filter_criteria, namespace, adaptive=adaptive)
+            except Exception as e:
+                print(f"Error retrieving documents: {e}")
+                return None
+
+        for position, fetched in zip(pending, self.executor.map(query_one, query_vectors)):
+            if fetched is not None:
+                self._cache_set(cache_keys[position], version, fetched)
+            results[position] = fetched if fetched is not None else []
+        return results
+
+    def retrieve_across_namespaces(
+        self,
+        query: str,
+        namespaces: Optional[List[str]] = None,
+        top_n: int = 5,
+        document_types: Optional[Union[str, List[str]]] = None,
+        section_heading: Optional[str] = None,
+        diversify: bool = False,
+        adaptive: bool = False
+    ) -> CrossNamespaceResults:
+        """
+        Retrieve document chunks for one query from several namespaces.
+
+        The query is embedded once and the namespaces are queried concurrently.
+        The per-namespace results have the shape expected by the summarizers'
+        summarize_findings; the merged list is the global top_n across namespaces.
+
+        Args:
+            query: Search query
+            namespaces: Namespaces to search (defaults to every namespace in the index stats)
+            top_n: Number of top results per namespace and in the merged list
+            document_types: Optional document type(s) to filter by
+            section_heading: Optional section heading to filter by
+            diversify: Re-rank each namespace's results by maximal marginal relevance
+            adaptive: Cut each namespace's results at its score cliff (see retrieve)
+
+        Returns:
+            CrossNamespaceResults with results_by_namespace and merged
+        """
+        if namespaces is None:
+            stats = self.index_stats() or self.index_stats(refresh=True) or {}
+            namespaces = list((stats.get("namespaces") or {}).keys())
+
+        version = self._cache_version()
+        cache_keys = {
+            namespace: self._cache_key(
+                query, top_n, document_types, section_heading, namespace, *self._ranking_options(diversify, adaptive)
+            )
+            for namespace in namespaces
+        }
+        results_by_namespace = {}
+        for namespace in namespaces:
+            cached = self._cache_get(cache_keys[namespace], version)
+            if cached is not None:
+                results_by_namespace[namespace] = cached
+        pending = [namespace for namespace in namespaces if namespace not in results_by_namespace]
+
+        if pending:
+            try:
+                query_vector = self.embed_query(query)
+            except Exception as e:
+                print(f"Error embedding query: {e}")
+                query_vector = None
+            filter_criteria = self._build_filter(document_types, section_heading)
+
+            def query_namespace(namespace):
+                if query_vector is None:
+                    return None
+                try:
+                    return self._query_index(
+                        query_vector, top_n, filter_criteria, namespace, diversify=diversify, adaptive=adaptive
+                    )
+                except Exception as e:
+                    print(f"Error retrieving documents from namespace {namespace}: {e}")
+                    return None
+
+            for namespace, fetched in zip(pending, self.executor.map(query_namespace, pending)):
+                if fetched is not None:
+                    self._cache_set(cache_keys[namespace], version, fetched)
+                results_by_namespace[namespace] = fetched if fetched is not None else []
+
+        merged = heapq.nlargest(
+            top_n,
+            (doc for namespace in namespaces for doc in results_by_namespace[namespace]),
+            key=lambda doc: doc.relevance_score
+        )
+        return CrossNamespaceResults(
+            results_by_namespace={namespace: results_by_namespace[namespace] for namespace in namespaces},
+            merged=merged
+        )
+
+    @staticmethod
+    def _cache_key(
+        query: str,
+        top_n: int,
+        document_types: Optional[Union[str, List[str]]],
+        section_heading: Optional[str],
+        namespace: str,
+        *options: Hashable
+    ) -> Hashable:
+        """Build the result-cache key for a retrieval call."""
+        if document_types is not None and not isinstance(document_types, str):
+            document_types = tuple(document_types)
+        return (query, top_n, document_types, section_heading, namespace) + options
+
+    @staticmethod
+    def _ranking_options(diversify: bool = False, adaptive: bool = False) -> tuple:
+        """Cache-key options for the re-ranking modes that change a result list."""
+        return (("mmr",) if diversify else ()) + (("adaptive",) if adaptive else ())
+
+    def _cache_version(self) -> Any:
+        """Return the index version stamp, or None when it cannot be read (the cache is then bypassed)."""
+        if self.cache is None:
+            return None
+        try:
+            return self.index.version_stamp()
+        except Exception as e:
+            print(f"Error reading {self.index_name} index version: {e}")
+            return None
+
+    def _cache_get(self, key: Hashable, version: Any) -> Optional[List[ChunkHit]]:
+        """Return a copy of the cached results for key, or None."""
+        if self.cache is None or version is None:
+            return None
+        cached = self.cache.get(key, version)
+        return list(cached) if cached is not None else None
+
+    def _cache_set(self, key: Hashable, version: Any, results: List[ChunkHit]) -> None:
+        """Cache results computed against the given index version."""
+        if self.cache is not None and version is not None:
+            self.cache.set(key, version, list(results))
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Return the result cache counters, or None when the cache is disabled."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def _query_index(
+        self,
+        query_vector: List[float],
+        top_n: int,
+        filter_criteria: Optional[Dict],
+        namespace: str,
+        diversify: bool = False,
+        adaptive: bool = False
+    ) -> List[ChunkHit]:
+        """
+        Run one index query and format its matches.
+
+        With diversify, top_n * settings.MMR_CANDIDATE_MULTIPLIER candidates are fetched
+        with their vectors and at most top_n of them are kept by maximal marginal
+        relevance, near-duplicates dropped. With adaptive, the ranked matches (the MMR
+        candidates, when diversifying) are first cut at their score cliff.
+        """
+        query_vector = self.fit_query_vector(query_vector)
+        if not diversify:
+            matches = self.index.query(
+                vector=query_vector,
+                top_k=top_n,
+                include_metadata=True,
+                filter=filter_criteria,
+                namespace=namespace
+            )
+            if adaptive:
+                matches = self._cut_adaptive(matches)
+            return self._format_search_results(matches)
+
+        candidates = self.index.query(
+            vector=query_vector,
+            top_k=top_n * settings.MMR_CANDIDATE_MULTIPLIER,
+            include_values=True,
+            include_metadata=True,
+            filter=filter_criteria,
+            namespace=namespace
+        )
+        if adaptive:
+            candidates = self._cut_adaptive(candidates)
+        selected = mmr_select(
+            query_vector,
+            [match["values"] for match in candidates],
+            top_n,
+            settings.MMR_LAMBDA,
+            settings.MMR_DUPLICATE_THRESHOLD
+        )
+        # The vectors were only needed for selection; keep the returned records light
+        return self._format_search_results(
+            [{**candidates[position], "values": None} for position in selected]
+        )
+
+    @staticmethod
+    def _cut_adaptive(matches: List[Dict]) -> List[Dict]:
+        """Keep the leading matches up to the score cliff or minimum similarity."""
+        keep = adaptive_cutoff(
+            [match["score"] for match in matches],
+            settings.ADAPTIVE_MIN_SCORE,
+            settings.ADAPTIVE_SCORE_GAP,
+            settings.ADAPTIVE_MIN_RESULTS
+        )
+        return matches[:keep]
+
+    def retrieve_by_keywords(
+        self,
+        keywords: List[str],
+        top_n: int = 5,
+        document_types: Optional[Union[str, List[str]]] = None,
+        section_heading: Optional[str] = None,
+        namespace: str = "default",
+        mode: str = "vector"
+    ) -> List[ChunkHit]:
+        """
+        Retrieve documents using a list of keywords.
+
+        Args:
+            keywords: List of search keywords
+            top_n: Number of top results to return
+            document_types: Optional document type(s) to filter by
+            section_heading: Optional section heading to filter by
+            namespace: Namespace to search in (defaults to "default")
+            mode: "vector" (dense search on the joined keywords), "lexical" (BM25 only,
+                no embedding call) or "hybrid" (BM25 and vector rankings fused with
+                reciprocal rank fusion). Lexical and hybrid scores are BM25 and RRF
+                scores respectively, not cosine similarities.
+
+        Returns:
+            List of hit records for the relevant chunks
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        query = " ".join(keywords)
+        if mode == "vector":
+            return self.retrieve(
+                query=query,
+                top_n=top_n,
+                document_types=document_types,
+                section_heading=section_heading,
+                namespace=namespace
+            )
+
+        lexical_index = self._get_lexical_index()
+        if lexical_index is None:
+            print(f"No local corpus for {self.index_name}; falling back to vector search")
+            return self.retrieve(
+                query=query,
+                top_n=top_n,
+                document_types=document_types,
+                section_heading=section_heading,
+                namespace=namespace
+            )
+
+        version = self._cache_version()
+        cache_key = self._cache_key(query, top_n, document_types, section_heading, namespace, mode)
+        cached = self._cache_get(cache_key, version)
+        if cached is not None:
+            return cached
+
+        try:
+            filter_criteria = self._build_filter(document_types, section_heading)
+            if mode == "lexical":
+                matches = lexical_index.query(query, top_n, filter_criteria, namespace)
+            else:
+                candidates = top_n * settings.HYBRID_CANDIDATE_MULTIPLIER
+                lexical_matches = lexical_index.query(query, candidates, filter_criteria, namespace)
+                vector_matches = self.index.query(
+                    vector=self.embed_query(query),
+                    top_k=candidates,
+                    include_metadata=True,
+                    filter=filter_criteria,
+                    namespace=namespace
+                )
+                matches = reciprocal_rank_fusion([vector_matches, lexical_matches], top_n)
+            results = self._format_search_results(matches)
+        except Exception as e:
+            print(f"Error retrieving documents: {e}")
+            return []
+
+        self._cache_set(cache_key, version, results)
+        return results
+
+    def _get_lexical_index(self) -> Optional[BM25Index]:
+        """
+        Return the BM25 index over this retriever's chunk texts, (re)building it when the corpus changed.
+
+        The corpus is the backend itself when it is a local or mapped index, otherwise a local
+        snapshot under settings.LOCAL_INDEX_DIR/<index name>. Returns None if neither exists.
+        """
+        corpus = self._get_lexical_corpus()
+        if corpus is None:
+            return None
+        with self._lexical_lock:
+            if self._lexical is None or self._lexical_version != corpus.version:
+                lexical_index = BM25Index()
+                for namespace in list(corpus.namespaces):
+                    lexical_index.add_namespace(namespace, corpus.iter_records(namespace))
+                self._lexical = lexical_index
+                self._lexical_version = corpus.version
+            return self._lexical
+
+    def _get_lexical_corpus(self) -> Optional[Union[LocalVectorIndex, MappedVectorIndex]]:
+        """Return the local index holding the chunk texts, if any."""
+        if isinstance(self.index, (LocalVectorIndex, MappedVectorIndex)):
+            return self.index
+        if self._lexical_corpus is None:
+            snapshot = os.path.join(settings.LOCAL_INDEX_DIR, self.index_name)
+            if os.path.exists(os.path.join(snapshot, "manifest.json")):
+                self._lexical_corpus = LocalVectorIndex.load(snapshot)
+        return self._lexical_corpus
@@ -3,9 +3,9 @@ Conflict Detection Agent
 Purpose: Analyzes bank rules and practices for conflicts with AAOIFI FAS and Shariah Standards.
 """
 
-from typing import List, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ..core.llm_gateway import get_llm_gateway
 from ..core.config import settings
 import json
 
@@ -31,7 +31,7 @@ class ConflictAnalysisResult(BaseModel):
 class ConflictDetectionAgent:
     def __init__(self):
         """Initialize the Conflict Detection agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are a Conflict Detection Agent specializing in Islamic financial compliance.
 Your task is to analyze a bank's internal rule or practice and identify any conflicts with:
@@ -83,33 +83,44 @@ IMPORTANT: Your response must be valid JSON that can be parsed by Python's json.
             ConflictAnalysisResult object containing conflict analysis
         """
         try:
-            # Format the user message
-            user_message = self._format_user_message(input_data)
-            
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",  # or your preferred model
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.2
-            )
-            
-            # Parse the response
-            analysis_data = response.choices[0].message.content
-            # Try to parse as JSON first
-            try:
-                json_data = json.loads(analysis_data)
-                return ConflictAnalysisResult.parse_obj(json_data)
-            except json.JSONDecodeError:
-                # If not valid JSON, try to parse as string
-                return ConflictAnalysisResult.parse_raw(analysis_data)
-            
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
         except Exception as e:
             print(f"Error during conflict analysis: {e}")
             raise
 
+    async def aanalyze_conflict(self, input_data: ConflictAnalysisInput) -> ConflictAnalysisResult:
+        """Async counterpart of analyze_conflict; awaits the gateway instead of blocking a thread."""
+        try:
+            response = await self.client.achat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
+        except Exception as e:
+            print(f"Error during conflict analysis: {e}")
+            raise
+
+    def _build_request(self, input_data: ConflictAnalysisInput) -> Dict[str, Any]:
+        """Build the chat-completion request for one input."""
+        return dict(
+            model="gpt-3.5-turbo",  # or your preferred model
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self._format_user_message(input_data)}
+            ],
+            temperature=0.2
+        )
+
+    def _parse_response(self, response) -> ConflictAnalysisResult:
+        """Parse the model's answer into the result model."""
+        analysis_data = response.choices[0].message.content
+        # Try to parse as JSON first
+        try:
+            json_data = json.loads(analysis_data)
+            return ConflictAnalysisResult.parse_obj(json_data)
+        except json.JSONDecodeError:
+            # If not valid JSON, try to parse as string
+            return ConflictAnalysisResult.parse_raw(analysis_data)
+
     def _format_user_message(self, input_data: ConflictAnalysisInput) -> str:
         """Format the input data into a structured message for the LLM."""
         return f"""
@@ -3,9 +3,9 @@ Risk Analysis Agent
 Purpose: Analyzes financial products and regulations for Shariah compliance and risk assessment.
 """
 
-from typing import List, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ..core.llm_gateway import get_llm_gateway
 from ..core.config import settings
 import json
 
@@ -35,7 +35,7 @@ class RiskAnalysisResult(BaseModel):
 class RiskAnalysisAgent:
     def __init__(self):
         """Initialize the Risk Analysis agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are a Risk Analysis Agent specialized in Islamic Finance and Shariah-compliant financial regulation mainly in AAOIFI standards.
 
@@ -71,56 +71,67 @@ IMPORTANT: Your response must be valid JSON that can be parsed by Python's json.
             RiskAnalysisResult object containing structured risk analysis
         """
         try:
-            # Format the user message
-            user_message = self._format_user_message(input_data)
-            
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",  # or your preferred model
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.2
-            )
-
-            # Parse the response
-            analysis_data = response.choices[0].message.content.strip()
-            
-            # Try to parse as JSON first
-            try:
-                json_data = json.loads(analysis_data)
-                return RiskAnalysisResult.parse_obj(json_data)
-            except json.JSONDecodeError as json_err:
-                print(f"JSON parsing error: {json_err}")
-                print(f"Raw response: {analysis_data}")
-                
-                # Try to fix common JSON formatting issues
-                try:
-                    # Replace single quotes with double quotes
-                    fixed_json = analysis_data.replace("'", '"')
-                    json_data = json.loads(fixed_json)
-                    return RiskAnalysisResult.parse_obj(json_data)
-                except:
-                    # If all parsing attempts fail, create a basic result
-                    return RiskAnalysisResult(
-                        risks=[RiskAssessment(
-                            risk_name="Parsing Error",
-                            risk_type="Operational",
-                            description="Failed to parse risk analysis response",
-                            shariah_implication="Unable to assess Shariah implications",
-                            mitigation_strategy="Review and fix the risk analysis response format",
-                            severity="High"
-                        )],
-                        summary="Error in risk analysis",
-                        fas_compliance_status="Unknown",
-                        recommendations=["Fix the risk analysis response format"]
-                    )
-            
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
         except Exception as e:
             print(f"Error during risk analysis: {e}")
             raise
 
+    async def aanalyze_risk(self, input_data: RiskAnalysisInput) -> RiskAnalysisResult:
+        """Async counterpart of analyze_risk; awaits the gateway instead of blocking a thread."""
+        try:
+            response = await self.client.achat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
+        except Exception as e:
+            print(f"Error during risk analysis: {e}")
+            raise
+
+    def _build_request(self, input_data: RiskAnalysisInput) -> Dict[str, Any]:
+        """Build the chat-completion request for one input."""
+        return dict(
+            model="gpt-3.5-turbo",  # or your preferred model
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self._format_user_message(input_data)}
+            ],
+            temperature=0.2
+        )
+
+    def _parse_response(self, response) -> RiskAnalysisResult:
+        """Parse the model's answer into the result model."""
+        analysis_data = response.choices[0].message.content.strip()
+
+        # Try to parse as JSON first
+        try:
+            json_data = json.loads(analysis_data)
+            return RiskAnalysisResult.parse_obj(json_data)
+        except json.JSONDecodeError as json_err:
+            print(f"JSON parsing error: {json_err}")
+            print(f"Raw response: {analysis_data}")
+
+            # Try to fix common JSON formatting issues
+            try:
+                # Replace single quotes with double quotes
+                fixed_json = analysis_data.replace("'", '"')
+                json_data = json.loads(fixed_json)
+                return RiskAnalysisResult.parse_obj(json_data)
+            except:
+                # If all parsing attempts fail, create a basic result
+                return RiskAnalysisResult(
+                    risks=[RiskAssessment(
+                        risk_name="Parsing Error",
+                        risk_type="Operational",
+                        description="Failed to parse risk analysis response",
+                        shariah_implication="Unable to assess Shariah implications",
+                        mitigation_strategy="Review and fix the risk analysis response format",
+                        severity="High"
+                    )],
+                    summary="Error in risk analysis",
+                    fas_compliance_status="Unknown",
+                    recommendations=["Fix the risk analysis response format"]
+                )
+
     def _format_user_message(self, input_data: RiskAnalysisInput) -> str:
         """Format the input data into a structured message for the LLM."""
         message_parts = [
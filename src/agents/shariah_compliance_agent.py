@@ -3,11 +3,42 @@ Shariah Compliance Checker Agent
 Purpose: Evaluates bank rules and policies for compliance with AAOIFI Shariah Standards.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
-from openai import OpenAI
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, ValidationError
+from ..core.llm_gateway import get_llm_gateway
+from ..core.semantic_cache import SemanticCache, get_compliance_cache
 from ..core.config import settings
 import json
+import asyncio
+
+# Appended to the system prompt when several rules are checked in one request
+BATCH_INSTRUCTIONS = """
+Batch mode:
+You will receive several rules, each labelled with an id such as [R1], that share one SS summary.
+Assess every rule independently, exactly as described above, and return a single JSON object:
+
+{
+  "results": [
+    {
+      "id": "R1",
+      "compliance_status": "compliant" | "partially_compliant" | "non_compliant",
+      "justification": "string",
+      "referenced_clauses": ["string"]
+    }
+  ]
+}
+
+Return exactly one entry per rule id, in the order given.
+"""
+
+# Answer tokens reserved per rule when packing a batch against the token budget
+BATCH_ANSWER_TOKENS_PER_RULE = 250
+
+class CacheProvenance(BaseModel):
+    """Where a reused compliance verdict came from."""
+    source: str = Field(default="semantic_cache", description="Cache that served the verdict")
+    matched_rule_text: str = Field(description="Previously checked rule whose verdict was reused")
+    similarity: float = Field(description="Cosine similarity between the new and the matched rule text")
 
 class ComplianceResult(BaseModel):
     """Model for Shariah compliance analysis results."""
@@ -20,6 +51,10 @@ class ComplianceResult(BaseModel):
         default_factory=list,
         description="List of key SS clauses that informed the decision"
     )
+    cache_provenance: Optional[CacheProvenance] = Field(
+        default=None,
+        description="Set when the verdict was reused from a near-duplicate rule instead of a new LLM call"
+    )
 
 class ComplianceInput(BaseModel):
     """Input model for compliance analysis."""
@@ -29,9 +64,18 @@ class ComplianceInput(BaseModel):
 class ShariahComplianceAgent:
     """Agent for checking Shariah compliance of bank rules against AAOIFI standards."""
     
-    def __init__(self):
-        """Initialize the Shariah Compliance Checker agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, semantic_cache: Optional[SemanticCache] = None):
+        """
+        Initialize the Shariah Compliance Checker agent.
+        
+        Args:
+            semantic_cache: Optional near-duplicate verdict cache (defaults to the shared cache
+                when settings.COMPLIANCE_SEMANTIC_CACHE_ENABLED is set)
+        """
+        self.client = get_llm_gateway()
+        if semantic_cache is None and settings.COMPLIANCE_SEMANTIC_CACHE_ENABLED:
+            semantic_cache = get_compliance_cache()
+        self.semantic_cache = semantic_cache
         self.system_prompt = """
 You are a Shariah Compliance Checker Agent in an Islamic Finance advisory system.
 
@@ -74,34 +118,248 @@ Return only a clean JSON object as specified above.
             ComplianceResult object containing compliance analysis
         """
         try:
-            # Format the user message
-            user_message = self._format_user_message(input_data)
+            # Reuse the verdict of a near-identical rule checked against the same SS summary
+            vector = self._rule_vector(input_data)
+            return self._cached_result(vector, input_data) or self._check_uncached(input_data, vector)
+        except Exception as e:
+            print(f"Error during compliance check: {e}")
+            raise
+
+    async def acheck_compliance(self, input_data: ComplianceInput) -> ComplianceResult:
+        """Async counterpart of check_compliance; awaits the gateway instead of blocking a thread."""
+        try:
+            vector = await self._arule_vector(input_data)
+            return self._cached_result(vector, input_data) or await self._acheck_uncached(input_data, vector)
+        except Exception as e:
+            print(f"Error during compliance check: {e}")
+            raise
+
+    def check_compliance_batch(
+        self,
+        inputs: List[ComplianceInput],
+        max_batch_tokens: Optional[int] = None
+    ) -> List[ComplianceResult]:
+        """
+        Check several bank rules, packing rules that share an SS summary into one request.
+        
+        Args:
+            inputs: ComplianceInput objects to check
+            max_batch_tokens: Estimated prompt-plus-answer tokens allowed per request
+                (defaults to settings.COMPLIANCE_BATCH_TOKEN_BUDGET)
             
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.2,
-                response_format={"type": "json_object"}
-            )
+        Returns:
+            One ComplianceResult per input, in input order. Rules missing from a batched
+            answer or failing validation are re-checked individually.
+        """
+        try:
+            vectors = [self._rule_vector(input_data) for input_data in inputs]
+            results = [self._cached_result(vector, input_data) for vector, input_data in zip(vectors, inputs)]
             
-            # Parse the response
-            analysis_data = response.choices[0].message.content
-            # Try to parse as JSON first
-            try:
-                json_data = json.loads(analysis_data)
-                return ComplianceResult.parse_obj(json_data)
-            except json.JSONDecodeError:
-                # If not valid JSON, try to parse as string
-                return ComplianceResult.parse_raw(analysis_data)
+            pending = [i for i, result in enumerate(results) if result is None]
+            for batch in self._plan_batches(inputs, pending, max_batch_tokens):
+                # A lone rule is sent as a normal single-rule request
+                if len(batch) == 1:
+                    parsed = [None]
+                else:
+                    response = self.client.chat_completion(**self._build_batch_request([inputs[i] for i in batch]))
+                    parsed = self._parse_batch_response(response, len(batch))
+                for index, result in zip(batch, parsed):
+                    if result is None:
+                        results[index] = self._check_uncached(inputs[index], vectors[index])
+                    else:
+                        self._remember_result(vectors[index], inputs[index], result)
+                        results[index] = result
+            return results
+        except Exception as e:
+            print(f"Error during batched compliance check: {e}")
+            raise
+
+    async def acheck_compliance_batch(
+        self,
+        inputs: List[ComplianceInput],
+        max_batch_tokens: Optional[int] = None
+    ) -> List[ComplianceResult]:
+        """Async counterpart of check_compliance_batch; sends the batches concurrently."""
+        try:
+            vectors = await asyncio.gather(*[self._arule_vector(input_data) for input_data in inputs])
+            results = [self._cached_result(vector, input_data) for vector, input_data in zip(vectors, inputs)]
+            
+            async def check(batch: List[int]) -> None:
+                if len(batch) == 1:
+                    parsed = [None]
+                else:
+                    response = await self.client.achat_completion(**self._build_batch_request([inputs[i] for i in batch]))
+                    parsed = self._parse_batch_response(response, len(batch))
+                for index, result in zip(batch, parsed):
+                    if result is None:
+                        results[index] = await self._acheck_uncached(inputs[index], vectors[index])
+                    else:
+                        self._remember_result(vectors[index], inputs[index], result)
+                        results[index] = result
             
+            pending = [i for i, result in enumerate(results) if result is None]
+            await asyncio.gather(*[check(batch) for batch in self._plan_batches(inputs, pending, max_batch_tokens)])
+            return results
         except Exception as e:
-            print(f"Error during compliance check: {e}")
+            print(f"Error during batched compliance check: {e}")
             raise
 
+    def _check_uncached(self, input_data: ComplianceInput, vector) -> ComplianceResult:
+        """Check one rule through the shared LLM gateway and remember the verdict."""
+        response = self.client.chat_completion(**self._build_request(input_data))
+        result = self._parse_response(response)
+        self._remember_result(vector, input_data, result)
+        return result
+
+    async def _acheck_uncached(self, input_data: ComplianceInput, vector) -> ComplianceResult:
+        """Async counterpart of _check_uncached."""
+        response = await self.client.achat_completion(**self._build_request(input_data))
+        result = self._parse_response(response)
+        self._remember_result(vector, input_data, result)
+        return result
+
+    def _rule_vector(self, input_data: ComplianceInput):
+        """Embedding of the rule for the semantic cache, or None when there is no usable cache."""
+        if self.semantic_cache is None:
+            return None
+        try:
+            return self.semantic_cache.vector(input_data.rule_text)
+        except Exception as e:
+            print(f"Semantic cache unavailable, checking without it: {e}")
+            return None
+
+    async def _arule_vector(self, input_data: ComplianceInput):
+        """Async counterpart of _rule_vector."""
+        if self.semantic_cache is None:
+            return None
+        try:
+            return await self.semantic_cache.avector(input_data.rule_text)
+        except Exception as e:
+            print(f"Semantic cache unavailable, checking without it: {e}")
+            return None
+
+    def _cached_result(self, vector, input_data: ComplianceInput) -> Optional[ComplianceResult]:
+        """Return the verdict of a near-duplicate rule with the same SS summary, tagged with its provenance."""
+        if vector is None:
+            return None
+        match = self.semantic_cache.match(vector, input_data.ss_summary, text=input_data.rule_text)
+        if match is None:
+            return None
+        return ComplianceResult(
+            **match.payload,
+            cache_provenance=CacheProvenance(
+                matched_rule_text=match.matched_text,
+                similarity=round(match.similarity, 4)
+            )
+        )
+
+    def _remember_result(self, vector, input_data: ComplianceInput, result: ComplianceResult) -> None:
+        """Store a freshly computed verdict in the semantic cache."""
+        if vector is not None:
+            self.semantic_cache.add(
+                vector, input_data.rule_text, input_data.ss_summary, result.dict(exclude={"cache_provenance"})
+            )
+
+    def _build_request(self, input_data: ComplianceInput) -> Dict[str, Any]:
+        """Build the chat-completion request for one input."""
+        return dict(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self._format_user_message(input_data)}
+            ],
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+
+    def _parse_response(self, response) -> ComplianceResult:
+        """Parse the model's answer into the result model."""
+        analysis_data = response.choices[0].message.content
+        # Try to parse as JSON first
+        try:
+            json_data = json.loads(analysis_data)
+            return ComplianceResult.parse_obj(json_data)
+        except json.JSONDecodeError:
+            # If not valid JSON, try to parse as string
+            return ComplianceResult.parse_raw(analysis_data)
+
+    def _plan_batches(
+        self,
+        inputs: List[ComplianceInput],
+        pending: List[int],
+        max_batch_tokens: Optional[int] = None
+    ) -> List[List[int]]:
+        """
+        Group the pending input indices into batches.
+        
+        Rules are only batched with rules that share their SS summary, so the summary is sent
+        once per request. A batch closes when the next rule would exceed the token budget
+        (about four characters per token, plus an answer allowance per rule) or the rule cap.
+        """
+        budget = max_batch_tokens or settings.COMPLIANCE_BATCH_TOKEN_BUDGET
+        groups: Dict[str, List[int]] = {}
+        for index in pending:
+            groups.setdefault(inputs[index].ss_summary, []).append(index)
+        
+        batches = []
+        for ss_summary, indices in groups.items():
+            overhead = (len(self.system_prompt) + len(BATCH_INSTRUCTIONS) + len(ss_summary)) // 4
+            batch, tokens = [], overhead
+            for index in indices:
+                rule_tokens = len(inputs[index].rule_text) // 4 + BATCH_ANSWER_TOKENS_PER_RULE
+                if batch and (tokens + rule_tokens > budget or len(batch) >= settings.COMPLIANCE_BATCH_MAX_RULES):
+                    batches.append(batch)
+                    batch, tokens = [], overhead
+                batch.append(index)
+                tokens += rule_tokens
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def _build_batch_request(self, batch: List[ComplianceInput]) -> Dict[str, Any]:
+        """Build one chat-completion request for several rules sharing an SS summary."""
+        rules = "\n\n".join(f"[R{position}]\n{input_data.rule_text}" for position, input_data in enumerate(batch, 1))
+        return dict(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": self.system_prompt + BATCH_INSTRUCTIONS},
+                {"role": "user", "content": f"""
+Shariah Standards Summary:
+{batch[0].ss_summary}
+
+Rules:
+{rules}
+"""}
+            ],
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+
+    @staticmethod
+    def _parse_batch_response(response, count: int) -> List[Optional[ComplianceResult]]:
+        """
+        Split a batched answer into per-rule results, in batch order.
+        
+        Returns None in place of any rule that is missing from the answer or fails validation.
+        """
+        try:
+            items = json.loads(response.choices[0].message.content).get("results")
+            by_id = {str(item.get("id")): item for item in items or [] if isinstance(item, dict)}
+        except (json.JSONDecodeError, AttributeError, TypeError) as e:
+            # TypeError covers content=None (e.g. a refusal) and a non-list "results"
+            print(f"Could not parse batched compliance answer, checking rules individually: {e}")
+            return [None] * count
+        
+        results = []
+        for position in range(1, count + 1):
+            item = by_id.get(f"R{position}")
+            try:
+                fields = {key: value for key, value in item.items() if key not in ("id", "cache_provenance")}
+                results.append(ComplianceResult.parse_obj(fields))
+            except (AttributeError, TypeError, ValidationError):
+                results.append(None)
+        return results
+
     def _format_user_message(self, input_data: ComplianceInput) -> str:
         """Format the input data into a structured message for the LLM."""
         return f"""
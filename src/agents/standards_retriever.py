@@ -0,0 +1,101 @@
+"""
+Standards Retriever Agent
+Purpose: Retrieves FAS and SS context for the same text with a single embedding and parallel index queries.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+from pydantic import BaseModel
+from .fas_retriever import FASRetriever, FASDocument
+from .ss_retiever import SSRetriever, SSDocument
+
+class StandardsContext(BaseModel):
+    """FAS and SS chunks retrieved for one query."""
+    fas_documents: List[FASDocument]
+    ss_documents: List[SSDocument]
+
+class StandardsRetriever:
+    """Joint retriever over the FAS (accounting) and SS (Shariah) indexes."""
+
+    def __init__(
+        self,
+        fas_retriever: Optional[FASRetriever] = None,
+        ss_retriever: Optional[SSRetriever] = None
+    ):
+        """
+        Initialize the Standards Retriever.
+
+        Args:
+            fas_retriever: Existing FAS retriever to reuse (created if omitted)
+            ss_retriever: Existing SS retriever to reuse (created if omitted)
+        """
+        self.fas_retriever = fas_retriever or FASRetriever()
+        self.ss_retriever = ss_retriever or SSRetriever()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="standards-retriever")
+
+    def retrieve(
+        self,
+        query: str,
+        top_n: int = 5,
+        fas_document_types: Optional[Union[str, List[str]]] = None,
+        ss_document_types: Optional[Union[str, List[str]]] = None,
+        section_heading: Optional[str] = None,
+        namespace: str = "default",
+        adaptive: bool = False
+    ) -> StandardsContext:
+        """
+        Retrieve FAS and SS chunks relevant to the query.
+
+        The query is embedded once and both indexes are queried in parallel, so the
+        call costs one embedding and one index round trip of wall-clock time. When the
+        indexes use different embedding dimensions, the query is embedded for the larger
+        one and shortened for the other.
+
+        Args:
+            query: Search query, e.g. a contract clause
+            top_n: Number of top results to return from each index
+            fas_document_types: Optional FAS document type(s) to filter by
+            ss_document_types: Optional SS document type(s) to filter by
+            section_heading: Optional section heading to filter by in both indexes
+            namespace: Namespace to search in (defaults to "default")
+            adaptive: Cut each list at its score cliff instead of always returning top_n
+
+        Returns:
+            StandardsContext with the FAS and SS hits materialized as documents
+        """
+        # Full size (None) counts as the largest dimension
+        wider = max(
+            (self.fas_retriever, self.ss_retriever),
+            key=lambda retriever: retriever.dimensions or float("inf")
+        )
+        try:
+            query_vector = wider.embed_query(query)
+        except Exception as e:
+            print(f"Error embedding query: {e}")
+            return StandardsContext(fas_documents=[], ss_documents=[])
+
+        fas_future = self.executor.submit(
+            self.fas_retriever.retrieve,
+            query,
+            top_n=top_n,
+            document_types=fas_document_types,
+            section_heading=section_heading,
+            namespace=namespace,
+            query_vector=query_vector,
+            adaptive=adaptive
+        )
+        ss_future = self.executor.submit(
+            self.ss_retriever.retrieve,
+            query,
+            top_n=top_n,
+            document_types=ss_document_types,
+            section_heading=section_heading,
+            namespace=namespace,
+            query_vector=query_vector,
+            adaptive=adaptive
+        )
+        # The context is returned to callers that serialize it, so hits become documents here
+        return StandardsContext(
+            fas_documents=[hit.to_document() for hit in fas_future.result()],
+            ss_documents=[hit.to_document() for hit in ss_future.result()]
+        )
@@ -3,22 +3,22 @@ Retrieval Summarizer Agent
 Purpose: Summarizes findings from FAS documents retrieved by FASRetriever.
 """
 
-from typing import Dict, List
-from openai import OpenAI
+from typing import Dict, List, Union
+from ..core.llm_gateway import get_llm_gateway
 from ..core.config import settings
-from .fas_retriever import FASDocument
+from .fas_retriever import FASDocument, FASHit
 
 class RetrievalSummarizer:
     def __init__(self):
         """Initialize the Retrieval Summarizer agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
 
-    def _summarize_fas_findings(self, documents: List[FASDocument]) -> str:
+    def _summarize_fas_findings(self, documents: List[Union[FASHit, FASDocument]]) -> str:
         """
         Summarize findings from a list of FAS documents.
         
         Args:
-            documents: List of FASDocument objects from a specific FAS
+            documents: FASHit or FASDocument objects from a specific FAS
             
         Returns:
             Summary of the findings
@@ -56,8 +56,8 @@ class RetrievalSummarizer:
         Summary:"""
 
         try:
-            # Get summary from OpenAI with improved parameters
-            response = self.client.chat.completions.create(
+            # Get summary through the shared LLM gateway
+            response = self.client.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a financial accounting expert specializing in Islamic finance and FAS standards. Provide detailed, accurate summaries that maintain technical precision while being clear and accessible."},
@@ -73,7 +73,7 @@ class RetrievalSummarizer:
             print(f"Error generating summary: {e}")
             return "Error generating summary."
 
-    def summarize_findings(self, results_by_namespace: Dict[str, List[FASDocument]]) -> Dict[str, str]:
+    def summarize_findings(self, results_by_namespace: Dict[str, List[Union[FASHit, FASDocument]]]) -> Dict[str, str]:
         """
         Summarize findings from all FAS documents across namespaces.
         
@@ -3,9 +3,9 @@ Update Advisor Agent
 Purpose: Proposes Shariah-compliant updates to non-compliant regulations based on AAOIFI standards.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ..core.llm_gateway import get_llm_gateway
 from ..core.config import settings
 import json
 
@@ -26,7 +26,7 @@ class UpdateAdvisorAgent:
     
     def __init__(self):
         """Initialize the Update Advisor agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are the **UpdateAdvisorAgent**, an expert in drafting Shariah-compliant regulatory updates according to AAOIFI Shariah Standards (SS).
 
@@ -80,34 +80,45 @@ Return **only** a valid JSON object in the following format:
             UpdateProposal object containing the proposed update and rationale
         """
         try:
-            # Format the user message
-            user_message = self._format_user_message(input_data)
-            
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.2,
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse the response
-            analysis_data = response.choices[0].message.content
-            # Try to parse as JSON first
-            try:
-                json_data = json.loads(analysis_data)
-                return UpdateProposal.parse_obj(json_data)
-            except json.JSONDecodeError:
-                # If not valid JSON, try to parse as string
-                return UpdateProposal.parse_raw(analysis_data)
-            
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
+        except Exception as e:
+            print(f"Error during update proposal: {e}")
+            raise
+
+    async def apropose_update(self, input_data: UpdateInput) -> UpdateProposal:
+        """Async counterpart of propose_update; awaits the gateway instead of blocking a thread."""
+        try:
+            response = await self.client.achat_completion(**self._build_request(input_data))
+            return self._parse_response(response)
         except Exception as e:
             print(f"Error during update proposal: {e}")
             raise
 
+    def _build_request(self, input_data: UpdateInput) -> Dict[str, Any]:
+        """Build the chat-completion request for one input."""
+        return dict(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self._format_user_message(input_data)}
+            ],
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+
+    def _parse_response(self, response) -> UpdateProposal:
+        """Parse the model's answer into the result model."""
+        analysis_data = response.choices[0].message.content
+        # Try to parse as JSON first
+        try:
+            json_data = json.loads(analysis_data)
+            return UpdateProposal.parse_obj(json_data)
+        except json.JSONDecodeError:
+            # If not valid JSON, try to parse as string
+            return UpdateProposal.parse_raw(analysis_data)
+
     def _format_user_message(self, input_data: UpdateInput) -> str:
         """Format the input data into a structured message for the LLM."""
         return f"""
@@ -0,0 +1,220 @@
+"""
+Chunk Expansion
+Purpose: Widens retrieval hits with their neighbouring chunks, fetched by id in one bulk call and cached locally.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+from .config import settings
+from .vector_index import VectorIndexBackend
+
+_TRAILING_NUMBER = re.compile(r"^(.*?)(\d+)$")
+
+
+def chunk_id_width(chunk_id: str, chunk_index: int) -> Optional[int]:
+    """
+    Zero-padding width of the chunk index in an id.
+
+    Returns the digit count when the id is visibly padded ("_chunk_012"), 0 when it
+    cannot be ("#7"), and None when the id does not tell: "_chunk_100" may come from a
+    padded or an unpadded scheme. Ids without a trailing chunk index also give None.
+    """
+    match = _TRAILING_NUMBER.match(chunk_id)
+    if not match or int(match.group(2)) != chunk_index:
+        return None
+    digits = match.group(2)
+    if len(digits) > len(str(chunk_index)):
+        return len(digits)
+    return 0 if len(digits) == 1 else None
+
+
+def neighbour_chunk_id(chunk_id: str, chunk_index: int, target_index: int, width: Optional[int] = None) -> Optional[str]:
+    """
+    Derive the id of another chunk of the same source document.
+
+    Chunk ids are expected to end with the chunk index (e.g. "FAS_28#12" or
+    "fas28_chunk_012"); the trailing number is swapped for target_index, zero-padded
+    to width. By default the width is the id's own digit count when it is padded,
+    and no padding otherwise. Returns None when the id does not follow that pattern.
+    """
+    match = _TRAILING_NUMBER.match(chunk_id)
+    if not match or int(match.group(2)) != chunk_index:
+        return None
+    if width is None:
+        width = chunk_id_width(chunk_id, chunk_index) or 0
+    return f"{match.group(1)}{str(target_index).zfill(width)}"
+
+
+def stitch_chunks(texts: List[Optional[str]], overlap: int) -> str:
+    """
+    Join consecutive chunk texts, dropping the start of each chunk that repeats the
+    end of the previous one.
+
+    The chunker starts every chunk with up to overlap characters of the previous one,
+    cut at a word boundary; the longest such suffix found at the start of the next
+    chunk is removed. None marks a missing chunk, across which nothing is trimmed.
+    """
+    joined, previous = [], None
+    for text in texts:
+        if text is None:
+            previous = None
+            continue
+        trimmed = text
+        if previous and overlap > 0:
+            tail_start = max(0, len(previous) - overlap)
+            for start in range(tail_start, len(previous)):
+                if (start == 0 or previous[start - 1] == " ") and text.startswith(previous[start:]):
+                    trimmed = text[len(previous) - start:].lstrip()
+                    break
+        if trimmed:
+            joined.append(trimmed)
+        previous = text
+    return "\n".join(joined)
+
+
+class ChunkExpander:
+    """Expands hits to windows of ±N neighbouring chunks, merging overlapping windows."""
+
+    def __init__(self, max_entries: Optional[int] = None, overlap: Optional[int] = None):
+        """
+        Args:
+            max_entries: Size of the chunk metadata cache (defaults to settings.CHUNK_CACHE_MAX_ENTRIES)
+            overlap: Characters the chunker repeats between consecutive chunks, trimmed when
+                stitching (defaults to settings.INGEST_CHUNK_OVERLAP)
+        """
+        self.overlap = settings.INGEST_CHUNK_OVERLAP if overlap is None else overlap
+        self._chunks: LRUCache = LRUCache(maxsize=max_entries or settings.CHUNK_CACHE_MAX_ENTRIES)
+        self._version: Any = None
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.cache_hits = 0
+
+    def expand(
+        self,
+        hits: List[Any],
+        neighbours: int,
+        index: VectorIndexBackend,
+        namespace: str,
+        version: Any = None
+    ) -> List[Any]:
+        """
+        Replace each hit by a window of its neighbouring chunks.
+
+        Hits whose windows overlap or touch are merged into one; the merged hit keeps
+        the id, score and metadata of its best hit, with the window text joined in
+        chunk order (without the text chunks repeat from their predecessor) and
+        "chunk_range"/"expanded_from" added to its metadata.
+
+        Args:
+            hits: Hit records, best first
+            neighbours: Number of chunks to add on each side of every hit
+            index: Backend used to fetch missing chunks by id
+            namespace: Namespace of the hits
+            version: Index version stamp; a change clears the chunk cache
+
+        Returns:
+            Expanded hits, best first
+        """
+        if neighbours <= 0 or not hits:
+            return hits
+
+        with self._lock:
+            if version != self._version:
+                self._chunks.clear()
+                self._version = version
+            for hit in hits:
+                self._chunks[(namespace, hit.id)] = hit.metadata
+
+        windows = self._merged_windows(hits, neighbours)
+        chunks = self._load_chunks(windows, index, namespace)
+
+        expanded = []
+        for anchor, members, ids, (start, end) in windows:
+            texts = []
+            for candidates in ids:
+                found = next((chunks[chunk_id] for chunk_id in candidates if chunk_id in chunks), None)
+                texts.append(None if found is None else found.get("text", ""))
+            metadata = dict(anchor.metadata)
+            metadata["text"] = stitch_chunks(texts, self.overlap)
+            metadata["chunk_range"] = [start, end]
+            metadata["expanded_from"] = [member.id for member in members]
+            expanded.append(type(anchor)(anchor.id, anchor.relevance_score, metadata, anchor.values))
+        return expanded
+
+    def _merged_windows(
+        self, hits: List[Any], neighbours: int
+    ) -> List[Tuple[Any, List[Any], List[List[str]], Tuple[int, int]]]:
+        """
+        Group hits by source document and merge overlapping windows, best window first.
+
+        Each window lists the candidate ids of every chunk in it: one id when the
+        padding of the source's ids is known, the padded and unpadded forms otherwise.
+        """
+        by_source: Dict[str, List[Tuple[int, int, Any]]] = {}
+        standalone = []
+        for hit in hits:
+            chunk_index = hit.chunk_index
+            if neighbour_chunk_id(hit.id, chunk_index, chunk_index) is None:
+                standalone.append((hit, [hit], [[hit.id]], (chunk_index, chunk_index)))
+                continue
+            last = hit.total_chunks - 1 if hit.total_chunks > 0 else chunk_index + neighbours
+            start, end = max(0, chunk_index - neighbours), min(last, chunk_index + neighbours)
+            source = _TRAILING_NUMBER.match(hit.id).group(1)
+            by_source.setdefault(source, []).append((start, end, hit))
+
+        windows = list(standalone)
+        for intervals in by_source.values():
+            # Any visibly padded (or visibly unpadded) id fixes the scheme of the whole source
+            widths = {chunk_id_width(hit.id, hit.chunk_index) for _, _, hit in intervals} - {None}
+            width = max(widths) if widths else None
+            intervals.sort(key=lambda interval: interval[0])
+            current_start, current_end, members = intervals[0][0], intervals[0][1], [intervals[0][2]]
+            for start, end, hit in intervals[1:]:
+                if start <= current_end + 1:
+                    current_end = max(current_end, end)
+                    members.append(hit)
+                else:
+                    windows.append(self._window(current_start, current_end, members, width))
+                    current_start, current_end, members = start, end, [hit]
+            windows.append(self._window(current_start, current_end, members, width))
+
+        windows.sort(key=lambda window: window[0].relevance_score, reverse=True)
+        return windows
+
+    @staticmethod
+    def _window(start: int, end: int, members: List[Any], width: Optional[int]):
+        """Build one merged window anchored on its best hit."""
+        anchor = max(members, key=lambda hit: hit.relevance_score)
+        if width is None:
+            # Padding unknown: look up both forms, the fetch ignores ids that do not exist
+            digits = len(_TRAILING_NUMBER.match(anchor.id).group(2))
+            ids = [
+                list(dict.fromkeys(neighbour_chunk_id(anchor.id, anchor.chunk_index, i, w) for w in (0, digits)))
+                for i in range(start, end + 1)
+            ]
+        else:
+            ids = [[neighbour_chunk_id(anchor.id, anchor.chunk_index, i, width)] for i in range(start, end + 1)]
+        return anchor, members, ids, (start, end)
+
+    def _load_chunks(self, windows, index: VectorIndexBackend, namespace: str) -> Dict[str, Dict[str, Any]]:
+        """Return metadata for every chunk id in windows, fetching cache misses in one call."""
+        wanted = {chunk_id for _, _, ids, _ in windows for candidates in ids for chunk_id in candidates}
+        chunks = {}
+        with self._lock:
+            for chunk_id in wanted:
+                cached = self._chunks.get((namespace, chunk_id))
+                if cached is not None:
+                    chunks[chunk_id] = cached
+            self.cache_hits += len(chunks)
+        missing = sorted(wanted - set(chunks))
+        if missing:
+            self.fetches += 1
+            fetched = index.fetch(missing, namespace=namespace)
+            with self._lock:
+                for chunk_id, record in fetched.items():
+                    chunks[chunk_id] = record.get("metadata") or {}
+                    self._chunks[(namespace, chunk_id)] = chunks[chunk_id]
+        return chunks
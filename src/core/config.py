@@ -3,13 +3,125 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY", "YOUR_DEFAULT_KEY_HERE_IF_NOT_IN_ENV")
     PINECONE_ENVIRONMENT: str = os.getenv("PINECONE_ENVIRONMENT", "YOUR_DEFAULT_ENV_HERE_IF_NOT_IN_ENV")
     PINECONE_INDEX_FAS: str = os.getenv("PINECONE_INDEX_FAS", "YOUR_DEFAULT_INDEX_HERE_IF_NOT_IN_ENV")
     PINECONE_INDEX_SS: str = os.getenv("PINECONE_INDEX_SS", "YOUR_DEFAULT_INDEX_HERE_IF_NOT_IN_ENV")
-    
+
+    # Embedding service
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "512"))
+    # Reduced embedding dimensions per index (text-embedding-3 models); 0 means the model's full size.
+    # Each index must be built with the dimension its retriever queries with.
+    EMBEDDING_DIMENSIONS_FAS: int = int(os.getenv("EMBEDDING_DIMENSIONS_FAS", "0"))
+    EMBEDDING_DIMENSIONS_SS: int = int(os.getenv("EMBEDDING_DIMENSIONS_SS", "0"))
+    # Single-text embed requests arriving within this window are sent as one batched request; 0 disables
+    EMBEDDING_BATCH_WINDOW_MS: float = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+    EMBEDDING_BATCH_MAX_IN_FLIGHT: int = int(os.getenv("EMBEDDING_BATCH_MAX_IN_FLIGHT", "4"))
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+
+    # Shared LLM gateway: default per-model limits (a little under the provider's), retry policy, and
+    # per-model overrides as JSON, e.g. {"gpt-4.1-mini": {"rpm": 4500, "tpm": 1800000, "max_in_flight": 32}}
+    LLM_REQUESTS_PER_MINUTE: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "450"))
+    LLM_TOKENS_PER_MINUTE: float = float(os.getenv("LLM_TOKENS_PER_MINUTE", "180000"))
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))
+    LLM_MODEL_LIMITS: str = os.getenv("LLM_MODEL_LIMITS", "{}")
+    # Completion tokens assumed per request when max_tokens is not set (refunded after the response)
+    LLM_ESTIMATED_COMPLETION_TOKENS: int = int(os.getenv("LLM_ESTIMATED_COMPLETION_TOKENS", "1000"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "6"))
+    LLM_RETRY_BASE_SECONDS: float = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+    LLM_RETRY_MAX_SECONDS: float = float(os.getenv("LLM_RETRY_MAX_SECONDS", "30"))
+
+    # Persistent LLM response cache, keyed by model, prompt hashes and request parameters.
+    # Off by default: when enabled, a repeated request replays its first sampled answer
+    # (even at temperature > 0) until the TTL expires, instead of asking the model again
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "False").lower() in ("true", "1", "t")
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", os.path.join(PROJECT_ROOT, ".cache", "llm_responses.sqlite"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+    LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "604800"))
+
+    # Persistent embedding cache
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "True").lower() in ("true", "1", "t")
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(PROJECT_ROOT, ".cache", "embeddings.sqlite"))
+    EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+    # float32 vectors kept in memory (5000 x 1536 dims is about 30 MB)
+    EMBEDDING_CACHE_MEMORY_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "5000"))
+    # Most recently used entries loaded into memory on the first lookup after startup
+    EMBEDDING_CACHE_WARM_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_WARM_ENTRIES", "1000"))
+
+    # Semantic near-duplicate cache of Shariah compliance verdicts (same ss_summary, similar rule_text)
+    COMPLIANCE_SEMANTIC_CACHE_ENABLED: bool = os.getenv("COMPLIANCE_SEMANTIC_CACHE_ENABLED", "False").lower() in ("true", "1", "t")
+    COMPLIANCE_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("COMPLIANCE_SEMANTIC_CACHE_THRESHOLD", "0.97"))
+    COMPLIANCE_SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("COMPLIANCE_SEMANTIC_CACHE_MAX_ENTRIES", "10000"))
+
+    # Batched compliance checking: several rules sharing an SS summary per request
+    COMPLIANCE_BATCH_ENABLED: bool = os.getenv("COMPLIANCE_BATCH_ENABLED", "False").lower() in ("true", "1", "t")
+    COMPLIANCE_BATCH_TOKEN_BUDGET: int = int(os.getenv("COMPLIANCE_BATCH_TOKEN_BUDGET", "8000"))
+    COMPLIANCE_BATCH_MAX_RULES: int = int(os.getenv("COMPLIANCE_BATCH_MAX_RULES", "10"))
+
+    # Vector index backend: "pinecone", "local" (NumPy index loaded from LOCAL_INDEX_DIR/<index name>)
+    # or "mapped" (read-only memory-mapped store in LOCAL_INDEX_DIR/<index name>/mapped)
+    VECTOR_INDEX_BACKEND: str = os.getenv("VECTOR_INDEX_BACKEND", "pinecone").lower()
+    LOCAL_INDEX_DIR: str = os.getenv("LOCAL_INDEX_DIR", os.path.join(PROJECT_ROOT, "data", "vector_indexes"))
+    # Metadata fields the local index groups rows by, so filtered searches only score matching slices ("" disables)
+    LOCAL_INDEX_PARTITION_FIELD: str = os.getenv("LOCAL_INDEX_PARTITION_FIELD", "document_type")
+    LOCAL_INDEX_SUBPARTITION_FIELD: str = os.getenv("LOCAL_INDEX_SUBPARTITION_FIELD", "section_heading")
+
+    # Maximum concurrent index queries per retriever (retrieve_many and fan-out searches)
+    RETRIEVAL_MAX_WORKERS: int = int(os.getenv("RETRIEVAL_MAX_WORKERS", "8"))
+
+    # Query-level retrieval result cache
+    RETRIEVAL_CACHE_ENABLED: bool = os.getenv("RETRIEVAL_CACHE_ENABLED", "True").lower() in ("true", "1", "t")
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = int(os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", "2048"))
+    RETRIEVAL_CACHE_TTL_SECONDS: float = float(os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "600"))
+    # How often a remote index's stats are re-read to detect re-population
+    INDEX_STATS_REFRESH_SECONDS: float = float(os.getenv("INDEX_STATS_REFRESH_SECONDS", "30"))
+
+    # Hybrid keyword retrieval: candidates taken from each ranking = top_n * multiplier
+    HYBRID_CANDIDATE_MULTIPLIER: int = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "4"))
+
+    # Neighbouring-chunk expansion: chunk metadata kept locally to avoid re-fetching
+    CHUNK_CACHE_MAX_ENTRIES: int = int(os.getenv("CHUNK_CACHE_MAX_ENTRIES", "10000"))
+
+    # MMR re-ranking: candidates fetched = top_n * multiplier; default relevance/diversity trade-off
+    MMR_CANDIDATE_MULTIPLIER: int = int(os.getenv("MMR_CANDIDATE_MULTIPLIER", "3"))
+    MMR_LAMBDA: float = float(os.getenv("MMR_LAMBDA", "0.5"))
+    # Candidates at least this similar to an already selected chunk are dropped as duplicates
+    MMR_DUPLICATE_THRESHOLD: float = float(os.getenv("MMR_DUPLICATE_THRESHOLD", "0.95"))
+
+    # Adaptive top-k: top_n becomes a ceiling and the ranked list is cut below the minimum
+    # cosine similarity or at the first score drop of at least the gap
+    ADAPTIVE_MIN_SCORE: float = float(os.getenv("ADAPTIVE_MIN_SCORE", "0.3"))
+    ADAPTIVE_SCORE_GAP: float = float(os.getenv("ADAPTIVE_SCORE_GAP", "0.05"))
+    ADAPTIVE_MIN_RESULTS: int = int(os.getenv("ADAPTIVE_MIN_RESULTS", "1"))
+
+    # Standards ingestion: chunk sizing (characters), batch sizes and pipeline width
+    INGEST_CHUNK_SIZE: int = int(os.getenv("INGEST_CHUNK_SIZE", "1500"))
+    INGEST_CHUNK_OVERLAP: int = int(os.getenv("INGEST_CHUNK_OVERLAP", "200"))
+    INGEST_UPSERT_BATCH_SIZE: int = int(os.getenv("INGEST_UPSERT_BATCH_SIZE", "100"))
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+    INGEST_EMBED_WORKERS: int = int(os.getenv("INGEST_EMBED_WORKERS", "2"))
+    INGEST_UPSERT_WORKERS: int = int(os.getenv("INGEST_UPSERT_WORKERS", "4"))
+    INGEST_MAX_RETRIES: int = int(os.getenv("INGEST_MAX_RETRIES", "3"))
+    INGEST_PERSIST_EVERY_DOCUMENTS: int = int(os.getenv("INGEST_PERSIST_EVERY_DOCUMENTS", "25"))
+    INGEST_PERSIST_INTERVAL_SECONDS: float = float(os.getenv("INGEST_PERSIST_INTERVAL_SECONDS", "30"))
+    INGEST_CHECKPOINT_DIR: str = os.getenv("INGEST_CHECKPOINT_DIR", os.path.join(PROJECT_ROOT, ".cache", "ingestion"))
+
+    # Mapped index: vector storage type ("int8" or "float16") and rows dequantized per scoring block
+    # (small blocks keep each dequantized block in cache)
+    MAPPED_INDEX_DTYPE: str = os.getenv("MAPPED_INDEX_DTYPE", "int8").lower()
+    MAPPED_INDEX_BLOCK_ROWS: int = int(os.getenv("MAPPED_INDEX_BLOCK_ROWS", "256"))
+
+    # Startup warm-up: popular queries whose embeddings and results are precomputed in the background
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "True").lower() in ("true", "1", "t")
+    WARMUP_QUERIES_PATH: str = os.getenv("WARMUP_QUERIES_PATH", os.path.join(PROJECT_ROOT, "data", "popular_queries.json"))
+
     # Add other settings if needed
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,204 @@
+"""
+Disk Cache
+Purpose: Size-capped, least-recently-used key/value store persisted in a local SQLite file,
+with optional expiry of entries older than a TTL.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Float, LargeBinary, MetaData, String, Table,
+    create_engine, delete, func, insert, select, update
+)
+
+
+class DiskLRUCache:
+    """
+    Byte-valued cache stored in SQLite, evicting the least recently used keys beyond max_entries
+    and, when ttl_seconds is set, ignoring and purging entries written longer ago than that.
+    """
+
+    # Access times are written back in batches so that cache hits do not each cost a write
+    TOUCH_FLUSH_THRESHOLD = 256
+
+    def __init__(self, path: str, table_name: str, max_entries: int, ttl_seconds: Optional[float] = None):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: Path of the SQLite database file
+            table_name: Table holding this cache's entries
+            max_entries: Maximum number of entries kept on disk
+            ttl_seconds: Lifetime of an entry from when it was written (None or 0 keeps entries until evicted)
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self.engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False}
+        )
+        self.table = Table(
+            table_name,
+            MetaData(),
+            Column("key", String, primary_key=True),
+            Column("value", LargeBinary, nullable=False),
+            Column("created_at", Float, nullable=False),
+            Column("last_access", Float, nullable=False, index=True)
+        )
+        self.table.metadata.create_all(self.engine)
+
+        self._lock = threading.RLock()
+        self._pending_touches: Dict[str, float] = {}
+        with self.engine.connect() as conn:
+            self._count = conn.execute(select(func.count()).select_from(self.table)).scalar_one()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Look up several keys at once.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            Dictionary with the keys that were found and their values
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            with self.engine.connect() as conn:
+                # Stay well below SQLite's bound-parameter limit
+                for i in range(0, len(keys), 500):
+                    query = select(self.table.c.key, self.table.c.value).where(self.table.c.key.in_(keys[i:i + 500]))
+                    if self.ttl_seconds:
+                        query = query.where(self.table.c.created_at >= time.time() - self.ttl_seconds)
+                    rows = conn.execute(query)
+                    found.update({row.key: row.value for row in rows})
+            self._touch(found.keys())
+        return found
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under key, or None."""
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: Iterable[Tuple[str, bytes]]) -> None:
+        """
+        Store several key/value pairs, then evict old entries if over capacity.
+
+        Args:
+            items: (key, value) pairs to store
+        """
+        items = dict(items)
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            with self.engine.begin() as conn:
+                existing = set()
+                keys = list(items)
+                for i in range(0, len(keys), 500):
+                    existing.update(conn.execute(
+                        select(self.table.c.key).where(self.table.c.key.in_(keys[i:i + 500]))
+                    ).scalars())
+                for key in existing:
+                    conn.execute(
+                        update(self.table)
+                        .where(self.table.c.key == key)
+                        .values(value=items[key], created_at=now, last_access=now)
+                    )
+                new_rows = [
+                    {"key": key, "value": value, "created_at": now, "last_access": now}
+                    for key, value in items.items() if key not in existing
+                ]
+                if new_rows:
+                    conn.execute(insert(self.table), new_rows)
+                self._count += len(new_rows)
+                self._flush_touches(conn)
+                self._purge_expired(conn)
+                self._evict(conn)
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a single value."""
+        self.set_many([(key, value)])
+
+    def most_recent(self, limit: int) -> List[Tuple[str, bytes]]:
+        """
+        Return the most recently used entries, newest first (used for warm starts).
+
+        Args:
+            limit: Maximum number of entries to return
+        """
+        with self._lock:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(self.table.c.key, self.table.c.value)
+                    .order_by(self.table.c.last_access.desc())
+                    .limit(limit)
+                )
+                return [(row.key, row.value) for row in rows]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            with self.engine.begin() as conn:
+                conn.execute(delete(self.table))
+            self._pending_touches.clear()
+            self._count = 0
+
+    def flush(self) -> None:
+        """Write pending access times to disk."""
+        with self._lock:
+            if self._pending_touches:
+                with self.engine.begin() as conn:
+                    self._flush_touches(conn)
+
+    def close(self) -> None:
+        """Flush pending writes and release the database."""
+        self.flush()
+        self.engine.dispose()
+
+    def _touch(self, keys: Iterable[str]) -> None:
+        """Record an access for keys, writing back once enough have accumulated."""
+        now = time.time()
+        for key in keys:
+            self._pending_touches[key] = now
+        if len(self._pending_touches) >= self.TOUCH_FLUSH_THRESHOLD:
+            with self.engine.begin() as conn:
+                self._flush_touches(conn)
+
+    def _flush_touches(self, conn) -> None:
+        """Persist pending access times on an open transaction."""
+        for key, accessed in self._pending_touches.items():
+            conn.execute(
+                update(self.table)
+                .where(self.table.c.key == key)
+                .values(last_access=accessed)
+            )
+        self._pending_touches.clear()
+
+    def _purge_expired(self, conn) -> None:
+        """Delete entries older than the TTL."""
+        if not self.ttl_seconds:
+            return
+        result = conn.execute(delete(self.table).where(self.table.c.created_at < time.time() - self.ttl_seconds))
+        self._count -= result.rowcount
+
+    def _evict(self, conn) -> None:
+        """Delete the least recently used entries beyond max_entries."""
+        overflow = self._count - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = select(self.table.c.key).order_by(self.table.c.last_access.asc()).limit(overflow)
+        result = conn.execute(delete(self.table).where(self.table.c.key.in_(oldest)))
+        self._count -= result.rowcount
@@ -0,0 +1,156 @@
+"""
+Embedding Cache
+Purpose: Content-addressed embedding cache keyed by (model name, normalized text hash), persisted on disk.
+"""
+
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from .config import settings
+from .disk_cache import DiskLRUCache
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so that whitespace and Unicode variants share one cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_key(model: str, text: str, dimensions: Optional[int] = None) -> str:
+    """Return the cache key for text embedded with model, at reduced dimensions if given."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}@{dimensions}:{digest}" if dimensions else f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """
+    Two-level cache: an in-memory LRU in front of a size-capped SQLite store.
+
+    The memory layer holds float32 arrays (4 bytes per dimension) and converts to
+    Python lists only for the vectors a lookup returns.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        memory_entries: Optional[int] = None,
+        warm_entries: Optional[int] = None
+    ):
+        """
+        Open the cache; the memory layer is warmed on first lookup.
+
+        Args:
+            path: SQLite file (defaults to settings.EMBEDDING_CACHE_PATH)
+            max_entries: Entries kept on disk (defaults to settings.EMBEDDING_CACHE_MAX_ENTRIES)
+            memory_entries: Entries kept in memory (defaults to settings.EMBEDDING_CACHE_MEMORY_ENTRIES)
+            warm_entries: Most recently used entries loaded into memory on first lookup
+                (defaults to settings.EMBEDDING_CACHE_WARM_ENTRIES, capped at memory_entries)
+        """
+        self.store = DiskLRUCache(
+            path or settings.EMBEDDING_CACHE_PATH,
+            table_name="embeddings",
+            max_entries=max_entries or settings.EMBEDDING_CACHE_MAX_ENTRIES
+        )
+        self.memory_entries = memory_entries or settings.EMBEDDING_CACHE_MEMORY_ENTRIES
+        self.warm_entries = min(
+            self.memory_entries,
+            settings.EMBEDDING_CACHE_WARM_ENTRIES if warm_entries is None else warm_entries
+        )
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def _warm(self) -> None:
+        """Load the most recently used entries into memory, once."""
+        if self._warmed:
+            return
+        recent = self.store.most_recent(self.warm_entries) if self.warm_entries else []
+        with self._lock:
+            if self._warmed:
+                return
+            # Oldest first so the most recent entries end up at the MRU end; never
+            # displace entries that were added before warming finished
+            for key, value in reversed(recent):
+                if key not in self._memory and len(self._memory) < self.memory_entries:
+                    self._memory[key] = self._decode(value)
+                    self._memory.move_to_end(key, last=False)
+            self._warmed = True
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def _decode(value: bytes) -> np.ndarray:
+        return np.frombuffer(value, dtype=np.float32)
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the memory layer, evicting its least recently used entry if full."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Look up embeddings by cache key.
+
+        Args:
+            keys: Cache keys built with embedding_key
+
+        Returns:
+            Dictionary with the keys that were found and their vectors
+        """
+        self._warm()
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+        missing = [key for key in keys if key not in found]
+        if missing:
+            for key, value in self.store.get_many(missing).items():
+                vector = self._decode(value)
+                found[key] = vector
+                with self._lock:
+                    self._remember(key, vector)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return {key: vector.tolist() for key, vector in found.items()}
+
+    def set_many(self, entries: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings under their cache keys.
+
+        Args:
+            entries: Mapping of cache key to vector
+        """
+        if not entries:
+            return
+        encoded = {key: self._encode(vector) for key, vector in entries.items()}
+        self.store.set_many(encoded.items())
+        with self._lock:
+            for key, value in encoded.items():
+                self._remember(key, self._decode(value))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and sizes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self.store)
+        }
+
+    def close(self) -> None:
+        """Flush pending writes to disk."""
+        self.store.close()
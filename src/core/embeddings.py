@@ -0,0 +1,329 @@
+"""
+Embedding Service
+Purpose: Process-wide embedding client with pooled keep-alive connections, shared by every retriever.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from .config import settings
+from .embedding_cache import EmbeddingCache, embedding_key
+from .loop_clients import PerLoopClients
+
+
+def shorten_embedding(vector: Sequence[float], dimensions: Optional[int]) -> List[float]:
+    """
+    Truncate an embedding to its first dimensions components and rescale it to unit length.
+
+    For text-embedding-3 models this gives the same vector as requesting the reduced
+    dimensions from the API, so one full-size embedding can serve indexes of any smaller size.
+    """
+    if not dimensions or len(vector) <= dimensions:
+        return list(vector)
+    shortened = np.asarray(vector[:dimensions], dtype=np.float32)
+    norm = float(np.linalg.norm(shortened))
+    return (shortened / norm if norm else shortened).tolist()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces single-text embed requests from concurrent callers into batched requests.
+
+    The first request to arrive opens a window of window_ms milliseconds; everything
+    submitted before it closes (or until batch_size texts are waiting) is sent as one
+    embed_many call per requested dimension, and each caller's future receives its vector.
+    Batches are dispatched to a small pool so the next window fills while a request is in flight.
+    """
+
+    def __init__(self, service: "EmbeddingService", window_ms: float, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            service: Embedding service whose embed_many sends the batches
+            window_ms: How long to collect requests after the first one arrives
+            max_in_flight: Maximum concurrent batched requests
+        """
+        self.service = service
+        self.window = window_ms / 1000.0
+        self.batches = 0
+        self.requests = 0
+        self._pending: List[tuple] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight or settings.EMBEDDING_BATCH_MAX_IN_FLIGHT,
+            thread_name_prefix="embedding-batch"
+        )
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, dimensions: Optional[int] = None) -> Future:
+        """Queue one text and return a future resolving to its embedding."""
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Embedding batcher is closed")
+            self._pending.append((text, dimensions, future))
+            self.requests += 1
+            self._condition.notify()
+        return future
+
+    async def asubmit(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        """Queue one text from a coroutine and await its embedding without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text, dimensions))
+
+    def _run(self) -> None:
+        """Collect requests for one window at a time and hand each window to the pool."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed and not self._pending:
+                    return
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.service.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                window, self._pending = self._pending, []
+
+            by_dimensions: Dict[Optional[int], List[tuple]] = {}
+            for request in window:
+                by_dimensions.setdefault(request[1], []).append(request)
+            for dimensions, requests in by_dimensions.items():
+                self.batches += 1
+                self._executor.submit(self._dispatch, dimensions, requests)
+
+    def _dispatch(self, dimensions: Optional[int], requests: List[tuple]) -> None:
+        """Embed one window's texts and resolve the waiting futures."""
+        try:
+            vectors = self.service.embed_many([text for text, _, _ in requests], dimensions=dimensions)
+        except Exception as e:
+            for _, _, future in requests:
+                future.set_exception(e)
+            return
+        for (_, _, future), vector in zip(requests, vectors):
+            future.set_result(vector)
+
+    def close(self) -> None:
+        """Flush waiting requests and stop the dispatcher."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+
+class EmbeddingService:
+    """Wraps one pooled OpenAI client (sync and async) for embedding requests."""
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[EmbeddingCache] = None,
+        batch_window_ms: Optional[float] = None
+    ):
+        """
+        Initialize the embedding service.
+
+        Args:
+            model: Embedding model name (defaults to settings.EMBEDDING_MODEL)
+            api_key: OpenAI API key (defaults to settings.OPENAI_API_KEY)
+            batch_size: Maximum number of inputs sent in one embeddings request
+            max_connections: Size of the HTTP connection pool
+            max_keepalive_connections: Number of idle connections kept open for reuse
+            timeout: Request timeout in seconds
+            cache: Optional embedding cache consulted before calling the API
+            batch_window_ms: Micro-batching window for single-text requests
+                (defaults to settings.EMBEDDING_BATCH_WINDOW_MS; 0 sends each request immediately)
+        """
+        self.model = model or settings.EMBEDDING_MODEL
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.timeout = timeout or settings.OPENAI_TIMEOUT_SECONDS
+        self.cache = cache
+        self.api_calls = 0
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+        )
+
+        self.client = OpenAI(
+            api_key=self.api_key,
+            timeout=self.timeout,
+            http_client=DefaultHttpxClient(limits=self.limits, timeout=self.timeout)
+        )
+        # The async client binds its pool to the running event loop, so each loop gets its own
+        self._async_clients = PerLoopClients(self._new_async_client)
+
+        window_ms = settings.EMBEDDING_BATCH_WINDOW_MS if batch_window_ms is None else batch_window_ms
+        self.batcher: Optional[EmbeddingBatcher] = EmbeddingBatcher(self, window_ms) if window_ms > 0 else None
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Return the pooled async client of the running event loop, creating it on first use."""
+        return self._async_clients.get()
+
+    def _new_async_client(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            timeout=self.timeout,
+            http_client=DefaultAsyncHttpxClient(limits=self.limits, timeout=self.timeout)
+        )
+
+    @staticmethod
+    def _request_options(dimensions: Optional[int]) -> Dict[str, Any]:
+        """Extra embeddings request parameters; dimensions is only sent when reduced output is wanted."""
+        return {"dimensions": dimensions} if dimensions else {}
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized batches."""
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    @staticmethod
+    def _ordered_embeddings(response) -> List[List[float]]:
+        """Return the embeddings of a response in input order."""
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def embed(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        """
+        Embed a single string.
+
+        Cached vectors are returned at once; otherwise the request joins the current
+        micro-batching window, so concurrent callers share one embeddings request.
+
+        Args:
+            text: Text to embed
+            dimensions: Optional reduced output dimension (text-embedding-3 models)
+
+        Returns:
+            Embedding vector
+        """
+        cached = self._cached(text, dimensions)
+        if cached is not None:
+            return cached
+        if self.batcher is not None:
+            return self.batcher.submit(text, dimensions).result()
+        return self.embed_many([text], dimensions=dimensions)[0]
+
+    def embed_many(self, texts: List[str], dimensions: Optional[int] = None) -> List[List[float]]:
+        """
+        Embed several strings, serving cached vectors and batching the rest into
+        as few embeddings requests as possible.
+
+        Args:
+            texts: Texts to embed
+            dimensions: Optional reduced output dimension (text-embedding-3 models)
+
+        Returns:
+            List of embedding vectors in the same order as texts
+        """
+        texts = list(texts)
+        keys, vectors, missing = self._lookup(texts, dimensions)
+        if missing:
+            embedded = []
+            for batch in self._batches(missing):
+                self.api_calls += 1
+                response = self.client.embeddings.create(
+                    input=batch, model=self.model, **self._request_options(dimensions)
+                )
+                embedded.extend(self._ordered_embeddings(response))
+            self._store(missing, embedded, vectors, dimensions)
+        return [vectors[key] for key in keys]
+
+    async def aembed(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        """Async counterpart of embed; batched requests are awaited without blocking the event loop."""
+        cached = self._cached(text, dimensions)
+        if cached is not None:
+            return cached
+        if self.batcher is not None:
+            return await self.batcher.asubmit(text, dimensions)
+        return (await self.aembed_many([text], dimensions=dimensions))[0]
+
+    async def aembed_many(self, texts: List[str], dimensions: Optional[int] = None) -> List[List[float]]:
+        """Async counterpart of embed_many."""
+        texts = list(texts)
+        keys, vectors, missing = self._lookup(texts, dimensions)
+        if missing:
+            embedded = []
+            for batch in self._batches(missing):
+                self.api_calls += 1
+                response = await self.async_client.embeddings.create(
+                    input=batch, model=self.model, **self._request_options(dimensions)
+                )
+                embedded.extend(self._ordered_embeddings(response))
+            self._store(missing, embedded, vectors, dimensions)
+        return [vectors[key] for key in keys]
+
+    def _cached(self, text: str, dimensions: Optional[int] = None) -> Optional[List[float]]:
+        """Return the cached vector of one text, if any."""
+        if not self.cache:
+            return None
+        key = embedding_key(self.model, text, dimensions)
+        return self.cache.get_many([key]).get(key)
+
+    def _lookup(self, texts: List[str], dimensions: Optional[int] = None):
+        """
+        Resolve texts against the cache.
+
+        Returns:
+            (per-text cache keys, vectors found so far by key, distinct texts still to embed)
+        """
+        keys = [embedding_key(self.model, text, dimensions) for text in texts]
+        vectors: Dict[str, List[float]] = self.cache.get_many(keys) if self.cache else {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+        return keys, vectors, list(missing.values())
+
+    def _store(
+        self,
+        texts: List[str],
+        embedded: List[List[float]],
+        vectors: Dict[str, List[float]],
+        dimensions: Optional[int] = None
+    ) -> None:
+        """Record freshly embedded vectors in the result map and the cache."""
+        fresh = {embedding_key(self.model, text, dimensions): vector for text, vector in zip(texts, embedded)}
+        vectors.update(fresh)
+        if self.cache:
+            self.cache.set_many(fresh)
+
+    def close(self) -> None:
+        """Flush pending batched requests, close the pooled connections and flush the cache."""
+        if self.batcher is not None:
+            self.batcher.close()
+        self.client.close()
+        self._async_clients.close()
+        if self.cache:
+            self.cache.close()
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Return the process-wide embedding service, creating it on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                cache = EmbeddingCache() if settings.EMBEDDING_CACHE_ENABLED else None
+                _service = EmbeddingService(cache=cache)
+                if cache:
+                    atexit.register(cache.close)
+    return _service
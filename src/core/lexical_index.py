@@ -0,0 +1,129 @@
+"""
+Lexical Index
+Purpose: In-memory BM25 inverted index over FAS/SS chunk texts for exact-term keyword search.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from .vector_index import matches_filter
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Function words that carry no retrieval signal in standards text
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "shall", "should", "such", "that", "the", "this", "to", "which", "with"
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class _Postings:
+    """BM25 postings of one namespace."""
+
+    def __init__(self, records: List[Dict[str, Any]], k1: float, b: float):
+        self.ids = [record["id"] for record in records]
+        self.metadata = [record.get("metadata") or {} for record in records]
+        self.k1 = k1
+        self.b = b
+
+        doc_terms = defaultdict(list)
+        doc_tfs = defaultdict(list)
+        lengths = np.zeros(len(records), dtype=np.float32)
+        for row, metadata in enumerate(self.metadata):
+            tokens = tokenize(metadata.get("text", ""))
+            lengths[row] = len(tokens)
+            for term, count in Counter(tokens).items():
+                doc_terms[term].append(row)
+                doc_tfs[term].append(count)
+
+        average_length = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+        # Per-document length normalisation is fixed at build time
+        self.norms = (k1 * (1 - b + b * lengths / average_length)).astype(np.float32)
+        self.postings = {
+            term: (np.asarray(rows, dtype=np.int32), np.asarray(doc_tfs[term], dtype=np.float32))
+            for term, rows in doc_terms.items()
+        }
+        document_count = len(records)
+        self.idf = {
+            term: math.log(1 + (document_count - len(rows) + 0.5) / (len(rows) + 0.5))
+            for term, (rows, _) in self.postings.items()
+        }
+
+    def search(self, terms: List[str], top_k: int, filter: Optional[Dict]) -> List[Dict[str, Any]]:
+        """Score documents containing any of terms and return the best top_k."""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term in terms:
+            if term not in self.postings:
+                continue
+            rows, tfs = self.postings[term]
+            scores[rows] += self.idf[term] * tfs * (self.k1 + 1) / (tfs + self.norms[rows])
+
+        candidates = np.flatnonzero(scores > 0)
+        if filter:
+            candidates = np.asarray(
+                [row for row in candidates if matches_filter(self.metadata[row], filter)],
+                dtype=np.int64
+            )
+        if len(candidates) == 0:
+            return []
+
+        k = min(top_k, len(candidates))
+        best = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            {"id": self.ids[row], "score": float(scores[row]), "metadata": self.metadata[row]}
+            for row in best
+        ]
+
+
+class BM25Index:
+    """BM25 index with the same namespace and metadata-filter semantics as the vector backends."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Term-frequency saturation
+            b: Document-length normalisation strength
+        """
+        self.k1 = k1
+        self.b = b
+        self.namespaces: Dict[str, _Postings] = {}
+
+    def add_namespace(self, namespace: str, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index the records of a namespace, replacing any previous contents.
+
+        Args:
+            namespace: Namespace name
+            records: Records as {"id", "metadata"} with the chunk text in metadata["text"]
+        """
+        self.namespaces[namespace] = _Postings(list(records), self.k1, self.b)
+
+    def query(
+        self,
+        text: str,
+        top_k: int,
+        filter: Optional[Dict] = None,
+        namespace: str = "default"
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the top_k BM25 matches for text, best first.
+
+        Args:
+            text: Query text
+            top_k: Number of matches to return
+            filter: Optional Pinecone-style metadata filter
+            namespace: Namespace to search in
+        """
+        postings = self.namespaces.get(namespace)
+        if postings is None or top_k <= 0:
+            return []
+        return postings.search(tokenize(text), top_k, filter)
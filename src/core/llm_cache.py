@@ -0,0 +1,93 @@
+"""
+LLM Response Cache
+Purpose: Content-addressed chat-completion cache keyed by (model, system prompt hash, message hash,
+request parameters), persisted on disk with TTL and size-bounded eviction.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from openai.types.chat import ChatCompletion
+from .config import settings
+from .disk_cache import DiskLRUCache
+
+# Parameters that make a response unsuitable for replay
+UNCACHEABLE_PARAMS = ("stream",)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def llm_cache_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """
+    Return the cache key of a chat-completion request.
+
+    The system prompt is hashed on its own and leads the key, so editing an agent's
+    prompt changes the keys of that agent's requests only.
+    """
+    system = [message.get("content") for message in messages if message.get("role") == "system"]
+    conversation = [message for message in messages if message.get("role") != "system"]
+    return f"{model}:{_digest(system)[:16]}:{_digest(conversation)}:{_digest(params)[:16]}"
+
+
+def is_cacheable(params: Dict[str, Any]) -> bool:
+    """Whether a request with these parameters can be served from the cache."""
+    return not any(params.get(name) for name in UNCACHEABLE_PARAMS)
+
+
+class LLMResponseCache:
+    """Chat-completion responses stored in a size-capped SQLite table, expiring after a TTL."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Open the cache.
+
+        Args:
+            path: SQLite file (defaults to settings.LLM_CACHE_PATH)
+            max_entries: Entries kept on disk (defaults to settings.LLM_CACHE_MAX_ENTRIES)
+            ttl_seconds: Entry lifetime (defaults to settings.LLM_CACHE_TTL_SECONDS; 0 disables expiry)
+        """
+        self.store = DiskLRUCache(
+            path or settings.LLM_CACHE_PATH,
+            table_name="llm_responses",
+            max_entries=max_entries or settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        """Return the cached response stored under key, or None."""
+        value = self.store.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ChatCompletion.model_validate_json(value)
+
+    def set(self, key: str, response: Any) -> None:
+        """Store a response under key; responses that are not ChatCompletion objects are skipped."""
+        if isinstance(response, ChatCompletion):
+            self.store.set(key, response.model_dump_json().encode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of stored responses."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.store)}
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        self.store.clear()
+
+    def close(self) -> None:
+        """Flush pending writes to disk."""
+        self.store.close()
@@ -0,0 +1,378 @@
+"""
+LLM Gateway
+Purpose: Process-wide chat-completion client shared by every agent, with pooled connections,
+per-model rate limiting and in-flight caps, and jittered retry on rate limits and server errors.
+"""
+
+import asyncio
+import atexit
+import json
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+import httpx
+from openai import (
+    AsyncOpenAI, OpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient,
+    APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+)
+from tenacity import AsyncRetrying, Retrying, retry_if_exception, stop_after_attempt
+from .config import settings
+from .llm_cache import LLMResponseCache, is_cacheable, llm_cache_key
+from .loop_clients import PerLoopClients
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at rate_per_minute.
+
+    reserve() debits the bucket immediately, letting it go negative, and returns how long
+    the caller must wait before its share is available; callers are therefore served in
+    arrival order and a large request never starves behind small ones.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: Sustained refill rate
+            capacity: Burst size (defaults to one minute of refill)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens and return the delay in seconds before they may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return tokens that were reserved but not used."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ModelLimits:
+    """
+    Request and token buckets plus the in-flight cap of one model.
+
+    Threads share one semaphore; each event loop gets its own asyncio semaphore of the
+    same size, so waiting coroutines hold no thread.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_in_flight: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.max_in_flight = max_in_flight
+        self._async_in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+        self.calls = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+    def async_in_flight(self) -> asyncio.Semaphore:
+        """The in-flight semaphore of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            semaphore = self._async_in_flight.get(loop)
+            if semaphore is None:
+                # A used semaphore references its loop, so closed loops are dropped explicitly
+                for closed in [other for other in self._async_in_flight if other.is_closed()]:
+                    del self._async_in_flight[closed]
+                semaphore = self._async_in_flight[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections are retried."""
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error: Optional[BaseException]) -> float:
+    """Seconds the provider asked us to wait, from the Retry-After header (0 when absent)."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """Rough token count of a request: about four characters per token plus the completion allowance."""
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return prompt_chars // 4 + (max_tokens or settings.LLM_ESTIMATED_COMPLETION_TOKENS)
+
+
+class LLMGateway:
+    """
+    Chat-completion client shared by all agents.
+
+    Every request waits for its model's request and token buckets, holds one of the
+    model's in-flight slots while it runs, and is retried with jittered exponential
+    backoff (honouring Retry-After) on 429, 5xx, timeouts and connection errors.
+    The OpenAI client's own retries are disabled so this is the only retry policy.
+    With a response cache, identical requests are answered from disk without using any limits.
+    achat_completion() applies the same limits on an event loop without blocking it:
+    sync and async callers share the rate budget of each model, and every event loop
+    gets an in-flight cap of the model's size.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        model_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        cache: Optional[LLMResponseCache] = None
+    ):
+        """
+        Initialize the gateway; the HTTP client is created on first use.
+
+        Args:
+            api_key: OpenAI API key (defaults to settings.OPENAI_API_KEY)
+            max_connections: Size of the HTTP connection pool
+            max_keepalive_connections: Number of idle connections kept open for reuse
+            timeout: Request timeout in seconds
+            max_retries: Attempts per request, including the first (defaults to settings.LLM_MAX_RETRIES)
+            model_limits: Per-model overrides {"model": {"rpm", "tpm", "max_in_flight"}}
+                (defaults to settings.LLM_MODEL_LIMITS)
+            cache: Optional response cache consulted before calling the API
+        """
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.timeout = timeout or settings.OPENAI_TIMEOUT_SECONDS
+        self.max_retries = max_retries or settings.LLM_MAX_RETRIES
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+        )
+        self.model_limits = json.loads(settings.LLM_MODEL_LIMITS) if model_limits is None else model_limits
+        self.cache = cache
+        self._models: Dict[str, ModelLimits] = {}
+        self._models_lock = threading.Lock()
+        self._client: Optional[OpenAI] = None
+        self._client_lock = threading.Lock()
+        self._async_clients = PerLoopClients(self._new_async_client)
+
+    @property
+    def client(self) -> OpenAI:
+        """The pooled OpenAI client, created on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = OpenAI(
+                        api_key=self.api_key,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=DefaultHttpxClient(limits=self.limits, timeout=self.timeout)
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """The pooled AsyncOpenAI client of the running event loop (see PerLoopClients)."""
+        return self._async_clients.get()
+
+    def _new_async_client(self) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            timeout=self.timeout,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(limits=self.limits, timeout=self.timeout)
+        )
+
+    def limits_for(self, model: str) -> ModelLimits:
+        """Return the limiter state of a model, creating it from the configured limits on first use."""
+        if model not in self._models:
+            with self._models_lock:
+                if model not in self._models:
+                    overrides = self.model_limits.get(model, {})
+                    self._models[model] = ModelLimits(
+                        overrides.get("rpm", settings.LLM_REQUESTS_PER_MINUTE),
+                        overrides.get("tpm", settings.LLM_TOKENS_PER_MINUTE),
+                        int(overrides.get("max_in_flight", settings.LLM_MAX_IN_FLIGHT))
+                    )
+        return self._models[model]
+
+    def _admit(self, limits: ModelLimits, estimated_tokens: int) -> float:
+        """Reserve one request and the estimated tokens; return how long to wait before sending."""
+        delay = max(limits.requests.reserve(1), limits.tokens.reserve(estimated_tokens))
+        limits.throttled_seconds += delay
+        return delay
+
+    @staticmethod
+    def _settle(limits: ModelLimits, estimated_tokens: int, response: Any) -> None:
+        """Give back the tokens the estimate over-reserved, once the real usage is known."""
+        used = getattr(getattr(response, "usage", None), "total_tokens", None)
+        if isinstance(used, int) and used < estimated_tokens:
+            limits.tokens.refund(estimated_tokens - used)
+
+    def _wait(self, limits: ModelLimits):
+        """Tenacity wait strategy: full-jitter exponential backoff, at least the provider's Retry-After."""
+        def wait(retry_state) -> float:
+            limits.retries += 1
+            ceiling = min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2 ** retry_state.attempt_number)
+            error = retry_state.outcome.exception() if retry_state.outcome else None
+            return max(_retry_after(error), random.uniform(0, ceiling))
+        return wait
+
+    def _retrying(self, limits: ModelLimits) -> Retrying:
+        return Retrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=self._wait(limits),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
+
+    def _aretrying(self, limits: ModelLimits) -> AsyncRetrying:
+        return AsyncRetrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=self._wait(limits),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
+
+    def _cache_key(self, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any], cache: bool) -> Optional[str]:
+        """Cache key of a request, or None when the request must not use the cache."""
+        if not (cache and self.cache and is_cacheable(params)):
+            return None
+        return llm_cache_key(model, messages, params)
+
+    def _cached(self, limits: ModelLimits, key: Optional[str]) -> Any:
+        """Return the cached response of a request, if any."""
+        if key is None:
+            return None
+        response = self.cache.get(key)
+        if response is not None:
+            limits.cache_hits += 1
+        return response
+
+    def _store(self, key: Optional[str], response: Any) -> None:
+        if key is not None:
+            self.cache.set(key, response)
+
+    def chat_completion(self, model: str, messages: List[Dict[str, Any]], cache: bool = True, **params) -> Any:
+        """
+        Create a chat completion through the shared limits.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            cache: Whether the response cache may answer or store this request
+            **params: Any other chat.completions.create parameters (temperature, response_format, ...)
+
+        Returns:
+            The ChatCompletion response
+        """
+        limits = self.limits_for(model)
+        key = self._cache_key(model, messages, params, cache)
+        cached = self._cached(limits, key)
+        if cached is not None:
+            return cached
+        estimated = estimate_tokens(messages, params.get("max_tokens"))
+
+        def attempt():
+            delay = self._admit(limits, estimated)
+            if delay:
+                time.sleep(delay)
+            with limits.in_flight:
+                limits.calls += 1
+                return self.client.chat.completions.create(model=model, messages=messages, **params)
+
+        response = self._retrying(limits)(attempt)
+        self._settle(limits, estimated, response)
+        self._store(key, response)
+        return response
+
+    async def achat_completion(self, model: str, messages: List[Dict[str, Any]], cache: bool = True, **params) -> Any:
+        """
+        Async counterpart of chat_completion; waits for rate limits and in-flight slots
+        without blocking the event loop.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            cache: Whether the response cache may answer or store this request
+            **params: Any other chat.completions.create parameters (temperature, response_format, ...)
+
+        Returns:
+            The ChatCompletion response
+        """
+        limits = self.limits_for(model)
+        key = self._cache_key(model, messages, params, cache)
+        # The cache is SQLite-backed, so its I/O runs off the event loop
+        cached = await asyncio.to_thread(self._cached, limits, key) if key is not None else None
+        if cached is not None:
+            return cached
+        estimated = estimate_tokens(messages, params.get("max_tokens"))
+
+        async def attempt():
+            delay = self._admit(limits, estimated)
+            if delay:
+                await asyncio.sleep(delay)
+            async with limits.async_in_flight():
+                limits.calls += 1
+                return await self.async_client.chat.completions.create(model=model, messages=messages, **params)
+
+        response = await self._aretrying(limits)(attempt)
+        self._settle(limits, estimated, response)
+        if key is not None:
+            await asyncio.to_thread(self._store, key, response)
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model request, retry and throttling counters."""
+        return {
+            model: {
+                "calls": limits.calls,
+                "cache_hits": limits.cache_hits,
+                "retries": limits.retries,
+                "throttled_seconds": round(limits.throttled_seconds, 3),
+                "max_in_flight": limits.max_in_flight
+            }
+            for model, limits in self._models.items()
+        }
+
+    def close(self) -> None:
+        """Close the pooled connections and flush the response cache."""
+        if self._client is not None:
+            self._client.close()
+        self._async_clients.close()
+        if self.cache:
+            self.cache.close()
+
+    async def aclose(self) -> None:
+        """Close the async client of the running event loop."""
+        await self._async_clients.aclose()
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Return the process-wide LLM gateway, creating it on first use."""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                cache = LLMResponseCache() if settings.LLM_CACHE_ENABLED else None
+                _gateway = LLMGateway(cache=cache)
+                if cache:
+                    atexit.register(cache.close)
+    return _gateway
@@ -0,0 +1,77 @@
+"""
+Loop Clients
+Purpose: One async HTTP client per running event loop, each closed on its own loop when that loop shuts down.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Callable, Dict
+
+
+class PerLoopClients:
+    """
+    Async clients keyed by the event loop that uses them.
+
+    httpx async connections are bound to the loop that opened them, so a client reused
+    after its loop closed fails with "Event loop is closed". Each loop therefore gets its
+    own client, and a closer task closes it when asyncio.run() cancels the loop's pending
+    tasks, the last point where its connections can still be shut down cleanly.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+            factory: Creates a new client with an async close() method
+        """
+        self.factory = factory
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._closers: Dict[Any, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the client of the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                # Loops closed without cancelling their tasks never ran their closer; drop them
+                for stale in [c for c, closer in self._closers.items() if closer.get_loop().is_closed()]:
+                    del self._closers[stale]
+                client = self.factory()
+                self._clients[loop] = client
+                self._closers[client] = loop.create_task(self._close_with_loop(loop, client))
+        return client
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop, client: Any) -> None:
+        """Wait until cancelled, then close the client on its own loop."""
+        try:
+            await loop.create_future()
+        finally:
+            with self._lock:
+                if self._clients.get(loop) is client:
+                    del self._clients[loop]
+                self._closers.pop(client, None)
+            await client.close()
+
+    def close(self) -> None:
+        """Ask every live loop to close its client; loops in other threads are signalled thread-safely."""
+        with self._lock:
+            closers = list(self._closers.values())
+        for closer in closers:
+            loop = closer.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(closer.cancel)
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            closer = self._closers.get(client) if client is not None else None
+        if closer is not None:
+            closer.cancel()
+            await asyncio.wait([closer])
+
+    def __len__(self) -> int:
+        return len(self._clients)
@@ -0,0 +1,347 @@
+"""
+Mapped Vector Index
+Purpose: Read-only vector index stored as memory-mapped float16/int8 arrays plus a compact metadata sidecar,
+so it opens in milliseconds and its pages are shared between worker processes through the OS page cache.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from .config import settings
+from .vector_index import LocalVectorIndex, VectorIndexBackend, _RowFilter, _normalize
+
+FORMAT_VERSION = 1
+DTYPES = ("float16", "int8")
+
+
+def write_mapped_index(index: LocalVectorIndex, directory: str, dtype: Optional[str] = None) -> None:
+    """
+    Write a LocalVectorIndex in the mapped format.
+
+    The store is written next to directory and swapped in with a rename, so processes
+    that already mapped the previous version keep reading consistent files.
+
+    Layout:
+        store.json        dimension, dtype, namespace row ranges, ids, metadata dictionaries
+        vectors.npy       N x D float16, or int8 with a per-row float32 scale in scales.npy
+        column_<i>.npy    int32 codes into a metadata field's distinct values (-1 = absent)
+        text.bin          UTF-8 chunk texts back to back, sliced by text_offsets.npy
+
+    Args:
+        index: Source index (vectors are already unit length)
+        directory: Target directory
+        dtype: "float16" or "int8" (defaults to settings.MAPPED_INDEX_DTYPE)
+    """
+    dtype = dtype or settings.MAPPED_INDEX_DTYPE
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported mapped index dtype: {dtype}")
+
+    staging = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    ids, metadata, blocks, ranges = [], [], [], {}
+    for name, store in index.namespaces.items():
+        ranges[name] = [len(ids), len(ids) + len(store)]
+        ids.extend(store.ids)
+        metadata.extend(store.metadata)
+        blocks.append(store.vectors)
+    dimension = index.dimension or 0
+    vectors = np.vstack(blocks) if blocks else np.zeros((0, dimension), dtype=np.float32)
+
+    if dtype == "float16":
+        np.save(os.path.join(staging, "vectors.npy"), vectors.astype(np.float16))
+    else:
+        scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.zeros(0, dtype=np.float32)
+        scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        np.save(os.path.join(staging, "vectors.npy"), quantized)
+        np.save(os.path.join(staging, "scales.npy"), scales)
+
+    texts = [meta.get("text", "").encode("utf-8") for meta in metadata]
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(text) for text in texts])
+    with open(os.path.join(staging, "text.bin"), "wb") as f:
+        for text in texts:
+            f.write(text)
+    np.save(os.path.join(staging, "text_offsets.npy"), offsets)
+
+    fields = sorted({field for meta in metadata for field in meta if field != "text"})
+    columns = {}
+    for position, field in enumerate(fields):
+        values, codes_by_value = [], {}
+        codes = np.full(len(metadata), -1, dtype=np.int32)
+        for row, meta in enumerate(metadata):
+            if field not in meta:
+                continue
+            value_key = json.dumps(meta[field], sort_keys=True)
+            if value_key not in codes_by_value:
+                codes_by_value[value_key] = len(values)
+                values.append(meta[field])
+            codes[row] = codes_by_value[value_key]
+        np.save(os.path.join(staging, f"column_{position}.npy"), codes)
+        columns[field] = {"file": f"column_{position}.npy", "values": values}
+
+    with open(os.path.join(staging, "store.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "format_version": FORMAT_VERSION,
+            "dimension": dimension,
+            "dtype": dtype,
+            "created_at": time.time(),
+            "namespaces": ranges,
+            "ids": ids,
+            "columns": columns
+        }, f, ensure_ascii=False)
+
+    previous = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+
+
+def _load_mapped(path: str) -> np.ndarray:
+    """Memory-map a .npy file; empty arrays cannot be mapped and are read normally."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)
+
+
+def _store_signature(directory: str) -> tuple:
+    """Identity of the store.json currently in directory; every rebuild swaps in a new file."""
+    stat = os.stat(os.path.join(directory, "store.json"))
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+class _MappedNamespace(_RowFilter):
+    """Row range of a mapped store; filters are evaluated on decoded metadata columns."""
+
+    def __init__(self, store: "_MappedStore", start: int, stop: int):
+        self.store = store
+        self.start = start
+        self.ids = store.ids[start:stop]
+        self.rows = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        self.vectors = store.vectors[start:stop]
+        self.scales = store.scales[start:stop] if store.scales is not None else None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, field: str) -> np.ndarray:
+        """Decode one metadata field for every row of the namespace (cached)."""
+        if field not in self._columns:
+            spec = self.store.columns.get(field)
+            if spec is None:
+                column = np.empty(len(self.ids), dtype=object)
+            else:
+                values = np.empty(len(spec["values"]) + 1, dtype=object)
+                values[:-1] = spec["values"]
+                # Code -1 selects the trailing None
+                column = values[self.store.codes[field][self.start:self.start + len(self.ids)]]
+            self._columns[field] = column
+        return self._columns[field]
+
+    def record_metadata(self, row: int) -> Dict[str, Any]:
+        """Materialize the metadata dict of one row."""
+        store, absolute = self.store, self.start + row
+        metadata = {}
+        for field, spec in store.columns.items():
+            code = store.codes[field][absolute]
+            if code >= 0:
+                metadata[field] = spec["values"][code]
+        begin, end = store.text_offsets[absolute], store.text_offsets[absolute + 1]
+        metadata["text"] = store.text[begin:end].tobytes().decode("utf-8")
+        return metadata
+
+    def vectors_float32(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dequantize all rows, or the given ones, to float32."""
+        block = self.vectors if rows is None else self.vectors[rows]
+        block = block.astype(np.float32)
+        if self.scales is not None:
+            block *= (self.scales if rows is None else self.scales[rows])[:, None]
+        return block
+
+
+class _MappedStore:
+    """One version of a mapped index as written by write_mapped_index: store.json plus the mapped arrays."""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Directory written by write_mapped_index
+        """
+        # Taken before reading, so a rebuild that lands mid-load is picked up on the next check
+        self.signature = _store_signature(directory)
+        with open(os.path.join(directory, "store.json"), "r", encoding="utf-8") as f:
+            store = json.load(f)
+        if store.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported mapped index format: {store.get('format_version')}")
+        self.dimension = store["dimension"]
+        self.dtype = store["dtype"]
+        self.version = store["created_at"]
+        self.ids: List[str] = store["ids"]
+        self.columns: Dict[str, Dict[str, Any]] = store["columns"]
+        self.vectors = _load_mapped(os.path.join(directory, "vectors.npy"))
+        scales_path = os.path.join(directory, "scales.npy")
+        self.scales = _load_mapped(scales_path) if os.path.exists(scales_path) else None
+        self.codes = {
+            field: _load_mapped(os.path.join(directory, spec["file"]))
+            for field, spec in self.columns.items()
+        }
+        self.text_offsets = _load_mapped(os.path.join(directory, "text_offsets.npy"))
+        text_path = os.path.join(directory, "text.bin")
+        self.text = (
+            np.memmap(text_path, dtype=np.uint8, mode="r")
+            if os.path.getsize(text_path) else np.zeros(0, dtype=np.uint8)
+        )
+        self.namespaces: Dict[str, _MappedNamespace] = {
+            name: _MappedNamespace(self, start, stop) for name, (start, stop) in store["namespaces"].items()
+        }
+
+
+class MappedVectorIndex(VectorIndexBackend):
+    """
+    Read-only cosine-similarity index over a store written by write_mapped_index.
+
+    Vectors, metadata codes and texts are memory-mapped, so opening the store reads only
+    store.json and every process that maps the same files shares their pages. Queries
+    are scored in blocks of settings.MAPPED_INDEX_BLOCK_ROWS rows, dequantizing one
+    block at a time instead of holding a float32 copy of the matrix.
+
+    Each operation checks whether write_mapped_index has swapped in a rebuilt store
+    (one stat of store.json) and remaps it if so; operations already running keep
+    reading the version they started with.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Directory written by write_mapped_index
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._store = _MappedStore(directory)
+
+    def _current(self) -> _MappedStore:
+        """Return the mapped store, remapping it first if it was rebuilt on disk."""
+        store = self._store
+        try:
+            signature = _store_signature(self.directory)
+        except FileNotFoundError:
+            # write_mapped_index is between its two renames; keep serving the mapped version
+            return store
+        if signature == store.signature:
+            return store
+        with self._lock:
+            if self._store.signature != signature:
+                try:
+                    self._store = _MappedStore(self.directory)
+                except (OSError, ValueError) as e:
+                    print(f"Error remapping index at {self.directory}, keeping the previous version: {e}")
+            return self._store
+
+    @property
+    def version(self) -> float:
+        """Build time of the mapped store."""
+        return self._current().version
+
+    @property
+    def dimension(self) -> int:
+        return self._current().dimension
+
+    @property
+    def namespaces(self) -> Dict[str, _MappedNamespace]:
+        return self._current().namespaces
+
+    def query(self, vector, top_k, filter=None, namespace="default", include_metadata=True, include_values=False):
+        store = self._current().namespaces.get(namespace)
+        if store is None or len(store) == 0 or top_k <= 0:
+            return []
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        mask = store.filter_mask(filter)
+
+        if mask is None:
+            candidates = np.arange(len(store))
+            scores = self._score_blocks(store, query)
+        else:
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0:
+                return []
+            if len(candidates) * 2 > len(store):
+                scores = self._score_blocks(store, query)[candidates]
+            else:
+                scores = store.vectors_float32(candidates) @ query
+
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        matches = []
+        for position in best:
+            row = int(candidates[position])
+            match = {
+                "id": store.ids[row],
+                "score": float(scores[position]),
+                "metadata": store.record_metadata(row) if include_metadata else {}
+            }
+            if include_values:
+                match["values"] = store.vectors_float32(np.array([row]))[0].tolist()
+            matches.append(match)
+        return matches
+
+    @staticmethod
+    def _score_blocks(store: _MappedNamespace, query: np.ndarray) -> np.ndarray:
+        """Cosine scores of every row, dequantizing one block of rows at a time."""
+        block_rows = settings.MAPPED_INDEX_BLOCK_ROWS
+        scores = np.empty(len(store), dtype=np.float32)
+        for start in range(0, len(store), block_rows):
+            stop = min(start + block_rows, len(store))
+            scores[start:stop] = store.vectors[start:stop].astype(np.float32) @ query
+        if store.scales is not None:
+            scores *= store.scales
+        return scores
+
+    def fetch(self, ids, namespace="default"):
+        store = self._current().namespaces.get(namespace)
+        if store is None:
+            return {}
+        rows = [(vector_id, store.rows[vector_id]) for vector_id in ids if vector_id in store.rows]
+        if not rows:
+            return {}
+        values = store.vectors_float32(np.array([row for _, row in rows]))
+        return {
+            vector_id: {"id": vector_id, "values": values[position].tolist(), "metadata": store.record_metadata(row)}
+            for position, (vector_id, row) in enumerate(rows)
+        }
+
+    def upsert(self, vectors, namespace="default"):
+        raise NotImplementedError("Mapped indexes are read-only; rebuild them with write_mapped_index")
+
+    def delete(self, ids, namespace="default"):
+        raise NotImplementedError("Mapped indexes are read-only; rebuild them with write_mapped_index")
+
+    def version_stamp(self):
+        return self.version
+
+    def describe_index_stats(self):
+        current = self._current()
+        return {
+            "dimension": current.dimension,
+            "total_vector_count": len(current.ids),
+            "namespaces": {name: {"vector_count": len(store)} for name, store in current.namespaces.items()}
+        }
+
+    def iter_records(self, namespace: str = "default") -> Iterator[Dict[str, Any]]:
+        """Yield every record of a namespace as {"id", "metadata"}."""
+        store = self._current().namespaces.get(namespace)
+        if store is None:
+            return
+        for row, vector_id in enumerate(store.ids):
+            yield {"id": vector_id, "metadata": store.record_metadata(row)}
@@ -0,0 +1,115 @@
+"""
+Re-ranking
+Purpose: Rank fusion and re-ranking helpers applied to retrieval matches.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+def reciprocal_rank_fusion(rankings: List[List[Dict[str, Any]]], top_n: int, k: int = 60) -> List[Dict[str, Any]]:
+    """
+    Fuse several ranked match lists with reciprocal rank fusion.
+
+    Each match contributes 1 / (k + rank) for every list it appears in; the fused
+    score replaces the original "score" of the returned matches.
+
+    Args:
+        rankings: Ranked lists of matches ({"id", "score", "metadata"}), best first
+        top_n: Number of fused matches to return
+        k: RRF damping constant
+
+    Returns:
+        Fused matches, best first
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, match in enumerate(ranking, start=1):
+            entry = fused.setdefault(match["id"], {**match, "score": 0.0})
+            entry["score"] += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda match: match["score"], reverse=True)[:top_n]
+
+
+def mmr_select(
+    query_vector: Sequence[float],
+    candidate_vectors: Sequence[Sequence[float]],
+    top_n: int,
+    lambda_mult: float = 0.5,
+    duplicate_threshold: float = 1.0
+) -> List[int]:
+    """
+    Select a relevant but diverse subset of candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximising
+    lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, selected),
+    with cosine similarities computed once as a matrix. Candidates whose similarity
+    to an already selected one reaches duplicate_threshold are dropped, so fewer than
+    top_n positions are returned when the rest are near-duplicates.
+
+    Args:
+        query_vector: Query embedding
+        candidate_vectors: Candidate embeddings, best first
+        top_n: Maximum number of candidates to select
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+        duplicate_threshold: Cosine similarity at which a candidate counts as a duplicate
+
+    Returns:
+        Positions of the selected candidates, in selection order
+    """
+    if top_n <= 0 or len(candidate_vectors) == 0:
+        return []
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_vector, dtype=np.float32)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every candidate to anything selected so far
+    redundancy = pairwise[selected[0]].copy()
+    available = redundancy < duplicate_threshold
+    available[selected[0]] = False
+    while len(selected) < top_n and available.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        choice = int(np.argmax(scores))
+        selected.append(choice)
+        np.maximum(redundancy, pairwise[choice], out=redundancy)
+        available &= redundancy < duplicate_threshold
+        available[choice] = False
+    return selected
+
+
+def adaptive_cutoff(
+    scores: Sequence[float],
+    min_score: float,
+    max_gap: float,
+    min_results: int = 1
+) -> int:
+    """
+    Decide how many of a best-first ranked list to keep.
+
+    The list is cut before the first score below min_score and at the first drop between
+    consecutive scores of at least max_gap (a score cliff), whichever comes first, but
+    never below min_results (or the list length, if shorter).
+
+    Args:
+        scores: Relevance scores, best first
+        min_score: Lowest similarity worth keeping
+        max_gap: Drop between neighbouring scores that ends the list
+        min_results: Number of results always kept
+
+    Returns:
+        Number of leading results to keep
+    """
+    keep = 0
+    for position, score in enumerate(scores):
+        if score < min_score:
+            break
+        if position > 0 and scores[position - 1] - score >= max_gap:
+            break
+        keep = position + 1
+    return max(keep, min(min_results, len(scores)))
@@ -0,0 +1,105 @@
+"""
+Retrieval Cache
+Purpose: In-memory cache of retrieval results with TTL, max-entry eviction and index-version invalidation.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+from .config import settings
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that counts capacity evictions."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class RetrievalCache:
+    """
+    Result cache in front of a retriever.
+
+    Every lookup passes the index's current version stamp; when it differs from the
+    stamp the cached entries were stored under, the whole cache is dropped.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_entries: Maximum number of cached result lists (defaults to settings.RETRIEVAL_CACHE_MAX_ENTRIES)
+            ttl_seconds: Lifetime of a cached entry (defaults to settings.RETRIEVAL_CACHE_TTL_SECONDS)
+        """
+        self.max_entries = max_entries or settings.RETRIEVAL_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.RETRIEVAL_CACHE_TTL_SECONDS
+        self._entries = _CountingTTLCache(maxsize=self.max_entries, ttl=self.ttl_seconds)
+        self._version: Any = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: Any) -> None:
+        """Drop every entry if the index version changed (caller holds the lock)."""
+        if version != self._version:
+            if self._version is not None and len(self._entries):
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: Any) -> Optional[Any]:
+        """
+        Return the cached value for key, or None on a miss.
+
+        Args:
+            key: Cache key describing the query
+            version: Current version stamp of the index
+        """
+        with self._lock:
+            self._check_version(version)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, version: Any, value: Any) -> None:
+        """
+        Store value under key for the given index version.
+
+        Args:
+            key: Cache key describing the query
+            version: Version stamp of the index the value was computed against
+            value: Value to cache
+        """
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = value
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and sizing information."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._entries.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds
+            }
@@ -0,0 +1,205 @@
+"""
+Semantic Cache
+Purpose: Near-duplicate text cache. Serves a stored payload when a new text embeds within a
+cosine-similarity threshold of one already seen under the same context.
+"""
+
+import hashlib
+import re
+import threading
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from .config import settings
+from .embedding_cache import normalize_text
+from .embeddings import EmbeddingService, get_embedding_service
+
+
+# Words that flip what a clause requires while barely moving its embedding
+_POLARITY_WORDS = frozenset({
+    "not", "no", "never", "without", "neither", "nor", "cannot",
+    "prohibited", "permitted", "forbidden", "allowed", "permissible", "impermissible"
+})
+
+
+def polarity_signature(text: str) -> Tuple[str, ...]:
+    """
+    Numbers and negation/permission words of a text, as a sorted tuple.
+
+    "shall" vs "shall not" or 2% vs 5% embed almost identically, so near-duplicates
+    must also agree on this signature before a payload is reused.
+    """
+    tokens = re.findall(r"\d+(?:\.\d+)?|[a-z]+(?:n't)?", text.lower())
+    return tuple(sorted(t for t in tokens if t[0].isdigit() or t in _POLARITY_WORDS or t.endswith("n't")))
+
+
+class SemanticMatch(NamedTuple):
+    """A cached payload together with the text it was stored for and how close the query was."""
+    payload: Dict[str, Any]
+    matched_text: str
+    similarity: float
+
+
+class _Context:
+    """Entries stored under one context: unit vectors stacked into a matrix for one-shot scoring."""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.vectors: List[np.ndarray] = []
+        self.signatures: List[Tuple[str, ...]] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors)
+        return self._matrix
+
+    def append(self, text: str, payload: Dict[str, Any], vector: np.ndarray) -> None:
+        self.texts.append(text)
+        self.payloads.append(payload)
+        self.vectors.append(vector)
+        self.signatures.append(polarity_signature(text))
+        self._matrix = None
+
+    def pop_oldest(self) -> None:
+        del self.texts[0], self.payloads[0], self.vectors[0], self.signatures[0]
+        self._matrix = None
+
+
+class SemanticCache:
+    """
+    In-memory cache of payloads keyed by text embedding and an exact context.
+
+    Texts are only compared with texts stored under the same context (for example the
+    same standards summary), so a verdict is never reused against different guidance,
+    and only with texts of the same polarity_signature, so a negated obligation or a
+    changed figure is never served the original's verdict.
+    Entries beyond max_entries are evicted oldest first.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        embedding_service: Optional[EmbeddingService] = None
+    ):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a hit (defaults to settings.COMPLIANCE_SEMANTIC_CACHE_THRESHOLD)
+            max_entries: Entries kept across all contexts (defaults to settings.COMPLIANCE_SEMANTIC_CACHE_MAX_ENTRIES)
+            embedding_service: Service used to embed texts (defaults to the shared service)
+        """
+        self.threshold = threshold or settings.COMPLIANCE_SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or settings.COMPLIANCE_SEMANTIC_CACHE_MAX_ENTRIES
+        self._embedding_service = embedding_service
+        self._contexts: Dict[str, _Context] = {}
+        # Context key of every stored entry, oldest first
+        self._order: deque = deque()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        if self._embedding_service is None:
+            self._embedding_service = get_embedding_service()
+        return self._embedding_service
+
+    @staticmethod
+    def context_key(context: str) -> str:
+        """Key of a context; whitespace and Unicode variants of the same context share one key."""
+        return hashlib.sha256(normalize_text(context).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def vector(self, text: str) -> np.ndarray:
+        """Embed text (whitespace-normalized) as a unit vector."""
+        return self._unit(self.embedding_service.embed(normalize_text(text)))
+
+    async def avector(self, text: str) -> np.ndarray:
+        """Async counterpart of vector."""
+        return self._unit(await self.embedding_service.aembed(normalize_text(text)))
+
+    def match(self, vector: np.ndarray, context: str, text: Optional[str] = None) -> Optional[SemanticMatch]:
+        """
+        Find the closest stored text under the same context.
+
+        Args:
+            vector: Unit vector of the query text (from vector/avector)
+            context: Context the payload must have been stored under
+            text: Query text; when given, only stored texts with the same numbers and
+                negation words can match
+
+        Returns:
+            The best match at or above the threshold, or None
+        """
+        with self._lock:
+            entries = self._contexts.get(self.context_key(context))
+            if entries is None or not entries.vectors:
+                self.misses += 1
+                return None
+            scores = entries.matrix @ vector
+            if text is not None:
+                signature = polarity_signature(text)
+                scores = np.where([s == signature for s in entries.signatures], scores, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return SemanticMatch(dict(entries.payloads[best]), entries.texts[best], float(scores[best]))
+
+    def add(self, vector: np.ndarray, text: str, context: str, payload: Dict[str, Any]) -> None:
+        """
+        Store a payload for text under context, evicting the oldest entries beyond max_entries.
+
+        Args:
+            vector: Unit vector of text (from vector/avector)
+            text: The text the payload was computed for
+            context: Context the payload is valid under
+            payload: JSON-compatible payload served on later hits
+        """
+        key = self.context_key(context)
+        with self._lock:
+            self._contexts.setdefault(key, _Context()).append(text, payload, vector)
+            self._order.append(key)
+            while len(self._order) > self.max_entries:
+                oldest = self._order.popleft()
+                entries = self._contexts[oldest]
+                entries.pop_oldest()
+                if not entries.vectors:
+                    del self._contexts[oldest]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of stored entries."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self), "threshold": self.threshold}
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._contexts.clear()
+            self._order.clear()
+
+
+_compliance_cache: Optional[SemanticCache] = None
+_compliance_cache_lock = threading.Lock()
+
+
+def get_compliance_cache() -> SemanticCache:
+    """Return the process-wide semantic cache of Shariah compliance verdicts, creating it on first use."""
+    global _compliance_cache
+    if _compliance_cache is None:
+        with _compliance_cache_lock:
+            if _compliance_cache is None:
+                _compliance_cache = SemanticCache()
+    return _compliance_cache
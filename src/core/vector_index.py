@@ -0,0 +1,743 @@
+"""
+Vector Index Backends
+Purpose: Pluggable vector index interface with a Pinecone backend and an in-process NumPy backend.
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from .config import settings
+
+
+class VectorIndexBackend(ABC):
+    """
+    Interface shared by every vector index backend.
+
+    Matches are plain dictionaries with "id", "score" and "metadata" keys (plus "values"
+    when requested), so retrievers can handle them the same way regardless of the backend.
+    """
+
+    @abstractmethod
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter: Optional[Dict] = None,
+        namespace: str = "default",
+        include_metadata: bool = True,
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Return the top_k matches for vector, best first."""
+
+    @abstractmethod
+    def fetch(self, ids: List[str], namespace: str = "default") -> Dict[str, Dict[str, Any]]:
+        """Return the stored records for ids, keyed by id; unknown ids are omitted."""
+
+    @abstractmethod
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = "default") -> None:
+        """Insert or replace records given as {"id", "values", "metadata"} dictionaries."""
+
+    @abstractmethod
+    def delete(self, ids: List[str], namespace: str = "default") -> None:
+        """Delete records by id."""
+
+    @abstractmethod
+    def describe_index_stats(self) -> Dict[str, Any]:
+        """Return {"dimension", "total_vector_count", "namespaces": {name: {"vector_count"}}}."""
+
+    def version_stamp(self) -> Any:
+        """
+        Return a value that changes whenever the index contents change.
+
+        Result caches compare it to decide whether cached results are still valid.
+        The default is a fingerprint of the index stats.
+        """
+        return _stats_fingerprint(self.describe_index_stats())
+
+
+def _stats_fingerprint(stats: Dict[str, Any]) -> tuple:
+    """Reduce index stats to a hashable fingerprint of per-namespace vector counts."""
+    namespaces = stats.get("namespaces") or {}
+    return (
+        stats.get("total_vector_count"),
+        tuple(sorted((name, summary.get("vector_count")) for name, summary in namespaces.items()))
+    )
+
+
+class PineconeIndexBackend(VectorIndexBackend):
+    """Backend that forwards every call to a Pinecone index."""
+
+    def __init__(self, index, stats_refresh_seconds: Optional[float] = None):
+        """
+        Args:
+            index: A pinecone Index object
+            stats_refresh_seconds: How long a stats fingerprint is trusted before re-reading it
+        """
+        self.index = index
+        self.stats_refresh_seconds = (
+            settings.INDEX_STATS_REFRESH_SECONDS if stats_refresh_seconds is None else stats_refresh_seconds
+        )
+        # Bumped by writes made through this backend, so they invalidate caches immediately
+        self._local_writes = 0
+        self._fingerprint = None
+        self._fingerprint_at = 0.0
+
+    def query(self, vector, top_k, filter=None, namespace="default", include_metadata=True, include_values=False):
+        response = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            include_metadata=include_metadata,
+            include_values=include_values,
+            filter=filter,
+            namespace=namespace
+        )
+        matches = []
+        for match in response.matches:
+            result = {"id": match.id, "score": match.score, "metadata": match.metadata or {}}
+            if include_values:
+                result["values"] = match.values
+            matches.append(result)
+        return matches
+
+    def fetch(self, ids, namespace="default"):
+        if not ids:
+            return {}
+        response = self.index.fetch(ids=list(ids), namespace=namespace)
+        return {
+            vector_id: {"id": vector_id, "values": vector.values, "metadata": vector.metadata or {}}
+            for vector_id, vector in response.vectors.items()
+        }
+
+    def upsert(self, vectors, namespace="default"):
+        self.index.upsert(vectors=vectors, namespace=namespace, show_progress=False)
+        self._local_writes += 1
+
+    def delete(self, ids, namespace="default"):
+        if ids:
+            self.index.delete(ids=list(ids), namespace=namespace)
+            self._local_writes += 1
+
+    def describe_index_stats(self):
+        stats = self.index.describe_index_stats()
+        result = {
+            "dimension": stats.dimension,
+            "total_vector_count": stats.total_vector_count,
+            "namespaces": {
+                name: {"vector_count": summary.vector_count}
+                for name, summary in (stats.namespaces or {}).items()
+            }
+        }
+        # Any stats read also refreshes the version fingerprint
+        self._fingerprint = _stats_fingerprint(result)
+        self._fingerprint_at = time.monotonic()
+        return result
+
+    def version_stamp(self):
+        """Stats fingerprint refreshed at most every stats_refresh_seconds, plus local write count."""
+        if self._fingerprint is None or time.monotonic() - self._fingerprint_at >= self.stats_refresh_seconds:
+            self.describe_index_stats()
+        return (self._fingerprint, self._local_writes)
+
+    def list_ids(self, namespace: str = "default") -> Iterator[List[str]]:
+        """Yield pages of record ids in a namespace (serverless indexes only)."""
+        yield from self.index.list(namespace=namespace)
+
+
+def matches_filter(metadata: Dict[str, Any], filter: Optional[Dict]) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter against one record's metadata.
+
+    Supports $and, $or and the field operators $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte,
+    as well as the {"field": value} shorthand for $eq.
+    """
+    if not filter:
+        return True
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif not _matches_condition(metadata.get(key), condition):
+            return False
+    return True
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    """Evaluate a single field condition."""
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+    for operator, operand in condition.items():
+        if operator == "$eq":
+            ok = value == operand
+        elif operator == "$ne":
+            ok = value != operand
+        elif operator == "$in":
+            ok = value in operand
+        elif operator == "$nin":
+            ok = value not in operand
+        elif operator in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            ok = {
+                "$gt": value > operand,
+                "$gte": value >= operand,
+                "$lt": value < operand,
+                "$lte": value <= operand
+            }[operator]
+        else:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        if not ok:
+            return False
+    return True
+
+
+def _conjuncts(filter: Dict) -> Iterator[tuple]:
+    """Yield the (field, condition) pairs that must all hold, flattening nested $and clauses."""
+    for key, condition in filter.items():
+        if key == "$and":
+            for clause in condition:
+                yield from _conjuncts(clause)
+        else:
+            yield key, condition
+
+
+def _equality_values(condition: Any) -> Optional[set]:
+    """Return the values a pure $eq/$in condition accepts, or None for any other condition."""
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+    if len(condition) != 1:
+        return None
+    operator, operand = next(iter(condition.items()))
+    try:
+        if operator == "$eq":
+            return {operand}
+        if operator == "$in":
+            return set(operand)
+    except TypeError:
+        # Unhashable operands are left to the row-wise filter
+        return None
+    return None
+
+
+class _RowFilter:
+    """
+    Vectorized metadata-filter evaluation over a block of rows.
+
+    Subclasses provide ids (one per row) and column(field), an object array of one
+    metadata field for every row.
+    """
+
+    ids: List[str]
+
+    def column(self, field: str) -> np.ndarray:
+        raise NotImplementedError
+
+    def filter_mask(self, filter: Optional[Dict], rows: slice = slice(None)) -> Optional[np.ndarray]:
+        """Evaluate a metadata filter over all rows, or a slice of them; None means every row matches."""
+        if not filter:
+            return None
+        size = len(range(*rows.indices(len(self.ids))))
+        mask = np.ones(size, dtype=bool)
+        for key, condition in filter.items():
+            if key == "$and":
+                for clause in condition:
+                    clause_mask = self.filter_mask(clause, rows)
+                    if clause_mask is not None:
+                        mask &= clause_mask
+            elif key == "$or":
+                any_mask = np.zeros(size, dtype=bool)
+                for clause in condition:
+                    clause_mask = self.filter_mask(clause, rows)
+                    any_mask |= True if clause_mask is None else clause_mask
+                mask &= any_mask
+            else:
+                mask &= self._field_mask(key, condition, rows)
+        return mask
+
+    def _field_mask(self, field: str, condition: Any, rows: slice = slice(None)) -> np.ndarray:
+        """Vectorized evaluation of the common equality operators, with a per-row fallback."""
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        column = self.column(field)[rows]
+        mask = np.ones(len(column), dtype=bool)
+        for operator, operand in condition.items():
+            if operator == "$eq":
+                mask &= column == operand
+            elif operator == "$ne":
+                mask &= column != operand
+            elif operator in ("$in", "$nin"):
+                hits = np.zeros(len(column), dtype=bool)
+                for value in operand:
+                    hits |= column == value
+                mask &= hits if operator == "$in" else ~hits
+            else:
+                mask &= np.fromiter(
+                    (_matches_condition(value, {operator: operand}) for value in column),
+                    dtype=bool,
+                    count=len(column)
+                )
+        return mask
+
+
+class _Namespace(_RowFilter):
+    """
+    Records of one namespace, held as a normalized float32 matrix plus parallel lists.
+
+    Rows are kept grouped by partition_field (and by subpartition_field within each
+    partition), so that $eq/$in filters on those fields select contiguous slices of the
+    matrix instead of scoring and masking every row. The grouping is rebuilt lazily by
+    partitioned() after writes.
+
+    A namespace object is never modified once published: upsert, delete and partitioned
+    return a new object and the index swaps it in, so a query that read the object once
+    always sees vectors, ids, metadata and partitions that belong together.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        partition_field: Optional[str] = None,
+        subpartition_field: Optional[str] = None,
+        vectors: Optional[np.ndarray] = None,
+        ids: Optional[List[str]] = None,
+        metadata: Optional[List[Dict[str, Any]]] = None,
+        partitions: Optional[Dict[Any, tuple]] = None,
+        stale: bool = True
+    ):
+        self.ids: List[str] = ids if ids is not None else []
+        self.metadata: List[Dict[str, Any]] = metadata if metadata is not None else []
+        self.vectors = vectors if vectors is not None else np.zeros((0, dimension or 0), dtype=np.float32)
+        self.rows: Dict[str, int] = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        self._columns: Dict[str, np.ndarray] = {}
+        self.dimension = dimension
+        self.partition_field = partition_field
+        self.subpartition_field = subpartition_field
+        # partition value -> (start, stop, {sub-partition value -> (start, stop)}); None when unpartitioned
+        self.partitions = partitions
+        self.stale = stale
+
+    def _derive(self, vectors: np.ndarray, ids: List[str], metadata: List[Dict[str, Any]],
+                partitions: Optional[Dict[Any, tuple]] = None, stale: bool = True) -> "_Namespace":
+        """A new namespace with the same layout settings and the given rows."""
+        return _Namespace(
+            self.dimension, self.partition_field, self.subpartition_field,
+            vectors=vectors, ids=ids, metadata=metadata, partitions=partitions, stale=stale
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, field: str) -> np.ndarray:
+        """Return one metadata field for every row as an object array (cached per namespace object)."""
+        column = self._columns.get(field)
+        if column is None:
+            column = np.empty(len(self.metadata), dtype=object)
+            column[:] = [meta.get(field) for meta in self.metadata]
+            self._columns[field] = column
+        return column
+
+    def upsert(self, records: List[Dict[str, Any]]) -> "_Namespace":
+        """Return a copy with existing rows replaced and new rows appended in a single concatenation."""
+        vectors, metadata = self.vectors, list(self.metadata)
+        new_ids, new_vectors, new_metadata, new_rows = [], [], [], {}
+        copied = False
+        for record in records:
+            vector = _normalize(np.asarray(record["values"], dtype=np.float32))
+            record_metadata = dict(record.get("metadata") or {})
+            row = self.rows.get(record["id"])
+            if row is not None:
+                if not copied:
+                    # Copy on write: readers may still be scoring the published matrix
+                    vectors, copied = vectors.copy(), True
+                vectors[row] = vector
+                metadata[row] = record_metadata
+            elif record["id"] in new_rows:
+                # Repeated id within the same batch: the last record wins
+                new_vectors[new_rows[record["id"]]] = vector
+                new_metadata[new_rows[record["id"]]] = record_metadata
+            else:
+                new_rows[record["id"]] = len(new_ids)
+                new_ids.append(record["id"])
+                new_vectors.append(vector)
+                new_metadata.append(record_metadata)
+        if new_ids:
+            stacked = np.vstack(new_vectors)
+            vectors = stacked if len(self.ids) == 0 else np.vstack([vectors, stacked])
+        return self._derive(vectors, self.ids + new_ids, metadata + new_metadata)
+
+    def delete(self, ids: List[str]) -> "_Namespace":
+        """Return a copy without the given rows, with the matrix compacted."""
+        doomed = {self.rows[i] for i in ids if i in self.rows}
+        if not doomed:
+            return self
+        keep = [row for row in range(len(self.ids)) if row not in doomed]
+        return self._derive(
+            self.vectors[keep],
+            [self.ids[row] for row in keep],
+            [self.metadata[row] for row in keep]
+        )
+
+    def partitioned(self) -> "_Namespace":
+        """
+        Return a copy whose rows are regrouped so every partition value, and every
+        sub-partition value within it, occupies a contiguous slice. Row order inside a
+        group is preserved.
+        """
+        if not self.stale:
+            return self
+        if not self.partition_field:
+            return self._derive(self.vectors, self.ids, self.metadata, stale=False)
+        groups: Dict[Any, Dict[Any, List[int]]] = {}
+        try:
+            for row, meta in enumerate(self.metadata):
+                sub_value = meta.get(self.subpartition_field) if self.subpartition_field else None
+                groups.setdefault(meta.get(self.partition_field), {}).setdefault(sub_value, []).append(row)
+        except TypeError:
+            # Unhashable metadata values: keep the flat layout
+            return self._derive(self.vectors, self.ids, self.metadata, stale=False)
+
+        order: List[int] = []
+        partitions = {}
+        for value, sub_groups in groups.items():
+            start, sub_partitions = len(order), {}
+            for sub_value, rows in sub_groups.items():
+                sub_partitions[sub_value] = (len(order), len(order) + len(rows))
+                order.extend(rows)
+            partitions[value] = (start, len(order), sub_partitions)
+
+        permutation = np.asarray(order, dtype=np.int64)
+        if not np.any(permutation != np.arange(len(order))):
+            return self._derive(self.vectors, self.ids, self.metadata, partitions, stale=False)
+        return self._derive(
+            self.vectors[permutation],
+            [self.ids[row] for row in order],
+            [self.metadata[row] for row in order],
+            partitions,
+            stale=False
+        )
+
+    def plan(self, filter: Optional[Dict]) -> tuple:
+        """
+        Map a filter onto partition slices.
+
+        Returns:
+            (sorted, non-overlapping (start, stop) row ranges, or None when the filter does
+            not restrict the partition fields; the part of the filter the slices do not
+            already guarantee, or None)
+        """
+        if not filter or self.partitions is None:
+            return None, filter
+        fields = [field for field in (self.partition_field, self.subpartition_field) if field]
+        allowed: Dict[str, Optional[set]] = dict.fromkeys(fields)
+        residual = []
+        for key, condition in _conjuncts(filter):
+            values = _equality_values(condition) if key in allowed else None
+            if values is None:
+                residual.append({key: condition})
+            else:
+                allowed[key] = values if allowed[key] is None else allowed[key] & values
+        values = allowed[self.partition_field]
+        sub_values = allowed.get(self.subpartition_field) if self.subpartition_field else None
+        if values is None and sub_values is None:
+            return None, filter
+
+        ranges = []
+        for value in (self.partitions if values is None else values):
+            if value not in self.partitions:
+                continue
+            start, stop, sub_partitions = self.partitions[value]
+            if sub_values is None:
+                ranges.append((start, stop))
+            else:
+                ranges.extend(sub_partitions[sub_value] for sub_value in sub_values if sub_value in sub_partitions)
+
+        merged = []
+        for start, stop in sorted(ranges):
+            if merged and merged[-1][1] == start:
+                merged[-1] = (merged[-1][0], stop)
+            else:
+                merged.append((start, stop))
+        return merged, ({"$and": residual} if residual else None)
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """Scale to unit length so that dot products are cosine similarities."""
+    norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+    return vector / np.where(norm == 0, 1, norm)
+
+
+class LocalVectorIndex(VectorIndexBackend):
+    """
+    In-process cosine-similarity index backed by NumPy.
+
+    Supports the same namespace and metadata filter semantics as the Pinecone backend,
+    so it can replace it for corpora that fit in memory. Each namespace is partitioned
+    by document type (and section heading), so the retrievers' filters only score the
+    matching slices of the matrix.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        partition_field: Optional[str] = None,
+        subpartition_field: Optional[str] = None
+    ):
+        """
+        Args:
+            dimension: Vector dimension (inferred from the first upsert when omitted)
+            partition_field: Metadata field rows are grouped by
+                (defaults to settings.LOCAL_INDEX_PARTITION_FIELD; "" disables partitioning)
+            subpartition_field: Metadata field rows are grouped by within a partition
+                (defaults to settings.LOCAL_INDEX_SUBPARTITION_FIELD; "" disables it)
+        """
+        self.dimension = dimension
+        self.partition_field = (
+            settings.LOCAL_INDEX_PARTITION_FIELD if partition_field is None else partition_field
+        )
+        self.subpartition_field = (
+            settings.LOCAL_INDEX_SUBPARTITION_FIELD if subpartition_field is None else subpartition_field
+        )
+        self.namespaces: Dict[str, _Namespace] = {}
+        self.version = 0
+        self._lock = threading.RLock()
+
+    def _new_namespace(self) -> _Namespace:
+        return _Namespace(self.dimension, self.partition_field, self.subpartition_field)
+
+    def _ready(self, namespace: str) -> Optional[_Namespace]:
+        """
+        Return the current namespace object with its partition layout up to date.
+
+        Callers must use the returned object for the whole operation: it is never
+        modified, while self.namespaces may be swapped by concurrent writers.
+        """
+        store = self.namespaces.get(namespace)
+        if store is not None and store.stale:
+            with self._lock:
+                store = self.namespaces.get(namespace)
+                if store is not None and store.stale:
+                    store = self.namespaces[namespace] = store.partitioned()
+        return store
+
+    def query(self, vector, top_k, filter=None, namespace="default", include_metadata=True, include_values=False):
+        store = self._ready(namespace)
+        if store is None or len(store) == 0 or top_k <= 0:
+            return []
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        ranges, filter = store.plan(filter)
+        if ranges is not None:
+            candidates, scores = self._score_ranges(store, query, ranges, filter)
+            if len(candidates) == 0:
+                return []
+            return self._top_matches(store, candidates, scores, top_k, include_metadata, include_values)
+        mask = store.filter_mask(filter)
+
+        if mask is None:
+            scores = store.vectors @ query
+            candidates = np.arange(len(scores))
+        else:
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0:
+                return []
+            if len(candidates) * 2 > len(store):
+                # Scoring every row beats copying out most of the matrix
+                scores = (store.vectors @ query)[candidates]
+            else:
+                scores = store.vectors[candidates] @ query
+        return self._top_matches(store, candidates, scores, top_k, include_metadata, include_values)
+
+    @staticmethod
+    def _score_ranges(store: _Namespace, query: np.ndarray, ranges: List[tuple], residual: Optional[Dict]) -> tuple:
+        """Score only the selected partition slices, applying any remaining filter within them."""
+        candidate_blocks, score_blocks = [], []
+        for start, stop in ranges:
+            rows = np.arange(start, stop)
+            scores = store.vectors[start:stop] @ query
+            mask = store.filter_mask(residual, slice(start, stop))
+            if mask is not None:
+                rows, scores = rows[mask], scores[mask]
+            candidate_blocks.append(rows)
+            score_blocks.append(scores)
+        if not candidate_blocks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(candidate_blocks), np.concatenate(score_blocks)
+
+    @staticmethod
+    def _top_matches(store, candidates, scores, top_k, include_metadata, include_values):
+        """Build match dicts for the top_k best-scoring candidate rows."""
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        matches = []
+        for position in best:
+            row = candidates[position]
+            match = {
+                "id": store.ids[row],
+                "score": float(scores[position]),
+                "metadata": store.metadata[row] if include_metadata else {}
+            }
+            if include_values:
+                match["values"] = store.vectors[row].tolist()
+            matches.append(match)
+        return matches
+
+    def fetch(self, ids, namespace="default"):
+        store = self._ready(namespace)
+        if store is None:
+            return {}
+        return {
+            vector_id: {
+                "id": vector_id,
+                "values": store.vectors[store.rows[vector_id]].tolist(),
+                "metadata": store.metadata[store.rows[vector_id]]
+            }
+            for vector_id in ids if vector_id in store.rows
+        }
+
+    def upsert(self, vectors, namespace="default"):
+        if not vectors:
+            return
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = len(vectors[0]["values"])
+            store = self.namespaces.get(namespace)
+            if store is None:
+                store = self._new_namespace()
+            self.namespaces[namespace] = store.upsert(vectors)
+            self.version += 1
+
+    def delete(self, ids, namespace="default"):
+        with self._lock:
+            store = self.namespaces.get(namespace)
+            if store is not None:
+                self.namespaces[namespace] = store.delete(list(ids))
+                self.version += 1
+
+    def version_stamp(self):
+        return self.version
+
+    def describe_index_stats(self):
+        namespaces = list(self.namespaces.items())
+        return {
+            "dimension": self.dimension,
+            "total_vector_count": sum(len(store) for _, store in namespaces),
+            "namespaces": {name: {"vector_count": len(store)} for name, store in namespaces}
+        }
+
+    def iter_records(self, namespace: str = "default") -> Iterator[Dict[str, Any]]:
+        """Yield every record of a namespace as {"id", "metadata"}."""
+        store = self.namespaces.get(namespace)
+        if store is None:
+            return
+        for vector_id, metadata in zip(store.ids, store.metadata):
+            yield {"id": vector_id, "metadata": metadata}
+
+    def save(self, directory: str) -> None:
+        """
+        Write the index to a directory: one .npy matrix and one JSON sidecar per namespace.
+
+        Args:
+            directory: Target directory (created if needed)
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"dimension": self.dimension, "namespaces": {}}
+        # Namespaces are replaced rather than mutated, so a snapshot can be written without the lock
+        with self._lock:
+            namespaces = list(self.namespaces.items())
+        for position, (name, store) in enumerate(namespaces):
+            stem = f"namespace_{position}"
+            np.save(os.path.join(directory, f"{stem}.npy"), store.vectors)
+            with open(os.path.join(directory, f"{stem}.json"), "w", encoding="utf-8") as f:
+                json.dump({"ids": store.ids, "metadata": store.metadata}, f, ensure_ascii=False)
+            manifest["namespaces"][name] = stem
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: str) -> "LocalVectorIndex":
+        """
+        Load an index written by save.
+
+        Args:
+            directory: Directory containing manifest.json
+        """
+        with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        index = cls(dimension=manifest.get("dimension"))
+        for name, stem in manifest["namespaces"].items():
+            with open(os.path.join(directory, f"{stem}.json"), "r", encoding="utf-8") as f:
+                sidecar = json.load(f)
+            index.namespaces[name] = index._new_namespace()._derive(
+                np.load(os.path.join(directory, f"{stem}.npy")), sidecar["ids"], sidecar["metadata"]
+            )
+        return index
+
+    def import_from(self, source: PineconeIndexBackend, namespaces: List[str], batch_size: int = 100) -> int:
+        """
+        Copy namespaces from a Pinecone index into this local index.
+
+        Args:
+            source: Pinecone backend to read from
+            namespaces: Namespaces to copy
+            batch_size: Number of ids fetched per request
+
+        Returns:
+            Number of records copied
+        """
+        copied = 0
+        for namespace in namespaces:
+            for page in source.list_ids(namespace=namespace):
+                for i in range(0, len(page), batch_size):
+                    records = source.fetch(page[i:i + batch_size], namespace=namespace)
+                    self.upsert(list(records.values()), namespace=namespace)
+                    copied += len(records)
+        return copied
+
+
+_pinecone_client = None
+_pinecone_lock = threading.Lock()
+
+
+def get_pinecone_client():
+    """Return the process-wide Pinecone client, creating it on first use."""
+    global _pinecone_client
+    if _pinecone_client is None:
+        with _pinecone_lock:
+            if _pinecone_client is None:
+                from pinecone import Pinecone
+                _pinecone_client = Pinecone(
+                    api_key=settings.PINECONE_API_KEY,
+                    environment=settings.PINECONE_ENVIRONMENT
+                )
+    return _pinecone_client
+
+
+def mapped_index_dir(index_name: str) -> str:
+    """Directory of an index's mapped store."""
+    return os.path.join(settings.LOCAL_INDEX_DIR, index_name, "mapped")
+
+
+def create_index_backend(index_name: str) -> VectorIndexBackend:
+    """
+    Build the backend configured by settings.VECTOR_INDEX_BACKEND for an index.
+
+    Args:
+        index_name: Name of the index (the Pinecone index name, or the
+            sub-directory of settings.LOCAL_INDEX_DIR for the local and mapped backends)
+    """
+    if settings.VECTOR_INDEX_BACKEND == "local":
+        return LocalVectorIndex.load(os.path.join(settings.LOCAL_INDEX_DIR, index_name))
+    if settings.VECTOR_INDEX_BACKEND == "mapped":
+        from .mapped_index import MappedVectorIndex
+        return MappedVectorIndex(mapped_index_dir(index_name))
+    if settings.VECTOR_INDEX_BACKEND == "pinecone":
+        return PineconeIndexBackend(get_pinecone_client().Index(index_name))
+    raise ValueError(f"Unknown vector index backend: {settings.VECTOR_INDEX_BACKEND}")
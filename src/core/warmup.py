@@ -0,0 +1,132 @@
+"""
+Retriever Warm-up
+Purpose: Precomputes embeddings and top-k results for frequently asked queries in the background,
+so the first requests after a deploy are served from the embedding and retrieval caches.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import settings
+
+# retrieve_many options a popular-query entry may set; they must match the live calls to share cache keys
+QUERY_OPTIONS = ("top_n", "document_types", "section_heading", "namespace", "adaptive")
+
+
+def load_popular_queries(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load the popular-query list.
+
+    The file holds a JSON list of entries such as
+    {"query": "Liquidity risk management", "indexes": ["fas", "ss"], "top_n": 5}.
+    "indexes" defaults to both; any of QUERY_OPTIONS may be given per entry.
+
+    Args:
+        path: JSON file (defaults to settings.WARMUP_QUERIES_PATH)
+
+    Returns:
+        List of entries, or an empty list when the file is missing
+    """
+    path = path or settings.WARMUP_QUERIES_PATH
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [entry if isinstance(entry, dict) else {"query": entry} for entry in entries]
+
+
+class RetrieverWarmup:
+    """
+    Runs the popular queries through the retrievers on a background thread.
+
+    Entries sharing an index and options go through one retrieve_many call, so each
+    group costs one embeddings request; results land in the retriever's result cache
+    and the vectors in the shared embedding cache.
+    """
+
+    def __init__(
+        self,
+        retrievers: Dict[str, Any],
+        entries: Optional[List[Dict[str, Any]]] = None,
+        options: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        """
+        Args:
+            retrievers: Retrievers by index key, e.g. {"fas": FASRetriever, "ss": SSRetriever}
+            entries: Popular-query entries (loaded with load_popular_queries when omitted)
+            options: retrieve_many options by index key, matching the live callers of that
+                retriever, e.g. {"ss": {"top_n": 5, "adaptive": True}}; entries may override them
+        """
+        self.retrievers = retrievers
+        self.entries = load_popular_queries() if entries is None else entries
+        self.options = options or {}
+        self.state = "pending"
+        self.total = sum(
+            1 for entry in self.entries for key in entry.get("indexes", list(retrievers)) if key in retrievers
+        )
+        self.warmed = 0
+        self.failed = 0
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start warming up in a daemon thread and return immediately."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="retriever-warmup", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for a started warm-up to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _groups(self) -> Dict[tuple, List[str]]:
+        """Group the queries by index key and retrieve_many options."""
+        groups: Dict[tuple, List[str]] = {}
+        for entry in self.entries:
+            entry_options = {option: value for option, value in entry.items() if option in QUERY_OPTIONS}
+            for key in entry.get("indexes", list(self.retrievers)):
+                if key not in self.retrievers:
+                    continue
+                options = tuple(sorted(
+                    (option, tuple(value) if isinstance(value, list) else value)
+                    for option, value in {**self.options.get(key, {}), **entry_options}.items()
+                ))
+                groups.setdefault((key, options), []).append(entry["query"])
+        return groups
+
+    def run(self) -> None:
+        """Warm every group; failures are counted and printed, never raised."""
+        self.state = "running"
+        start = time.perf_counter()
+        try:
+            for (key, options), queries in self._groups().items():
+                kwargs = {option: list(value) if isinstance(value, tuple) else value for option, value in options}
+                results = self.retrievers[key].retrieve_many(queries, **kwargs)
+                # retrieve_many reports failures as empty result lists
+                warmed = sum(1 for result in results if result)
+                self.warmed += warmed
+                self.failed += len(queries) - warmed
+            self.state = "done"
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            print(f"Error warming up retrievers: {e}")
+        self.seconds = time.perf_counter() - start
+
+    def status(self) -> Dict[str, Any]:
+        """Progress summary suitable for health checks."""
+        return {
+            "state": self.state,
+            "queries": self.total,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "coverage": round(self.warmed / self.total, 3) if self.total else None,
+            "seconds": round(self.seconds, 2) if self.seconds is not None else None,
+            "error": self.error
+        }
@@ -5,7 +5,7 @@ Purpose: Analyzes cross-border contracts for conflicts between different regulat
 
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ...core.llm_gateway import get_llm_gateway
 from ...core.config import settings
 import json
 
@@ -36,7 +36,7 @@ class ConflictDetectionAgent:
     
     def __init__(self):
         """Initialize the Conflict Detection agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are a Conflict Detection Agent specialized in analyzing cross-border contracts for conflicts between different regulatory frameworks and accounting standards.
 
@@ -79,8 +79,8 @@ IMPORTANT: Your response must be valid JSON that can be parsed by Python's json.
             # Format the user message
             user_message = self._format_user_message(input_data)
             
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
@@ -5,7 +5,7 @@ Purpose: Revises contract sections to resolve regulatory and legal conflicts, en
 
 from typing import Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ...core.llm_gateway import get_llm_gateway
 from ...core.config import settings
 
 class RevisionInput(BaseModel):
@@ -21,7 +21,7 @@ class RevisionResult(BaseModel):
 class ContractRevisor:
     """Agent for revising contract sections to resolve regulatory and legal conflicts."""
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = (
             """
 You are a Contract Revision Agent specializing in cross-border financial and regulatory contracts.
@@ -54,7 +54,7 @@ Format your response as JSON:
             RevisionResult object
         """
         user_message = self._format_user_message(input_data)
-        response = self.client.chat.completions.create(
+        response = self.client.chat_completion(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": self.system_prompt},
@@ -0,0 +1,23 @@
+"""
+Standards ingestion: chunking FAS/SS documents and loading them into the vector indexes.
+"""
+
+from .documents import chunk_document, iter_source_files, load_sections, split_text
+from .manifests import ManifestStore, ReindexPlan, build_manifest, content_hash, plan_reindex
+from .pipeline import IngestionCheckpoint, IngestionPipeline, IngestionReport, document_key
+
+__all__ = [
+    "chunk_document",
+    "iter_source_files",
+    "load_sections",
+    "split_text",
+    "ManifestStore",
+    "ReindexPlan",
+    "build_manifest",
+    "content_hash",
+    "plan_reindex",
+    "IngestionCheckpoint",
+    "IngestionPipeline",
+    "IngestionReport",
+    "document_key",
+]
@@ -0,0 +1,99 @@
+"""
+Standards Ingestion CLI
+Purpose: Builds the FAS/SS vector indexes from PDF or markdown standards documents.
+
+Usage:
+    python -m src.ingestion fas path/to/fas_documents --namespace default
+    python -m src.ingestion ss path/to/SS_8_Murabahah.pdf --document-type SS_8_Murabahah
+"""
+
+import argparse
+import os
+import sys
+
+from ..core.config import settings
+from ..core.mapped_index import write_mapped_index
+from ..core.vector_index import LocalVectorIndex, create_index_backend, mapped_index_dir
+from .manifests import ManifestStore
+from .pipeline import IngestionCheckpoint, IngestionPipeline
+
+INDEX_NAMES = {
+    "fas": settings.PINECONE_INDEX_FAS,
+    "ss": settings.PINECONE_INDEX_SS,
+}
+INDEX_DIMENSIONS = {
+    "fas": settings.EMBEDDING_DIMENSIONS_FAS,
+    "ss": settings.EMBEDDING_DIMENSIONS_SS,
+}
+
+
+def open_backend(index_name: str):
+    """
+    Open the index to write into, starting an empty local index if none was saved yet.
+
+    The read-only mapped backend is built from the local index, so both ingest into it.
+    """
+    if settings.VECTOR_INDEX_BACKEND in ("local", "mapped"):
+        directory = os.path.join(settings.LOCAL_INDEX_DIR, index_name)
+        if not os.path.exists(os.path.join(directory, "manifest.json")):
+            return LocalVectorIndex()
+        return LocalVectorIndex.load(directory)
+    return create_index_backend(index_name)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.ingestion",
+        description="Ingest FAS/SS standards documents into a vector index.")
+    parser.add_argument("target", choices=sorted(INDEX_NAMES), help="Index to build")
+    parser.add_argument("paths", nargs="+", help="PDF/markdown files or directories")
+    parser.add_argument("--namespace", default="default", help="Namespace to upsert into")
+    parser.add_argument("--document-type", default=None, help="Document type for every chunk (defaults to the file stem)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (defaults to one per index and namespace)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    index_name = INDEX_NAMES[args.target]
+    checkpoint_path = args.checkpoint or os.path.join(
+        settings.INGEST_CHECKPOINT_DIR, f"{index_name}.{args.namespace}.json"
+    )
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    backend = open_backend(index_name)
+    persist = None
+    if isinstance(backend, LocalVectorIndex):
+        directory = os.path.join(settings.LOCAL_INDEX_DIR, index_name)
+        persist = lambda: backend.save(directory)
+
+    pipeline = IngestionPipeline(
+        backend,
+        namespace=args.namespace,
+        checkpoint=IngestionCheckpoint(checkpoint_path),
+        persist=persist,
+        manifests=ManifestStore(
+            os.path.join(settings.INGEST_CHECKPOINT_DIR, "manifests", index_name, args.namespace)
+        ),
+        dimensions=INDEX_DIMENSIONS[args.target]
+    )
+    report = pipeline.run(args.paths, document_type=args.document_type)
+    if settings.VECTOR_INDEX_BACKEND == "mapped":
+        write_mapped_index(backend, mapped_index_dir(index_name))
+
+    print(
+        f"Ingested {report.documents} documents ({report.chunks} chunks) into {index_name}/{args.namespace} "
+        f"in {report.seconds:.1f}s: {report.embedding_batches} embedding batches, "
+        f"{report.upsert_batches} upserts, {report.skipped_documents} already ingested"
+    )
+    print(
+        f"Chunks: {report.chunks_embedded} embedded, {report.chunks_reused} reused, "
+        f"{report.chunks_unchanged} unchanged, {report.chunks_deleted} deleted; "
+        f"{report.embeddings_saved} embeddings saved"
+    )
+    for path in report.failed_documents:
+        print(f"Failed: {path}")
+    return 1 if report.failed_documents else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Standards Documents
+Purpose: Streams FAS/SS source files (PDF or markdown) and splits them into chunk records with retrieval metadata.
+"""
+
+import os
+import re
+import statistics
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.config import settings
+from .manifests import content_hash
+
+SUPPORTED_EXTENSIONS = (".pdf", ".md", ".markdown")
+
+_MARKDOWN_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.;:!?])\s+")
+# Headings are short; longer lines in a larger font are usually pull quotes or titles pages
+_MAX_HEADING_CHARS = 120
+
+
+def iter_source_files(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Yield supported files from a mix of file and directory paths, directories walked in sorted order.
+
+    Args:
+        paths: Files or directories
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif path.lower().endswith(SUPPORTED_EXTENSIONS):
+            yield path
+
+
+def load_sections(path: str) -> List[Tuple[str, str]]:
+    """
+    Read a source file as (section_heading, text) pairs in document order.
+
+    Text before the first heading is returned under an empty heading.
+
+    Args:
+        path: PDF or markdown file
+    """
+    if path.lower().endswith(".pdf"):
+        return _pdf_sections(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return _markdown_sections(f)
+
+
+def _markdown_sections(lines: Iterable[str]) -> List[Tuple[str, str]]:
+    """Split markdown on ATX headings."""
+    sections, heading, buffer = [], "", []
+    for line in lines:
+        match = _MARKDOWN_HEADING.match(line)
+        if match:
+            _append_section(sections, heading, buffer)
+            heading, buffer = match.group(1).strip(), []
+        else:
+            buffer.append(line.rstrip("\n"))
+    _append_section(sections, heading, buffer)
+    return sections
+
+
+def _pdf_sections(path: str) -> List[Tuple[str, str]]:
+    """
+    Split a PDF on heading lines.
+
+    A line counts as a heading when it is short and either set noticeably larger
+    than the document's body font or entirely bold.
+    """
+    import fitz  # PyMuPDF; only needed when ingesting PDFs
+
+    lines = []
+    with fitz.open(path) as document:
+        for page in document:
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", []):
+                    spans = [span for span in line["spans"] if span["text"].strip()]
+                    if not spans:
+                        continue
+                    text = " ".join(span["text"].strip() for span in spans)
+                    size = max(span["size"] for span in spans)
+                    bold = all(span["flags"] & 16 for span in spans)
+                    lines.append((text, size, bold))
+            # Blank line between pages keeps paragraphs apart
+            lines.append(("", 0.0, False))
+
+    sizes = [size for text, size, _ in lines if text]
+    body_size = statistics.median(sizes) if sizes else 0.0
+    sections, heading, buffer = [], "", []
+    for text, size, bold in lines:
+        if text and len(text) <= _MAX_HEADING_CHARS and (size >= body_size * 1.15 or bold):
+            _append_section(sections, heading, buffer)
+            heading, buffer = text, []
+        else:
+            buffer.append(text)
+    _append_section(sections, heading, buffer)
+    return sections
+
+
+def _append_section(sections: List[Tuple[str, str]], heading: str, buffer: List[str]) -> None:
+    """Append a section unless it has no text."""
+    text = "\n".join(buffer).strip()
+    if text:
+        sections.append((heading, text))
+
+
+def split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """
+    Split text into chunks of at most about chunk_size characters.
+
+    Paragraphs are packed whole where possible, long paragraphs are split on sentence
+    boundaries and only over-long sentences are cut mid-text. Each chunk after the
+    first starts with the last overlap characters of the previous one.
+
+    Args:
+        text: Section text
+        chunk_size: Target maximum chunk length in characters
+        overlap: Characters of the previous chunk repeated at the start of the next
+    """
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= chunk_size:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            while len(sentence) > chunk_size:
+                pieces.append(sentence[:chunk_size])
+                sentence = sentence[chunk_size:]
+            if sentence:
+                pieces.append(sentence)
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > chunk_size:
+            chunks.append(current)
+            tail = current[-overlap:] if overlap > 0 else ""
+            # Start the overlap on a word boundary
+            current = tail[tail.find(" ") + 1:] if " " in tail else tail
+        current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_document(
+    path: str,
+    document_type: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    overlap: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Load a source file and return its chunk records.
+
+    Chunks never span sections. Ids are "<file stem>#<chunk_index>", so neighbouring
+    chunks can be addressed by id.
+
+    Args:
+        path: PDF or markdown file
+        document_type: Document type stored on every chunk (defaults to the file stem)
+        chunk_size: Target chunk length (defaults to settings.INGEST_CHUNK_SIZE)
+        overlap: Chunk overlap (defaults to settings.INGEST_CHUNK_OVERLAP)
+
+    Returns:
+        Records as {"id", "metadata"} with text, document_type, section_heading,
+        source_filename, chunk_index, total_chunks and content_hash
+    """
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    overlap = settings.INGEST_CHUNK_OVERLAP if overlap is None else overlap
+    filename = os.path.basename(path)
+    stem = os.path.splitext(filename)[0]
+    document_type = document_type or stem
+
+    chunks = [
+        (heading, text)
+        for heading, section_text in load_sections(path)
+        for text in split_text(section_text, chunk_size, overlap)
+    ]
+    return [
+        {
+            "id": f"{stem}#{chunk_index}",
+            "metadata": {
+                "text": text,
+                "document_type": document_type,
+                "section_heading": heading,
+                "source_filename": filename,
+                "chunk_index": chunk_index,
+                "total_chunks": len(chunks),
+                "content_hash": content_hash(text)
+            }
+        }
+        for chunk_index, (heading, text) in enumerate(chunks)
+    ]
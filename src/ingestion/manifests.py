@@ -0,0 +1,161 @@
+"""
+Ingestion Manifests
+Purpose: Per-document manifests of chunk content hashes, diffed on re-index so only changed chunks are re-embedded.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+from ..core.embedding_cache import normalize_text
+from ..core.vector_index import VectorIndexBackend
+
+# Ids fetched per request when rebuilding a manifest from the index
+_FETCH_BATCH_SIZE = 100
+
+
+def content_hash(text: str) -> str:
+    """Hash of a chunk's normalized text; stored in the chunk metadata as "content_hash"."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def metadata_hash(metadata: Dict[str, Any]) -> str:
+    """Hash of a chunk's full metadata, to tell chunks whose position or heading moved."""
+    # Pinecone returns numeric metadata as floats
+    canonical = {
+        key: int(value) if isinstance(value, float) and value.is_integer() else value
+        for key, value in metadata.items()
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def build_manifest(source_filename: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the manifest of a document's chunk records.
+
+    Args:
+        source_filename: Name of the source file
+        records: Chunk records as returned by chunk_document
+    """
+    return {
+        "source_filename": source_filename,
+        "chunks": [
+            {
+                "id": record["id"],
+                "content_hash": record["metadata"]["content_hash"],
+                "metadata_hash": metadata_hash(record["metadata"])
+            }
+            for record in records
+        ]
+    }
+
+
+class ReindexPlan(BaseModel):
+    """What a re-index run has to do for one document."""
+    embed: List[Dict[str, Any]] = []
+    reuse: List[Dict[str, Any]] = []
+    reuse_from: Dict[str, str] = {}
+    unchanged: int = 0
+    stale_ids: List[str] = []
+
+
+def plan_reindex(records: List[Dict[str, Any]], previous: Optional[Dict[str, Any]]) -> ReindexPlan:
+    """
+    Diff a document's new chunk records against its previous manifest.
+
+    A chunk with the same id and metadata is left alone; a chunk whose text already
+    exists under some previous id (shifted, re-headed or renumbered) reuses that id's
+    vector; anything else is embedded. Previous ids not produced any more are stale.
+
+    Args:
+        records: New chunk records of the document
+        previous: Previous manifest, or None for a new document
+    """
+    if not previous:
+        return ReindexPlan(embed=records)
+
+    old_chunks = previous.get("chunks", [])
+    old_by_id = {chunk["id"]: chunk for chunk in old_chunks}
+    old_id_by_hash = {}
+    for chunk in old_chunks:
+        old_id_by_hash.setdefault(chunk["content_hash"], chunk["id"])
+
+    plan = ReindexPlan()
+    for record in records:
+        old = old_by_id.get(record["id"])
+        if old is not None and old["metadata_hash"] == metadata_hash(record["metadata"]):
+            plan.unchanged += 1
+        elif record["metadata"]["content_hash"] in old_id_by_hash:
+            plan.reuse.append(record)
+            plan.reuse_from[record["id"]] = old_id_by_hash[record["metadata"]["content_hash"]]
+        else:
+            plan.embed.append(record)
+
+    new_ids = {record["id"] for record in records}
+    plan.stale_ids = [chunk["id"] for chunk in old_chunks if chunk["id"] not in new_ids]
+    return plan
+
+
+class ManifestStore:
+    """Document manifests of one index namespace, one JSON file per source document."""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Directory holding the manifests (created on first save)
+        """
+        self.directory = directory
+
+    def _path(self, stem: str) -> str:
+        return os.path.join(self.directory, f"{stem}.json")
+
+    def load(self, stem: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest of a document, or None if it was never ingested."""
+        path = self._path(stem)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, stem: str, manifest: Dict[str, Any]) -> None:
+        """Write a document's manifest atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{self._path(stem)}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(temporary, self._path(stem))
+
+    @staticmethod
+    def from_index(backend: VectorIndexBackend, stem: str, namespace: str = "default") -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a document's manifest from the chunk metadata stored in the index.
+
+        Used when no manifest file exists (e.g. an index built on another machine);
+        chunk ids are "<stem>#<chunk_index>" and the first chunk gives total_chunks.
+        """
+        first = backend.fetch([f"{stem}#0"], namespace=namespace).get(f"{stem}#0")
+        if first is None:
+            return None
+        total = int(first["metadata"].get("total_chunks", 1))
+        ids = [f"{stem}#{chunk_index}" for chunk_index in range(total)]
+        records = {}
+        for start in range(0, len(ids), _FETCH_BATCH_SIZE):
+            records.update(backend.fetch(ids[start:start + _FETCH_BATCH_SIZE], namespace=namespace))
+        # Chunks indexed before content hashes existed get empty hashes: re-embedded, but
+        # still deleted when stale
+        return {
+            "source_filename": first["metadata"].get("source_filename", ""),
+            "chunks": [
+                {
+                    "id": chunk_id,
+                    "content_hash": records[chunk_id]["metadata"].get("content_hash", ""),
+                    "metadata_hash": (
+                        metadata_hash(records[chunk_id]["metadata"])
+                        if "content_hash" in records[chunk_id]["metadata"] else ""
+                    )
+                }
+                for chunk_id in ids if chunk_id in records
+            ]
+        }
@@ -0,0 +1,427 @@
+"""
+Ingestion Pipeline
+Purpose: Embeds and upserts standards chunks through a bounded producer/consumer pipeline with resumable checkpoints.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+from tenacity import Retrying, stop_after_attempt, wait_exponential
+from ..core.config import settings
+from ..core.embeddings import get_embedding_service
+from ..core.vector_index import VectorIndexBackend
+from .documents import chunk_document, iter_source_files
+from .manifests import ManifestStore, ReindexPlan, build_manifest, plan_reindex
+
+_DONE = object()
+
+
+class IngestionReport(BaseModel):
+    """Summary of one ingestion run."""
+    documents: int = 0
+    skipped_documents: int = 0
+    chunks: int = 0
+    chunks_embedded: int = 0
+    chunks_reused: int = 0
+    chunks_unchanged: int = 0
+    chunks_deleted: int = 0
+    # Chunk embeddings not requested because the chunk was unchanged or its vector was reused
+    embeddings_saved: int = 0
+    embedding_batches: int = 0
+    upsert_batches: int = 0
+    failed_documents: List[str] = []
+    seconds: float = 0.0
+
+
+def document_key(path: str) -> str:
+    """Checkpoint key of a source file; changes when the file is modified."""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class IngestionCheckpoint:
+    """JSON record of the documents that were completely upserted."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Checkpoint file; read if it exists
+        """
+        self.path = path
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.completed = json.load(f).get("completed", {})
+
+    def is_done(self, key: str) -> bool:
+        """Return True when the document was already ingested."""
+        return key in self.completed
+
+    def mark_done(self, key: str, info: Dict[str, Any]) -> None:
+        """Record a document as ingested (call save() to persist)."""
+        self.completed[key] = info
+
+    def save(self) -> None:
+        """Write the checkpoint atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"completed": self.completed}, f, indent=2)
+        os.replace(temporary, self.path)
+
+
+class IngestionPipeline:
+    """
+    Streams documents into a vector index.
+
+    A producer thread chunks documents one at a time and feeds embedding batches into
+    a bounded queue; embedding workers embed each batch in one request and hand
+    upsert-sized slices to upsert workers through a second bounded queue. Memory stays
+    bounded by the queue sizes and both network stages run concurrently, so throughput
+    rather than round-trip latency sets the pace. A document is checkpointed once all
+    of its chunks are upserted; with a persist callback, only after the index holding
+    them has been saved. Saves are batched every persist_every documents or
+    persist_interval seconds and at the end of the run; like stale-chunk deletes, they
+    run outside the pipeline lock.
+
+    With a ManifestStore, a re-indexed document is diffed against its previous manifest:
+    unchanged chunks are skipped, moved chunks reuse their stored vectors, only new
+    text is embedded, and chunks that no longer exist are deleted.
+    """
+
+    def __init__(
+        self,
+        backend: VectorIndexBackend,
+        namespace: str = "default",
+        checkpoint: Optional[IngestionCheckpoint] = None,
+        embedding_service=None,
+        embed_batch_size: Optional[int] = None,
+        upsert_batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        embed_workers: Optional[int] = None,
+        upsert_workers: Optional[int] = None,
+        persist: Optional[Callable[[], None]] = None,
+        manifests: Optional[ManifestStore] = None,
+        dimensions: Optional[int] = None,
+        persist_every: Optional[int] = None,
+        persist_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            backend: Index to upsert into
+            namespace: Namespace to upsert into
+            checkpoint: Optional checkpoint; completed documents are skipped
+            embedding_service: Service with embed_many (defaults to the shared EmbeddingService)
+            embed_batch_size: Texts per embedding request (defaults to settings.EMBEDDING_BATCH_SIZE)
+            upsert_batch_size: Records per upsert (defaults to settings.INGEST_UPSERT_BATCH_SIZE)
+            queue_size: Batches buffered between stages (defaults to settings.INGEST_QUEUE_SIZE)
+            embed_workers: Concurrent embedding requests (defaults to settings.INGEST_EMBED_WORKERS)
+            upsert_workers: Concurrent upserts (defaults to settings.INGEST_UPSERT_WORKERS)
+            persist: Called before every checkpoint write, e.g. to save a local index
+            manifests: Optional manifest store enabling incremental re-indexing
+            dimensions: Reduced embedding dimension of the target index (None for full size)
+            persist_every: Completed documents per save (defaults to settings.INGEST_PERSIST_EVERY_DOCUMENTS)
+            persist_interval: Seconds after which completed documents are saved regardless
+                (defaults to settings.INGEST_PERSIST_INTERVAL_SECONDS)
+        """
+        self.backend = backend
+        self.namespace = namespace
+        self.checkpoint = checkpoint
+        self.embedding_service = embedding_service or get_embedding_service()
+        self.embed_batch_size = embed_batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.upsert_batch_size = upsert_batch_size or settings.INGEST_UPSERT_BATCH_SIZE
+        self.queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.embed_workers = embed_workers or settings.INGEST_EMBED_WORKERS
+        self.upsert_workers = upsert_workers or settings.INGEST_UPSERT_WORKERS
+        self.persist = persist
+        self.manifests = manifests
+        self.dimensions = dimensions or None
+        self.persist_every = persist_every or settings.INGEST_PERSIST_EVERY_DOCUMENTS
+        self.persist_interval = persist_interval if persist_interval is not None else settings.INGEST_PERSIST_INTERVAL_SECONDS
+
+    def _retrying(self) -> Retrying:
+        """Retry policy for embedding and upsert calls."""
+        return Retrying(
+            stop=stop_after_attempt(settings.INGEST_MAX_RETRIES),
+            wait=wait_exponential(multiplier=0.5, max=10),
+            reraise=True
+        )
+
+    def run(self, paths: Iterable[str], document_type: Optional[str] = None) -> IngestionReport:
+        """
+        Ingest every supported file under paths.
+
+        Args:
+            paths: Files or directories
+            document_type: Document type for every chunk (defaults to each file's stem)
+
+        Returns:
+            IngestionReport for the run
+        """
+        report = IngestionReport()
+        started = time.perf_counter()
+        embed_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        upsert_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size * self.upsert_workers)
+        lock = threading.Lock()
+        # Chunks still to be upserted per document, and documents with a failed batch
+        pending: Dict[str, int] = {}
+        sources: Dict[str, str] = {}
+        # Manifest and stale ids to apply once a document is fully upserted
+        updates: Dict[str, Dict[str, Any]] = {}
+        failed = set()
+        live_embedders = [self.embed_workers]
+        # Fully upserted documents whose stale chunks are still to be deleted
+        completed: List[str] = []
+        # Completed documents whose checkpoint waits for the next save
+        unsaved: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+        last_saved = [time.monotonic()]
+        save_lock = threading.Lock()
+
+        def finish(keys: List[str], ok: bool) -> None:
+            with lock:
+                for key in keys:
+                    if not ok:
+                        failed.add(key)
+                    pending[key] -= 1
+                    if pending[key] == 0 and key not in failed:
+                        complete(key)
+            settle()
+
+        def complete(key: str) -> None:
+            # Caller holds the lock; the deletes run in settle() once it is released
+            completed.append(key)
+
+        def settle() -> None:
+            # Caller does not hold the lock: deletes are remote calls with retries
+            with lock:
+                keys = completed[:]
+                del completed[:]
+            for key in keys:
+                update = updates.get(key)
+                deleted = self._delete_stale(sources[key], update)
+                with lock:
+                    if not deleted:
+                        failed.add(key)
+                        continue
+                    if update is not None:
+                        report.chunks_deleted += len(update["stale_ids"])
+                    unsaved.append((key, sources[key], update))
+            save()
+
+        def save(final: bool = False) -> None:
+            # Caller does not hold the lock; a worker skips the save while another one runs
+            if not save_lock.acquire(blocking=final):
+                return
+            try:
+                with lock:
+                    due = final or self.persist is None or len(unsaved) >= self.persist_every or \
+                        time.monotonic() - last_saved[0] >= self.persist_interval
+                    if not unsaved or not due:
+                        return
+                    documents = unsaved[:]
+                    del unsaved[:]
+                try:
+                    self._save(documents)
+                except Exception as e:
+                    print(f"Error saving the index: {e}")
+                    with lock:
+                        failed.update(key for key, _, _ in documents)
+                last_saved[0] = time.monotonic()
+            finally:
+                save_lock.release()
+
+        def produce() -> None:
+            try:
+                produce_batches()
+            finally:
+                for _ in range(self.embed_workers):
+                    embed_queue.put(_DONE)
+
+        def produce_batches() -> None:
+            batch = []
+            for path in iter_source_files(paths):
+                key = document_key(path)
+                if self.checkpoint is not None and self.checkpoint.is_done(key):
+                    report.skipped_documents += 1
+                    continue
+                try:
+                    records = chunk_document(path, document_type)
+                except Exception as e:
+                    print(f"Error reading {path}: {e}")
+                    with lock:
+                        failed.add(key)
+                        sources[key] = path
+                    continue
+                try:
+                    plan, reused = self._plan(path, records)
+                except Exception as e:
+                    print(f"Error diffing {path} against its manifest: {e}")
+                    with lock:
+                        failed.add(key)
+                        sources[key] = path
+                    continue
+                report.documents += 1
+                report.chunks += len(records)
+                report.chunks_embedded += len(plan.embed)
+                report.chunks_reused += len(reused)
+                report.chunks_unchanged += plan.unchanged
+                report.embeddings_saved += len(reused) + plan.unchanged
+                with lock:
+                    sources[key] = path
+                    pending[key] = len(plan.embed) + len(reused)
+                    if self.manifests is not None:
+                        updates[key] = {
+                            "stem": os.path.splitext(os.path.basename(path))[0],
+                            "manifest": build_manifest(os.path.basename(path), records),
+                            "stale_ids": plan.stale_ids
+                        }
+                    if pending[key] == 0:
+                        complete(key)
+                settle()
+                for start in range(0, len(reused), self.upsert_batch_size):
+                    upsert_queue.put([(key, record) for record in reused[start:start + self.upsert_batch_size]])
+                for record in plan.embed:
+                    batch.append((key, record))
+                    if len(batch) >= self.embed_batch_size:
+                        embed_queue.put(batch)
+                        batch = []
+            if batch:
+                embed_queue.put(batch)
+
+        def embed() -> None:
+            try:
+                embed_batches()
+            finally:
+                with lock:
+                    live_embedders[0] -= 1
+                    last = live_embedders[0] == 0
+                if last:
+                    for _ in range(self.upsert_workers):
+                        upsert_queue.put(_DONE)
+
+        def embed_batches() -> None:
+            while True:
+                batch = embed_queue.get()
+                if batch is _DONE:
+                    break
+                keys = [key for key, _ in batch]
+                try:
+                    vectors = self._retrying()(
+                        self.embedding_service.embed_many,
+                        [record["metadata"]["text"] for _, record in batch],
+                        dimensions=self.dimensions
+                    )
+                except Exception as e:
+                    print(f"Error embedding batch: {e}")
+                    finish(keys, ok=False)
+                    continue
+                with lock:
+                    report.embedding_batches += 1
+                for start in range(0, len(batch), self.upsert_batch_size):
+                    upsert_queue.put([
+                        (key, {**record, "values": vector})
+                        for (key, record), vector in zip(
+                            batch[start:start + self.upsert_batch_size],
+                            vectors[start:start + self.upsert_batch_size]
+                        )
+                    ])
+
+        def upsert() -> None:
+            while True:
+                batch = upsert_queue.get()
+                if batch is _DONE:
+                    break
+                keys = [key for key, _ in batch]
+                try:
+                    self._retrying()(self.backend.upsert, [record for _, record in batch], namespace=self.namespace)
+                except Exception as e:
+                    print(f"Error upserting batch: {e}")
+                    finish(keys, ok=False)
+                    continue
+                with lock:
+                    report.upsert_batches += 1
+                finish(keys, ok=True)
+
+        threads = [threading.Thread(target=produce, name="ingest-producer")]
+        threads += [threading.Thread(target=embed, name=f"ingest-embed-{i}") for i in range(self.embed_workers)]
+        threads += [threading.Thread(target=upsert, name=f"ingest-upsert-{i}") for i in range(self.upsert_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        save(final=True)
+
+        report.failed_documents = sorted(sources[key] for key in failed)
+        report.seconds = round(time.perf_counter() - started, 3)
+        return report
+
+    def _plan(self, path: str, records: List[Dict[str, Any]]):
+        """
+        Decide which chunks of a document to embed, and fetch the vectors it can reuse.
+
+        Returns:
+            (ReindexPlan, reused records carrying their previous vectors)
+        """
+        if self.manifests is None:
+            return ReindexPlan(embed=records), []
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        previous = self.manifests.load(stem) or ManifestStore.from_index(self.backend, stem, self.namespace)
+        plan = plan_reindex(records, previous)
+
+        old_ids = sorted(set(plan.reuse_from.values()))
+        stored = {}
+        for start in range(0, len(old_ids), self.upsert_batch_size):
+            stored.update(self._retrying()(
+                self.backend.fetch, old_ids[start:start + self.upsert_batch_size], namespace=self.namespace
+            ))
+        reused = []
+        for record in plan.reuse:
+            old = stored.get(plan.reuse_from[record["id"]])
+            # The stored chunk may have been overwritten by an interrupted run
+            if old is not None and old.get("values") is not None and \
+                    (old.get("metadata") or {}).get("content_hash") == record["metadata"]["content_hash"]:
+                reused.append({**record, "values": old["values"]})
+            else:
+                plan.embed.append(record)
+        return plan, reused
+
+    def _delete_stale(self, path: str, update: Optional[Dict[str, Any]]) -> bool:
+        """
+        Delete the chunks a fully upserted document no longer has (caller does not hold the pipeline lock).
+
+        Returns:
+            False if the stale chunks could not be deleted
+        """
+        if update is not None and update["stale_ids"]:
+            try:
+                self._retrying()(self.backend.delete, update["stale_ids"], namespace=self.namespace)
+            except Exception as e:
+                print(f"Error deleting stale chunks of {path}: {e}")
+                return False
+        return True
+
+    def _save(self, documents: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Persist the index, then save the manifests and checkpoint of the documents it now
+        holds, so a crash never checkpoints a document whose vectors were not saved.
+
+        Args:
+            documents: (checkpoint key, source path, manifest update) of each completed document
+        """
+        if self.persist is not None:
+            self.persist()
+        for key, path, update in documents:
+            if update is not None:
+                self.manifests.save(update["stem"], update["manifest"])
+            if self.checkpoint is not None:
+                self.checkpoint.mark_done(key, {"source": path, "namespace": self.namespace})
+        if self.checkpoint is not None:
+            self.checkpoint.save()
@@ -4,7 +4,7 @@ Purpose: Coordinates multiple agents to analyze and update regulations for Shari
 """
 import sys
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Add the src directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -12,17 +12,29 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import json
 from pathlib import Path
 from src.agents.fas_retriever import FASRetriever, FASDocument
-from src.agents.ss_retiever import SSRetriever, SSDocument
+from src.agents.ss_retiever import SSRetriever, SSHit
 from src.agents.summarizer_fas import RetrievalSummarizer
 from src.agents.summarizer_ss import SSRetrievalSummarizer
 from src.agents.shariah_compliance_agent import ShariahComplianceAgent, ComplianceInput
 from src.agents.update_advisor_agent import UpdateAdvisorAgent, UpdateInput
+from src.core.config import settings
+
+# SS context retrieved for each non-compliant section: never more than the five chunks
+# update prompts always took, fewer where relevance drops off
+SS_CONTEXT_OPTIONS: Dict[str, Any] = {"top_n": 5, "adaptive": True}
 
 class RegulationRevisionOrchestrator:
     """Orchestrates the process of analyzing and updating regulations for Shariah compliance."""
     
-    def __init__(self):
-        """Initialize all required agents."""
+    def __init__(self, batch_compliance: Optional[bool] = None):
+        """
+        Initialize all required agents.
+        
+        Args:
+            batch_compliance: Check each regulation list's sections several per request
+                (defaults to settings.COMPLIANCE_BATCH_ENABLED)
+        """
+        self.batch_compliance = settings.COMPLIANCE_BATCH_ENABLED if batch_compliance is None else batch_compliance
         self.fas_retriever = FASRetriever()
         self.ss_retriever = SSRetriever()
         self.summarizer_fas = RetrievalSummarizer()
@@ -68,48 +80,60 @@ class RegulationRevisionOrchestrator:
     def _process_regulation_list(self, regulation_list: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """Process a list of regulations."""
         processed_list = []
+        non_compliant = []
         
-        for regulation in regulation_list:
-            for section_name, content in regulation.items():
-                
-                
-                # Check compliance using proper input model
-                compliance_input = ComplianceInput(
-                    rule_text=content,
-                    ss_summary=""
-                )
-                compliance_result = self.compliance_agent.check_compliance(compliance_input)
-                
-                # Create processed regulation entry
-                processed_regulation = {
-                    section_name: {
-                        "original_text": content,
-                        "compliance_status": compliance_result.compliance_status,
-                        "compliance_justification": compliance_result.justification,
-                        "referenced_clauses": compliance_result.referenced_clauses
-                    }
+        sections = [
+            (section_name, content)
+            for regulation in regulation_list
+            for section_name, content in regulation.items()
+        ]
+        
+        # Check compliance using proper input model
+        compliance_inputs = [ComplianceInput(rule_text=content, ss_summary="") for _, content in sections]
+        if self.batch_compliance:
+            compliance_results = self.compliance_agent.check_compliance_batch(compliance_inputs)
+        else:
+            compliance_results = [self.compliance_agent.check_compliance(input_data) for input_data in compliance_inputs]
+        
+        for (section_name, content), compliance_result in zip(sections, compliance_results):
+            # Create processed regulation entry
+            processed_regulation = {
+                section_name: {
+                    "original_text": content,
+                    "compliance_status": compliance_result.compliance_status,
+                    "compliance_justification": compliance_result.justification,
+                    "referenced_clauses": compliance_result.referenced_clauses
                 }
-                
-                # If non-compliant, get update proposal using proper input model
-                if compliance_result.compliance_status == "non_compliant":
-                    # Extract text content from SS documents for the update proposal
-                    ss_documents: List[SSDocument] = self.ss_retriever.retrieve(content)
-                    ss_texts = [doc.text for doc in ss_documents]
-                    
-                    update_input = UpdateInput(
-                        non_compliant_text=content,
-                        issue_summary=compliance_result.justification,
-                        context_type=section_name,
-                        ss_documents=ss_texts
-                    )
-                    update_result = self.update_advisor.propose_update(update_input)
-                    
-                    processed_regulation[section_name].update({
-                        "proposed_update": update_result.proposed_update,
-                        "update_rationale": update_result.rationale
-                    })
-                
-                processed_list.append(processed_regulation)
+            }
+            
+            if compliance_result.compliance_status == "non_compliant":
+                non_compliant.append((processed_regulation, section_name, content, compliance_result))
+            
+            processed_list.append(processed_regulation)
+        
+        # Retrieve SS context for every non-compliant section in one batched call
+        ss_results: List[List[SSHit]] = self.ss_retriever.retrieve_many(
+            [content for _, _, content, _ in non_compliant],
+            **SS_CONTEXT_OPTIONS
+        )
+        
+        # Get an update proposal for each non-compliant section using proper input model
+        for (processed_regulation, section_name, content, compliance_result), ss_documents in zip(non_compliant, ss_results):
+            # Extract text content from SS documents for the update proposal
+            ss_texts = [doc.text for doc in ss_documents]
+            
+            update_input = UpdateInput(
+                non_compliant_text=content,
+                issue_summary=compliance_result.justification,
+                context_type=section_name,
+                ss_documents=ss_texts
+            )
+            update_result = self.update_advisor.propose_update(update_input)
+            
+            processed_regulation[section_name].update({
+                "proposed_update": update_result.proposed_update,
+                "update_rationale": update_result.rationale
+            })
         
         return processed_list
 
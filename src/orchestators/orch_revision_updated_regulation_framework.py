@@ -24,7 +24,7 @@ class UpdateRevisionOrchestrator:
             A structured document containing merged reports.
         """
         # Step 1: Run the compliance scanner
-        problematic_fields = self.scanner.scan_draft(input_data)
+        problematic_fields = await self.scanner.ascan_draft(input_data)
 
         # Step 2: Propagate the problematic fields to specialized agents
         propagation_result = await self.propagator.propagate(problematic_fields.problematic_fields)
@@ -5,7 +5,7 @@ Purpose: Creates a reasoning-based execution plan for answering regulatory queri
 
 from typing import Dict, List
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from src.core.llm_gateway import get_llm_gateway
 from src.core.config import settings  
 import json
 
@@ -30,7 +30,7 @@ class QAPlanningAgent:
     
     def __init__(self):
         """Initialize the QA Planning agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are a Shariah-compliant regulatory planner.
 
@@ -83,8 +83,8 @@ Respond in JSON format:
             # Format the user message
             user_message = self._format_user_message(input_data)
             
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
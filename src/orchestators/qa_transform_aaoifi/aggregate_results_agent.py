@@ -5,7 +5,7 @@ Purpose: Aggregates outputs from multiple agents into a single, coherent answer.
 
 from typing import Dict, List
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ...core.llm_gateway import get_llm_gateway
 from ...core.config import settings
 import json
 
@@ -29,7 +29,7 @@ class AggregateResultsAgent:
     
     def __init__(self):
         """Initialize the Aggregate Results agent."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
         self.system_prompt = """
 You are an expert Shariah-compliant AI analyst.
 
@@ -71,8 +71,8 @@ The final answer should:
             # Format the user message
             user_message = self._format_user_message(input_data)
             
-            # Get analysis from OpenAI
-            response = self.client.chat.completions.create(
+            # Get analysis through the shared LLM gateway
+            response = self.client.chat_completion(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
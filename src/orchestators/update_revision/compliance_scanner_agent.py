@@ -3,12 +3,13 @@ Compliance Scanner Agent
 Purpose: Scans regulation drafts for compliance issues using the ShariahComplianceAgent.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ...core.llm_gateway import get_llm_gateway
 from ...core.config import settings
 from ...agents.shariah_compliance_agent import ShariahComplianceAgent, ComplianceInput
 import json
+import asyncio
 
 class ProblematicField(BaseModel):
     """Model for a problematic field in the regulation draft."""
@@ -39,10 +40,17 @@ class DraftRegulation(BaseModel):
 class ComplianceScannerAgent:
     """Agent for scanning regulation drafts for compliance issues."""
     
-    def __init__(self):
-        """Initialize the Compliance Scanner agent."""
+    def __init__(self, batch: Optional[bool] = None):
+        """
+        Initialize the Compliance Scanner agent.
+        
+        Args:
+            batch: Check sections several per request with check_compliance_batch
+                (defaults to settings.COMPLIANCE_BATCH_ENABLED)
+        """
         self.compliance_agent = ShariahComplianceAgent()
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_llm_gateway()
+        self.batch = settings.COMPLIANCE_BATCH_ENABLED if batch is None else batch
         
     def scan_draft(self, draft_regulation: List[Dict[str, List[Dict[str, str]]]]) -> ComplianceScanResult:
         """
@@ -55,58 +63,78 @@ class ComplianceScannerAgent:
             ComplianceScanResult object containing all problematic fields
         """
         try:
-            problematic_fields = []
+            # Check every External Regulation and Internal Rulebook section
+            sections = list(self._iter_sections(draft_regulation))
+            if self.batch:
+                results = self.compliance_agent.check_compliance_batch([
+                    ComplianceInput(rule_text=content, ss_summary="") for _, content in sections
+                ])
+            else:
+                results = [self._check_section_compliance(content, location) for location, content in sections]
+            
+            # Report the sections that are not fully compliant
+            problematic_fields = [
+                self._problematic_field(location, content, compliance_result)
+                for (location, content), compliance_result in zip(sections, results)
+                if compliance_result.compliance_status != "compliant"
+            ]
+            return ComplianceScanResult(problematic_fields=problematic_fields)
+            
+        except Exception as e:
+            print(f"Error scanning regulation draft: {e}")
+            raise
+
+    async def ascan_draft(self, draft_regulation: List[Dict[str, List[Dict[str, str]]]]) -> ComplianceScanResult:
+        """
+        Async counterpart of scan_draft; checks all sections (or batches) concurrently.
+        
+        Args:
+            draft_regulation: List of dictionaries containing the regulation draft structure
             
-            # Process each section in the draft regulation
-            for section in draft_regulation:
-                # Process External Regulation sections
-                for external_section in section.get("External Regulation", []):
-                    for section_name, content in external_section.items():
-                        # Check compliance for this section
-                        compliance_result = self._check_section_compliance(
-                            content,
-                            f"External Regulation > {section_name}"
-                        )
-                        
-                        # Add to problematic fields if not fully compliant
-                        if compliance_result.compliance_status != "compliant":
-                            problematic_fields.append(
-                                ProblematicField(
-                                    location=f"External Regulation > {section_name}",
-                                    text=content,
-                                    compliance_status=compliance_result.compliance_status,
-                                    justification=compliance_result.justification,
-                                    referenced_clauses=compliance_result.referenced_clauses
-                                )
-                            )
-                
-                # Process Internal Rulebook sections
-                for internal_section in section.get("Internal Rulebook", []):
-                    for section_name, content in internal_section.items():
-                        # Check compliance for this section
-                        compliance_result = self._check_section_compliance(
-                            content,
-                            f"Internal Rulebook > {section_name}"
-                        )
-                        
-                        # Add to problematic fields if not fully compliant
-                        if compliance_result.compliance_status != "compliant":
-                            problematic_fields.append(
-                                ProblematicField(
-                                    location=f"Internal Rulebook > {section_name}",
-                                    text=content,
-                                    compliance_status=compliance_result.compliance_status,
-                                    justification=compliance_result.justification,
-                                    referenced_clauses=compliance_result.referenced_clauses
-                                )
-                            )
+        Returns:
+            ComplianceScanResult object containing all problematic fields, in draft order
+        """
+        try:
+            sections = list(self._iter_sections(draft_regulation))
+            inputs = [ComplianceInput(rule_text=content, ss_summary="") for _, content in sections]
+            if self.batch:
+                results = await self.compliance_agent.acheck_compliance_batch(inputs)
+            else:
+                results = await asyncio.gather(*[
+                    self.compliance_agent.acheck_compliance(input_data) for input_data in inputs
+                ])
             
+            problematic_fields = [
+                self._problematic_field(location, content, compliance_result)
+                for (location, content), compliance_result in zip(sections, results)
+                if compliance_result.compliance_status != "compliant"
+            ]
             return ComplianceScanResult(problematic_fields=problematic_fields)
             
         except Exception as e:
             print(f"Error scanning regulation draft: {e}")
             raise
 
+    @staticmethod
+    def _iter_sections(draft_regulation: List[Dict[str, List[Dict[str, str]]]]):
+        """Yield (location, content) for every External Regulation and Internal Rulebook section."""
+        for section in draft_regulation:
+            for part in ("External Regulation", "Internal Rulebook"):
+                for part_section in section.get(part, []):
+                    for section_name, content in part_section.items():
+                        yield f"{part} > {section_name}", content
+
+    @staticmethod
+    def _problematic_field(location: str, content: str, compliance_result: Any) -> ProblematicField:
+        """Build the ProblematicField reported for a section that is not fully compliant."""
+        return ProblematicField(
+            location=location,
+            text=content,
+            compliance_status=compliance_result.compliance_status,
+            justification=compliance_result.justification,
+            referenced_clauses=compliance_result.referenced_clauses
+        )
+
     def _check_section_compliance(self, content: str, section_name: str) -> Any:
         """
         Check compliance for a single section using the ShariahComplianceAgent.
@@ -5,7 +5,7 @@ Purpose: Distributes compliance scanner results to specialized agents for parall
 
 from typing import Dict, List, Any
 from pydantic import BaseModel, Field
-from openai import OpenAI
+from ...core.llm_gateway import get_llm_gateway
 from ...core.config import settings
 from .compliance_scanner_agent import ProblematicField
 from ...agents.ambiguity_agent import AmbiguityDetectionAgent, AmbiguityAnalysisInput
@@ -14,7 +14,6 @@ from ...agents.conflict_agent import ConflictDetectionAgent, ConflictAnalysisInp
 from ...agents.risk_agent import RiskAnalysisAgent, RiskAnalysisInput
 import json
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 class AgentReport(BaseModel):
     """Model for individual agent analysis report."""
@@ -37,8 +36,7 @@ class PropagatorAgent:
     
     def __init__(self):
         """Initialize the Propagator agent and specialized agents."""
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.client = get_llm_gateway()
         
         # Initialize specialized agents
         self.ambiguity_agent = AmbiguityDetectionAgent()
@@ -57,22 +55,22 @@ class PropagatorAgent:
             PropagationResult containing reports from all agents
         """
         try:
-            field_reports = {}
-            
-            # Process each problematic field
-            for field in problematic_fields:
-                # Create tasks for parallel processing
-                tasks = [
+            # Run every agent on every field concurrently on the event loop;
+            # the shared LLM gateway enforces the per-model concurrency limits
+            per_field = await asyncio.gather(*[
+                asyncio.gather(
                     self._analyze_ambiguity(field),
                     self._analyze_gaps(field),
                     self._analyze_conflicts(field),
                     self._analyze_risks(field)
-                ]
-                
-                # Wait for all agents to complete their analysis
-                reports = await asyncio.gather(*tasks)
-                field_reports[field.location] = reports
+                )
+                for field in problematic_fields
+            ])
             
+            field_reports = {
+                field.location: list(reports)
+                for field, reports in zip(problematic_fields, per_field)
+            }
             return PropagationResult(field_reports=field_reports)
             
         except Exception as e:
@@ -88,10 +86,7 @@ class PropagatorAgent:
                 ss_summary=field.justification
             )
             
-            result = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                lambda: self.ambiguity_agent.analyze_ambiguity(input_data)
-            )
+            result = await self.ambiguity_agent.aanalyze_ambiguity(input_data)
             
             return AgentReport(
                 agent_name="Ambiguity Detection Agent",
@@ -112,10 +107,7 @@ class PropagatorAgent:
                 ss_summary=field.justification
             )
             
-            result = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                lambda: self.gap_agent.analyze_gaps(input_data)
-            )
+            result = await self.gap_agent.aanalyze_gaps(input_data)
             
             return AgentReport(
                 agent_name="Gap Detection Agent",
@@ -136,10 +128,7 @@ class PropagatorAgent:
                 ss_summary=field.justification
             )
             
-            result = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                lambda: self.conflict_agent.analyze_conflict(input_data)
-            )
+            result = await self.conflict_agent.aanalyze_conflict(input_data)
             
             return AgentReport(
                 agent_name="Conflict Detection Agent",
@@ -160,10 +149,7 @@ class PropagatorAgent:
                 known_risks=field.referenced_clauses
             )
             
-            result = await asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                lambda: self.risk_agent.analyze_risk(input_data)
-            )
+            result = await self.risk_agent.aanalyze_risk(input_data)
             
             # Ensure analysis_result is a valid dictionary
             analysis_result = result.dict() if hasattr(result, 'dict') else {}
@@ -0,0 +1,80 @@
+"""
+Benchmark: throughput and request count of single-text embeds from concurrent callers,
+with and without the micro-batching window.
+Runs offline against a simulated embeddings endpoint with a fixed round-trip time and a
+cap on concurrent requests, like a provider rate limit.
+Run with: python src/tests/bench_embedding_batcher.py
+"""
+
+import sys
+import os
+import time
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.core.embeddings import EmbeddingService
+
+ROUND_TRIP_SECONDS = 0.04
+PROVIDER_CONCURRENCY = 8
+REQUESTS = 400
+CALLERS = 64
+
+
+class SimulatedEmbeddings:
+    """Embeddings endpoint that takes ROUND_TRIP_SECONDS per request, PROVIDER_CONCURRENCY at a time."""
+
+    def __init__(self):
+        self.slots = threading.Semaphore(PROVIDER_CONCURRENCY)
+        self.calls = 0
+
+    def create(self, input, model, **options):
+        with self.slots:
+            self.calls += 1
+            time.sleep(ROUND_TRIP_SECONDS)
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), float(i)]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=data)
+
+
+def run(name, window_ms):
+    """Embed REQUESTS distinct queries from CALLERS threads and print the results."""
+    service = EmbeddingService(api_key="bench", batch_window_ms=window_ms)
+    endpoint = SimulatedEmbeddings()
+    service.client = SimpleNamespace(embeddings=endpoint, close=lambda: None)
+
+    def timed(i):
+        start = time.perf_counter()
+        service.embed(f"What does the standard say about question {i}?")
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        latencies = sorted(executor.map(timed, range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    service.close()
+
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<18} {REQUESTS / elapsed:8.1f} embeds/s  requests={endpoint.calls:4d}  "
+        f"p50={p50:7.1f} ms  p99={p99:7.1f} ms"
+    )
+
+
+def main():
+    """Compare unbatched requests with several window sizes under the same load."""
+    print(
+        f"\n=== {REQUESTS} single-text embeds, {CALLERS} callers, "
+        f"{ROUND_TRIP_SECONDS * 1000:.0f} ms round trip, {PROVIDER_CONCURRENCY} concurrent requests ==="
+    )
+    run("no batching", 0)
+    for window_ms in (2, 5, 10):
+        run(f"window {window_ms} ms", window_ms)
+
+
+if __name__ == "__main__":
+    main()
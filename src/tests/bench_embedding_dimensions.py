@@ -0,0 +1,111 @@
+"""
+Benchmark: recall@k of reduced-dimension embeddings against full-dimension results
+on a fixed FAS/SS query set.
+Run with: python src/tests/bench_embedding_dimensions.py [--k 5] [--dimensions 256 512 768 1024]
+
+Needs OPENAI_API_KEY and full-size local snapshots of the FAS and SS indexes under
+LOCAL_INDEX_DIR (see LocalVectorIndex.import_from or the ingestion CLI). Chunk and
+query vectors are shortened locally, which for text-embedding-3 models equals asking
+the API for fewer dimensions; one query is also re-embedded at the smallest dimension
+through the API to confirm that on the configured model.
+"""
+
+import sys
+import os
+import argparse
+import statistics
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+from src.core.config import settings
+from src.core.embeddings import get_embedding_service, shorten_embedding
+from src.core.vector_index import LocalVectorIndex
+
+QUERY_SETS = [
+    ("FAS", settings.PINECONE_INDEX_FAS, [
+        "How is the Murabaha deferred profit recognised over the financing period?",
+        "Measurement of Salam capital at the time of contracting",
+        "Treatment of losses in a diminishing Musharaka",
+        "Istisna revenue recognition using the percentage of completion method",
+        "Disclosure requirements for Ijarah Muntahia Bittamleek assets",
+        "Impairment of Murabaha receivables and late payment penalties",
+        "Parallel Salam when the seller fails to deliver",
+        "Musharaka capital contributed in kind valuation",
+        "Costs of an Istisna contract exceeding the contract price",
+        "Transfer of ownership at the end of an Ijarah lease",
+    ]),
+    ("SS", settings.PINECONE_INDEX_SS, [
+        "Is a promise to purchase binding on the customer in Murabaha to the purchase orderer?",
+        "Can the lessor charge a penalty for late rental payments in Ijarah?",
+        "Conditions for the subject matter of a Salam contract",
+        "May a partner guarantee the capital of another partner in Musharakah?",
+        "Selling a commodity before taking possession in Murabahah",
+        "Maintenance responsibilities of the lessor in Ijarah Muntahia Bittamleek",
+        "Rescheduling Murabahah debt with an increase in the amount",
+        "Exit of a partner from a diminishing Musharakah",
+        "Hamish jiddiyyah and earnest money in Murabahah",
+        "Substitution of the Salam commodity at delivery",
+    ]),
+]
+
+
+def top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> set:
+    """Exact cosine top-k row positions (rows and query unit length)."""
+    scores = matrix @ query
+    return set(np.argpartition(-scores, k - 1)[:k].tolist())
+
+
+def shorten_rows(matrix: np.ndarray, dimensions: int) -> np.ndarray:
+    """Truncate and renormalize every row."""
+    shortened = matrix[:, :dimensions]
+    norms = np.linalg.norm(shortened, axis=1, keepdims=True)
+    return shortened / np.where(norms == 0, 1, norms)
+
+
+def main():
+    """Print recall@k and memory per dimension for each index."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[256, 512, 768, 1024])
+    args = parser.parse_args()
+
+    service = get_embedding_service()
+    for label, index_name, queries in QUERY_SETS:
+        snapshot = os.path.join(settings.LOCAL_INDEX_DIR, index_name)
+        if not os.path.exists(os.path.join(snapshot, "manifest.json")):
+            print(f"Skipping {label}: no local snapshot in {snapshot}")
+            continue
+        index = LocalVectorIndex.load(snapshot)
+        matrix = np.vstack([store.vectors for store in index.namespaces.values()])
+        full_dimension = matrix.shape[1]
+        query_vectors = np.asarray(service.embed_many(queries), dtype=np.float32)
+        if query_vectors.shape[1] != full_dimension:
+            print(f"Skipping {label}: index has {full_dimension} dims, model returns {query_vectors.shape[1]}")
+            continue
+        query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+        truth = [top_k(matrix, query, args.k) for query in query_vectors]
+
+        print(f"\n=== {label} ({index_name}): {len(matrix)} chunks, {len(queries)} queries, full size {full_dimension} ===")
+        print(f"{full_dimension:>6} dims  recall@{args.k}=1.0000  vectors={matrix.nbytes / 2 ** 20:6.1f} MiB")
+        for dimensions in sorted(d for d in args.dimensions if d < full_dimension):
+            reduced = shorten_rows(matrix, dimensions)
+            reduced_queries = shorten_rows(query_vectors, dimensions)
+            recalls = [
+                len(top_k(reduced, query, args.k) & expected) / args.k
+                for query, expected in zip(reduced_queries, truth)
+            ]
+            print(
+                f"{dimensions:>6} dims  recall@{args.k}={statistics.mean(recalls):.4f}  "
+                f"min={min(recalls):.2f}  vectors={reduced.astype(np.float32).nbytes / 2 ** 20:6.1f} MiB"
+            )
+
+        smallest = min(args.dimensions)
+        from_api = np.asarray(service.embed(queries[0], dimensions=smallest), dtype=np.float32)
+        local = np.asarray(shorten_embedding(query_vectors[0].tolist(), smallest), dtype=np.float32)
+        print(f"API vs local shortening at {smallest} dims: cosine={float(from_api @ local):.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: per-call OpenAI client construction vs. the pooled EmbeddingService.
+Requires OPENAI_API_KEY. Run with: python src/tests/bench_embedding_service.py
+"""
+
+import sys
+import os
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from openai import OpenAI
+from src.core.config import settings
+from src.core.embeddings import get_embedding_service
+
+QUERIES = [
+    "What is Musharaka financing?",
+    "Payment terms and conditions",
+    "Late payment penalties in Murabaha",
+    "Liquidity risk management policy",
+    "AML and KYC requirements for customers",
+    "Contract termination in Istisna",
+]
+REQUESTS = 120
+CONCURRENCY = 8
+
+
+def embed_with_new_client(query: str) -> list:
+    """The previous behaviour: a fresh client for every query."""
+    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    response = client.embeddings.create(input=query, model=settings.EMBEDDING_MODEL)
+    return response.data[0].embedding
+
+
+def embed_with_service(query: str) -> list:
+    """Embed through the shared pooled service."""
+    return get_embedding_service().embed(query)
+
+
+def run(name, embed_fn):
+    """Run a sustained load and print latency percentiles."""
+    def timed(i):
+        start = time.perf_counter()
+        embed_fn(QUERIES[i % len(QUERIES)])
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        latencies = sorted(executor.map(timed, range(REQUESTS)))
+
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<20} p50={p50:8.1f} ms  p99={p99:8.1f} ms")
+
+
+def main():
+    """Compare both strategies under the same load."""
+    print(f"\n=== Embedding latency ({REQUESTS} requests, concurrency {CONCURRENCY}) ===")
+    run("per-call client", embed_with_new_client)
+    run("pooled service", embed_with_service)
+
+
+if __name__ == "__main__":
+    main()
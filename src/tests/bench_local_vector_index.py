@@ -0,0 +1,86 @@
+"""
+Benchmark: single-core search latency of the LocalVectorIndex backend.
+Run with: OMP_NUM_THREADS=1 OPENBLAS_NUM_THREADS=1 python src/tests/bench_local_vector_index.py
+"""
+
+import sys
+import os
+import time
+import statistics
+
+# Keep BLAS on a single core unless the caller already chose otherwise
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever
+
+DIMENSION = 1536
+# Roughly the size of the five FAS standards once chunked
+CHUNKS = 2000
+QUERIES = 200
+DOCUMENT_TYPES = [
+    "FAS_4_Musharaka",
+    "FAS_7_Salam_Parallel_Salam",
+    "FAS_10_Istisna",
+    "FAS_28_Murabaha_Deferred_Payment_Sales",
+    "FAS_32"
+]
+
+
+def build_index(rng) -> LocalVectorIndex:
+    """Build a synthetic index with the FAS document types."""
+    vectors = rng.standard_normal((CHUNKS, DIMENSION)).astype(np.float32)
+    index = LocalVectorIndex(dimension=DIMENSION)
+    index.upsert([
+        {
+            "id": f"chunk-{i}",
+            "values": vectors[i],
+            "metadata": {
+                "text": f"chunk {i}",
+                "document_type": DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)],
+                "section_heading": f"Section {i % 40}"
+            }
+        }
+        for i in range(CHUNKS)
+    ])
+    return index
+
+
+def measure(index, queries, filter):
+    """Return per-query latencies in milliseconds."""
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.query(query, top_k=5, filter=filter)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def main():
+    """Print p50/p99 latency for unfiltered and filtered searches."""
+    rng = np.random.default_rng(0)
+    index = build_index(rng)
+    queries = rng.standard_normal((QUERIES, DIMENSION)).astype(np.float32)
+    cases = {
+        "unfiltered": None,
+        "$eq document_type": FASRetriever._build_filter("FAS_4_Musharaka"),
+        "$in document_type": FASRetriever._build_filter(["FAS_10_Istisna", "FAS_32"]),
+        "$and + section": FASRetriever._build_filter(["FAS_10_Istisna"], "Section 2"),
+    }
+
+    print(f"\n=== LocalVectorIndex search ({CHUNKS} x {DIMENSION}, top_k=5) ===")
+    measure(index, queries[:10], None)  # warm-up
+    for name, filter in cases.items():
+        latencies = measure(index, queries, filter)
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"{name:<20} p50={statistics.median(latencies):.3f} ms  p99={p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
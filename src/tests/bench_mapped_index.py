@@ -0,0 +1,100 @@
+"""
+Benchmark: open time, private memory, search latency and recall of the mapped
+float16/int8 store against the float32 LocalVectorIndex.
+Run with: OMP_NUM_THREADS=1 OPENBLAS_NUM_THREADS=1 python src/tests/bench_mapped_index.py
+"""
+
+import sys
+import os
+import time
+import shutil
+import statistics
+import tempfile
+import tracemalloc
+
+# Keep BLAS on a single core unless the caller already chose otherwise
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+from src.core.mapped_index import MappedVectorIndex, write_mapped_index
+from src.core.vector_index import LocalVectorIndex
+
+DIMENSION = 1536
+# Roughly the size of the FAS and SS standards once chunked
+CHUNKS = 4000
+TOPICS = 200
+QUERIES = 200
+TOP_K = 10
+
+
+def build_index(rng) -> LocalVectorIndex:
+    """Build a clustered synthetic corpus, so neighbours are close like real chunk embeddings."""
+    centers = rng.standard_normal((TOPICS, DIMENSION)).astype(np.float32)
+    topics = rng.integers(0, TOPICS, CHUNKS)
+    vectors = centers[topics] + 0.6 * rng.standard_normal((CHUNKS, DIMENSION)).astype(np.float32)
+    index = LocalVectorIndex(dimension=DIMENSION)
+    index.upsert([
+        {"id": f"chunk#{i}", "values": vectors[i], "metadata": {
+            "text": f"Chunk {i}. " + "The institution shall recognise the profit over the period. " * 20,
+            "document_type": f"FAS_{topics[i] % 5}", "section_heading": f"Section {topics[i]}",
+            "chunk_index": i, "total_chunks": CHUNKS}}
+        for i in range(CHUNKS)
+    ])
+    queries = centers[rng.integers(0, TOPICS, QUERIES)] + 0.6 * rng.standard_normal((QUERIES, DIMENSION))
+    return index, queries.astype(np.float32)
+
+
+def timed_open(opener):
+    """Return (index, milliseconds, KiB allocated on the Python heap) for one open."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = opener()
+    elapsed = (time.perf_counter() - start) * 1000
+    allocated = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    return index, elapsed, allocated
+
+
+def directory_size(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 2 ** 20
+
+
+def main():
+    """Compare the float32 index with the float16 and int8 mapped stores."""
+    index, queries = build_index(np.random.default_rng(0))
+    workspace = tempfile.mkdtemp()
+    try:
+        index.save(os.path.join(workspace, "float32"))
+        expected = [[match["id"] for match in index.query(query, TOP_K)] for query in queries]
+
+        print(f"\n=== {CHUNKS} chunks x {DIMENSION} dims, top_k={TOP_K} ===")
+        candidates = [("float32 (local)", os.path.join(workspace, "float32"), LocalVectorIndex.load)]
+        for dtype in ("float16", "int8"):
+            directory = os.path.join(workspace, dtype)
+            write_mapped_index(index, directory, dtype=dtype)
+            candidates.append((f"{dtype} (mapped)", directory, MappedVectorIndex))
+
+        for name, directory, opener in candidates:
+            opened, open_ms, heap_kib = timed_open(lambda: opener(directory))
+            latencies, recalls = [], []
+            for query, truth in zip(queries, expected):
+                start = time.perf_counter()
+                found = [match["id"] for match in opened.query(query, TOP_K)]
+                latencies.append((time.perf_counter() - start) * 1000)
+                recalls.append(len(set(found) & set(truth)) / TOP_K)
+            print(
+                f"{name:<16} disk={directory_size(directory):6.1f} MiB  open={open_ms:7.1f} ms  "
+                f"heap={heap_kib / 1024:6.1f} MiB  p50={statistics.median(latencies):6.2f} ms  "
+                f"recall@{TOP_K}={statistics.mean(recalls):.4f}"
+            )
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: summarizer prompt size and latency with and without MMR re-ranking,
+on a fixed fixture set of near-duplicate FAS chunks.
+Run with: python src/tests/bench_mmr_summarizer.py [--live]
+
+Without --live the summarizer's LLM call is replaced by a recorder so only the
+prompt is measured; with --live (needs OPENAI_API_KEY) the real call is timed.
+"""
+
+import sys
+import os
+import time
+import statistics
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever
+from src.agents.summarizer_fas import RetrievalSummarizer
+
+DIMENSION = 256
+TOP_N = 8
+SECTIONS = 12
+# Chunks per section that are near-duplicates of one another (repeated clauses, overlaps)
+COPIES = 4
+QUERIES = 20
+
+
+def build_fixture(rng):
+    """Build an index where every section appears as several almost identical chunks."""
+    index = LocalVectorIndex(dimension=DIMENSION)
+    records = []
+    for section in range(SECTIONS):
+        base = rng.standard_normal(DIMENSION).astype(np.float32)
+        text = f"Section {section}: " + "The institution shall recognise the deferred profit over the period. " * 20
+        for copy in range(COPIES):
+            chunk_index = section * COPIES + copy
+            records.append({
+                "id": f"FAS_28#{chunk_index}",
+                "values": (base + 0.05 * rng.standard_normal(DIMENSION)).tolist(),
+                "metadata": {
+                    "text": text,
+                    "document_type": "FAS_28_Murabaha_Deferred_Payment_Sales",
+                    "section_heading": f"Section {section}",
+                    "chunk_index": chunk_index,
+                    "total_chunks": SECTIONS * COPIES
+                }
+            })
+    index.upsert(records)
+    queries = [
+        np.mean([records[s * COPIES]["values"] for s in rng.choice(SECTIONS, 3, replace=False)], axis=0).tolist()
+        for _ in range(QUERIES)
+    ]
+    return index, queries
+
+
+class PromptRecorder:
+    """Stands in for the LLM gateway and records the prompts it is sent."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def chat_completion(self, model, messages, **kwargs):
+        self.prompts.append("".join(message["content"] for message in messages))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="summary"))])
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English text)."""
+    return len(text) // 4
+
+
+def run(retriever, summarizer, queries, diversify):
+    """Summarize every query's results and return prompt tokens, chunk counts, distinct sections and latencies."""
+    tokens, chunks, sections, latencies = [], [], [], []
+    for vector in queries:
+        documents = retriever.retrieve("fixture", top_n=TOP_N, query_vector=vector, diversify=diversify)
+        start = time.perf_counter()
+        with patch("builtins.print"):
+            summarizer._summarize_fas_findings(documents)
+        latencies.append((time.perf_counter() - start) * 1000)
+        chunks.append(len(documents))
+        sections.append(len({doc.section_heading for doc in documents}))
+        if isinstance(summarizer.client, PromptRecorder):
+            tokens.append(estimate_tokens(summarizer.client.prompts[-1]))
+    return tokens, chunks, sections, latencies
+
+
+def main():
+    """Compare plain top-k against MMR re-ranking on the same fixtures."""
+    live = "--live" in sys.argv
+    index, queries = build_fixture(np.random.default_rng(0))
+    with patch("src.agents.base_retriever.settings.RETRIEVAL_CACHE_ENABLED", False):
+        retriever = FASRetriever(backend=index)
+    if live:
+        summarizer = RetrievalSummarizer()
+    else:
+        summarizer = RetrievalSummarizer.__new__(RetrievalSummarizer)
+        summarizer.client = PromptRecorder()
+
+    print(f"\n=== Summarizer input, top_n={TOP_N}, {QUERIES} queries ===")
+    for name, diversify in (("plain top-k", False), ("MMR", True)):
+        tokens, chunks, sections, latencies = run(retriever, summarizer, queries, diversify)
+        token_note = f"prompt_tokens~{statistics.mean(tokens):7.0f}  " if tokens else ""
+        print(
+            f"{name:<12} {token_note}chunks={statistics.mean(chunks):4.1f}  distinct_sections={statistics.mean(sections):4.1f}  "
+            f"summarizer_p50={statistics.median(latencies):8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: filtered vs. unfiltered search latency of the LocalVectorIndex as the corpus grows,
+with document-type partitions and without them (flat scan plus metadata mask).
+Run with: OMP_NUM_THREADS=1 OPENBLAS_NUM_THREADS=1 python src/tests/bench_partitioned_index.py
+"""
+
+import sys
+import os
+import time
+import statistics
+
+# Keep BLAS on a single core unless the caller already chose otherwise
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever
+
+DIMENSION = 1536
+CORPUS_SIZES = [1000, 4000, 16000, 32000]
+# The FAS and SS standards plus client rulebooks, each chunked into sections
+DOCUMENT_TYPES = [f"FAS_{n}" for n in range(1, 41)]
+SECTIONS = 25
+QUERIES = 100
+CASES = {
+    "unfiltered": None,
+    "$eq document_type": FASRetriever._build_filter("FAS_4"),
+    "$in 3 document_types": FASRetriever._build_filter(["FAS_10", "FAS_28", "FAS_32"]),
+    "$eq + section": FASRetriever._build_filter("FAS_28", "Section 3"),
+}
+
+
+def build_records(rng, size):
+    """Synthetic chunks spread over the document types and their sections."""
+    vectors = rng.standard_normal((size, DIMENSION)).astype(np.float32)
+    return [
+        {"id": f"chunk-{i}", "values": vectors[i], "metadata": {
+            "text": f"chunk {i}",
+            "document_type": DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)],
+            "section_heading": f"Section {(i // len(DOCUMENT_TYPES)) % SECTIONS}"}}
+        for i in range(size)
+    ]
+
+
+def p50(index, queries, filter):
+    """Median latency in milliseconds, after one warm-up query."""
+    index.query(queries[0], top_k=5, filter=filter)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.query(query, top_k=5, filter=filter)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    """Print p50 latency per corpus size for each filter, flat vs. partitioned."""
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((QUERIES, DIMENSION)).astype(np.float32)
+
+    print(f"\n=== LocalVectorIndex p50 latency (ms), {DIMENSION} dims, {len(DOCUMENT_TYPES)} document types, top_k=5 ===")
+    print(f"{'chunks':>7}  {'case':<22} {'flat':>8} {'partitioned':>12} {'speedup':>8}")
+    for size in CORPUS_SIZES:
+        records = build_records(rng, size)
+        flat = LocalVectorIndex(dimension=DIMENSION, partition_field="")
+        partitioned = LocalVectorIndex(dimension=DIMENSION)
+        flat.upsert(records)
+        partitioned.upsert(records)
+        for name, filter in CASES.items():
+            flat_ms, partitioned_ms = p50(flat, queries, filter), p50(partitioned, queries, filter)
+            print(f"{size:>7}  {name:<22} {flat_ms:8.3f} {partitioned_ms:12.3f} {flat_ms / partitioned_ms:7.1f}x")
+        del records, flat, partitioned
+
+
+if __name__ == "__main__":
+    main()
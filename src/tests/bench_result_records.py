@@ -0,0 +1,91 @@
+"""
+Benchmark: memory and allocations of formatting a top_k=50 result set,
+per-hit Pydantic documents vs. slotted hit records.
+Run with: python src/tests/bench_result_records.py
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.agents.fas_retriever import FASDocument, FASHit
+
+TOP_K = 50
+ROUNDS = 200
+
+
+def make_matches():
+    """Build index matches with realistic chunk sizes (~1,500 characters of text)."""
+    return [
+        {
+            "id": f"FAS_28#{i}",
+            "score": 1.0 - i / 100,
+            "metadata": {
+                "text": f"Clause {i}. " + "The seller shall disclose the cost and the profit margin. " * 26,
+                "document_type": "FAS_28_Murabaha_Deferred_Payment_Sales",
+                "section_heading": f"Section {i % 7}",
+                "source_filename": "FAS_28.pdf",
+                "chunk_index": float(i),
+                "total_chunks": 120.0,
+            },
+        }
+        for i in range(TOP_K)
+    ]
+
+
+def format_as_documents(matches):
+    """The previous formatting: one validated Pydantic model per hit."""
+    return [
+        FASDocument(
+            id=match.get('id', ''),
+            text=match['metadata'].get('text', ''),
+            relevance_score=match.get('score', 0.0),
+            document_type=match['metadata'].get('document_type', ''),
+            section_heading=match['metadata'].get('section_heading', ''),
+            source_filename=match['metadata'].get('source_filename', ''),
+            chunk_index=match['metadata'].get('chunk_index', 0),
+            total_chunks=match['metadata'].get('total_chunks', 0),
+            metadata=match['metadata']
+        )
+        for match in matches
+    ]
+
+
+def format_as_hits(matches):
+    """The current formatting: slotted records sharing the match metadata."""
+    return [FASHit(match['id'], match['score'], match['metadata']) for match in matches]
+
+
+def measure(name, formatter, matches):
+    """Print retained memory, allocation count and time for one formatter."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = formatter(matches)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    retained = sum(stat.size_diff for stat in stats)
+    allocations = sum(stat.count_diff for stat in stats)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        formatter(matches)
+    elapsed = (time.perf_counter() - start) / ROUNDS * 1000
+    print(f"{name:<20} retained={retained / 1024:8.1f} KiB  blocks={allocations:6d}  time={elapsed:.3f} ms")
+    return result
+
+
+def main():
+    """Compare both formatters on the same matches."""
+    matches = make_matches()
+    print(f"\n=== Formatting a top_k={TOP_K} result set ===")
+    measure("pydantic documents", format_as_documents, matches)
+    measure("slotted hits", format_as_hits, matches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark: hit rate of the semantic compliance cache on the clauses of data/regulations.json,
+re-submitted the way other banks' rulebooks reuse them (reflowed whitespace, minor rewording),
+and wrong reuses on clauses whose meaning was flipped (negated obligation, changed figure).
+Run with: python src/tests/bench_semantic_compliance_cache.py [--live] [--no-guard]
+
+Without --live clauses are embedded with a hashed bag of words and bigrams; with --live
+(needs OPENAI_API_KEY) the configured embedding model is used. Only --live figures say
+anything about a threshold: a dense model scores both rewordings and flipped clauses
+differently from the hashed stand-in. --no-guard skips the polarity_signature check to
+show how far the embeddings alone separate flipped clauses.
+No LLM calls are made: every miss stands for one gpt-4.1-mini call.
+"""
+
+import sys
+import os
+import json
+import re
+import zlib
+from unittest.mock import Mock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+from src.core.config import PROJECT_ROOT
+from src.core.semantic_cache import SemanticCache
+
+THRESHOLDS = (0.90, 0.93, 0.95, 0.97, 0.99)
+SS_SUMMARY = "AAOIFI Shariah Standards: prohibition of riba, gharar and maysir; asset-backed financing."
+# Wording differences seen between banks' versions of the same policy clause
+REWORDINGS = [
+    ("must", "shall"), ("banks", "institutions"), ("Banks", "Institutions"), ("ensure", "make sure"),
+    ("are expected to", "should"), ("including", "such as"), ("The bank", "The Bank"), ("e.g.", "for example")
+]
+# Edits that keep almost every word but change what the clause requires
+FLIPS = [
+    (r"(\d+(?:\.\d+)?)%", lambda m: f"{float(m.group(1)) * 2:g}%"),
+    (r"\b(shall|must|may|should)\b(?! not)", r"\1 not"),
+    (r"\bprohibited\b", "permitted"), (r"\bpermitted\b", "prohibited"),
+    (r"\b(\d+)\b", lambda m: str(int(m.group(1)) + 1)),
+]
+
+
+def load_clauses():
+    """Every sentence of every External Regulation and Internal Rulebook section."""
+    with open(os.path.join(PROJECT_ROOT, "data", "regulations.json"), encoding="utf-8") as f:
+        regulations = json.load(f)
+    clauses = []
+    for entry in regulations:
+        for sections in entry.values():
+            for section in sections:
+                for content in section.values():
+                    clauses.extend(s.strip() for s in re.split(r"(?<=\.)\s+", content) if len(s.split()) >= 6)
+    return list(dict.fromkeys(clauses))
+
+
+def reflow(clause):
+    """Bank B: same clause with different line breaks and spacing."""
+    words = clause.split()
+    return "\n".join(" ".join(words[i:i + 7]) for i in range(0, len(words), 7)) + "  "
+
+
+def reword(clause):
+    """Bank C: same clause with minor wording changes."""
+    for old, new in REWORDINGS:
+        clause = clause.replace(old, new)
+    return clause
+
+
+def flip(clause):
+    """Bank D: same wording with the obligation negated or a figure changed, so the verdict may differ."""
+    for pattern, replacement in FLIPS:
+        flipped = re.sub(pattern, replacement, clause, count=1)
+        if flipped != clause:
+            return flipped
+    return clause
+
+
+def hashed_embedding(text, dimension=2048):
+    """Offline stand-in for the embedding model: hashed word and bigram counts."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    vector = np.zeros(dimension, dtype=np.float32)
+    for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        vector[zlib.crc32(feature.encode("utf-8")) % dimension] += 1.0
+    return vector.tolist()
+
+
+def banks(clauses):
+    """(bank, [(source clause, submitted text)]); bank C only has the clauses its rewording changed."""
+    return [
+        ("A original", [(c, c) for c in clauses]),
+        ("B reflowed", [(c, reflow(c)) for c in clauses]),
+        ("C reworded", [(c, reword(c)) for c in clauses if reword(c) != c]),
+        ("D flipped", [(c, flip(c)) for c in clauses if flip(c) != c]),
+    ]
+
+
+def run(clauses, threshold, embed, guard=True):
+    """
+    Check bank A's clauses, then the other banks' variants; return (checked, hits, wrong hits) per bank.
+
+    A hit on bank D is always wrong: the cached verdict is for a clause that means something else.
+    """
+    service = Mock()
+    service.embed.side_effect = embed
+    cache = SemanticCache(threshold=threshold, max_entries=10000, embedding_service=service)
+    results = {}
+    for bank, submissions in banks(clauses):
+        hits = wrong = 0
+        for clause, text in submissions:
+            vector = cache.vector(text)
+            match = cache.match(vector, SS_SUMMARY, text=text if guard else None)
+            if match is None:
+                cache.add(vector, text, SS_SUMMARY, {"source": clause})
+                continue
+            hits += 1
+            wrong += bank.startswith("D") or match.payload["source"] != clause
+        results[bank] = (len(submissions), hits, wrong)
+    return results
+
+
+def main():
+    """Sweep the similarity threshold and report hit rate and wrong reuses per bank."""
+    live = "--live" in sys.argv
+    guard = "--no-guard" not in sys.argv
+    clauses = load_clauses()
+    if live:
+        from src.core.embedding_cache import normalize_text
+        from src.core.embeddings import get_embedding_service
+        # Embed every distinct text once up front so the sweep does not repeat API calls
+        texts = list(dict.fromkeys(normalize_text(text) for _, submissions in banks(clauses) for _, text in submissions))
+        vectors = dict(zip(texts, get_embedding_service().embed_many(texts)))
+        embed = vectors.__getitem__
+    else:
+        embed = hashed_embedding
+
+    print(f"\n=== Semantic compliance cache, {len(clauses)} clauses, "
+          f"{'live' if live else 'hashed'} embeddings, polarity guard {'on' if guard else 'off'} ===")
+    for threshold in THRESHOLDS:
+        results = run(clauses, threshold, embed, guard)
+        checked = sum(n for n, _, _ in results.values())
+        hits = sum(h for _, h, _ in results.values())
+        wrong = sum(w for _, _, w in results.values())
+        per_bank = "  ".join(f"{bank}={h / n:6.1%} of {n:2d}" for bank, (n, h, _) in results.items())
+        print(f"threshold={threshold:.2f}  {per_bank}  llm_calls={checked - hits:3d}/{checked}  wrong_reuses={wrong}")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,9 +62,9 @@ MOCK_ANALYSIS_RESPONSE = {
 @pytest.fixture
 def risk_agent():
     """Fixture to create a RiskAnalysisAgent instance."""
-    with patch('openai.OpenAI') as mock_openai:
-        agent = RiskAnalysisAgent()
-        yield agent
+    agent = RiskAnalysisAgent()
+    agent.client = Mock()
+    yield agent
 
 @pytest.fixture
 def mock_openai_response():
@@ -106,7 +106,7 @@ def test_format_user_message(risk_agent):
 def test_analyze_risk_success(risk_agent, mock_openai_response):
     """Test successful risk analysis."""
     # Setup mock
-    risk_agent.client.chat.completions.create.return_value = mock_openai_response
+    risk_agent.client.chat_completion.return_value = mock_openai_response
     
     input_data = RiskAnalysisInput(
         product_description=SAMPLE_PRODUCT_DESCRIPTION,
@@ -132,7 +132,7 @@ def test_analyze_risk_success(risk_agent, mock_openai_response):
 def test_analyze_risk_error(risk_agent):
     """Test error handling in risk analysis."""
     # Setup mock to raise an exception
-    risk_agent.client.chat.completions.create.side_effect = Exception("API Error")
+    risk_agent.client.chat_completion.side_effect = Exception("API Error")
     
     input_data = RiskAnalysisInput(
         product_description=SAMPLE_PRODUCT_DESCRIPTION,
@@ -143,7 +143,8 @@ def test_analyze_risk_error(risk_agent):
     with pytest.raises(Exception) as exc_info:
         risk_agent.analyze_risk(input_data)
     
-    assert "Error during risk analysis" in str(exc_info.value)
+    # The agent logs the failure and re-raises the original error
+    assert str(exc_info.value) == "API Error"
 
 def test_get_available_standards(risk_agent):
     """Test the get_available_standards method."""
@@ -0,0 +1,141 @@
+"""
+Test suite for the asyncio variants of the analysis agents and the PropagatorAgent.
+"""
+
+import sys
+import os
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.agents.ambiguity_agent import AmbiguityDetectionAgent, AmbiguityAnalysisInput
+from src.agents.gap_agent import GapDetectionAgent, GapAnalysisInput
+from src.agents.conflict_agent import ConflictDetectionAgent, ConflictAnalysisInput
+from src.agents.risk_agent import RiskAnalysisAgent, RiskAnalysisInput
+from src.agents.shariah_compliance_agent import ShariahComplianceAgent, ComplianceInput
+from src.agents.update_advisor_agent import UpdateAdvisorAgent, UpdateInput
+from src.orchestators.update_revision.compliance_scanner_agent import ComplianceScannerAgent, ProblematicField
+from src.orchestators.update_revision.propagator_agent import PropagatorAgent
+
+RULE = "The bank charges a fixed late payment fee credited to its income."
+
+ANSWERS = {
+    "ambiguity": {"ambiguous": True, "ambiguous_elements": []},
+    "gap": {"has_gaps": False, "missing_elements": []},
+    "conflict": {"conflict": True, "conflicting_elements": [], "justification": "Riba", "references": ["SS 3"]},
+    "risk": {"risks": [], "summary": "Low risk", "fas_compliance_status": "Compliant", "recommendations": []},
+    "compliance": {"compliance_status": "non_compliant", "justification": "Penalty kept as income",
+                   "referenced_clauses": ["SS 3/2/1"]},
+    "update": {"proposed_update": "Late fees go to charity.", "rationale": "SS 3"},
+}
+
+
+def completion(payload):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))])
+
+
+def async_client(payload):
+    """A gateway stand-in whose achat_completion returns payload."""
+    client = Mock()
+    client.achat_completion = AsyncMock(return_value=completion(payload))
+    return client
+
+
+CASES = [
+    (AmbiguityDetectionAgent, "analyze_ambiguity", AmbiguityAnalysisInput(rule_text=RULE, fas_summary="", ss_summary=""), "ambiguity"),
+    (GapDetectionAgent, "analyze_gaps", GapAnalysisInput(rule_text=RULE, fas_summary="", ss_summary=""), "gap"),
+    (ConflictDetectionAgent, "analyze_conflict", ConflictAnalysisInput(rule_text=RULE, fas_summary="", ss_summary=""), "conflict"),
+    (RiskAnalysisAgent, "analyze_risk", RiskAnalysisInput(product_description=RULE, standard=""), "risk"),
+    (ShariahComplianceAgent, "check_compliance", ComplianceInput(rule_text=RULE, ss_summary=""), "compliance"),
+    (UpdateAdvisorAgent, "propose_update",
+     UpdateInput(non_compliant_text=RULE, issue_summary="", context_type="", ss_documents=[]), "update"),
+]
+
+
+@pytest.mark.parametrize("agent_class, method, input_data, answer", CASES)
+def test_async_variant_matches_sync(agent_class, method, input_data, answer):
+    """Test that each async variant sends the same request and returns the same result model."""
+    agent = agent_class()
+    agent.client = async_client(ANSWERS[answer])
+    agent.client.chat_completion = Mock(return_value=completion(ANSWERS[answer]))
+
+    async_result = asyncio.run(getattr(agent, "a" + method)(input_data))
+    sync_result = getattr(agent, method)(input_data)
+
+    assert async_result == sync_result
+    assert agent.client.achat_completion.call_args == agent.client.chat_completion.call_args
+
+
+def test_async_variant_raises_gateway_errors():
+    """Test that gateway failures propagate from the async variant."""
+    agent = GapDetectionAgent()
+    agent.client = Mock()
+    agent.client.achat_completion = AsyncMock(side_effect=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(agent.aanalyze_gaps(GapAnalysisInput(rule_text=RULE, fas_summary="", ss_summary="")))
+
+
+def test_propagator_runs_all_fields_concurrently():
+    """Test that every agent call for every field is in flight at once and reports keep field order."""
+    fields = [
+        ProblematicField(location=f"Internal Rulebook > Section {i}", text=RULE,
+                         compliance_status="non_compliant", justification="", referenced_clauses=[])
+        for i in range(3)
+    ]
+    expected_calls = 4 * len(fields)
+
+    async def run():
+        propagator = PropagatorAgent()
+        started, all_started = [0], asyncio.Event()
+
+        def agent_client(payload):
+            async def achat_completion(**request):
+                started[0] += 1
+                if started[0] == expected_calls:
+                    all_started.set()
+                # Each call only completes once all of them have started
+                await asyncio.wait_for(all_started.wait(), timeout=1)
+                return completion(payload)
+            client = Mock()
+            client.achat_completion = achat_completion
+            return client
+
+        propagator.ambiguity_agent.client = agent_client(ANSWERS["ambiguity"])
+        propagator.gap_agent.client = agent_client(ANSWERS["gap"])
+        propagator.conflict_agent.client = agent_client(ANSWERS["conflict"])
+        propagator.risk_agent.client = agent_client(ANSWERS["risk"])
+        return await propagator.propagate(fields)
+
+    result = asyncio.run(run())
+
+    assert list(result.field_reports) == [field.location for field in fields]
+    for reports in result.field_reports.values():
+        assert [report.agent_name for report in reports] == [
+            "Ambiguity Detection Agent", "Gap Detection Agent", "Conflict Detection Agent", "Risk Analysis Agent"
+        ]
+        assert [report.severity for report in reports] == ["high", "low", "high", "low"]
+
+
+def test_ascan_draft_keeps_draft_order():
+    """Test that the async scan reports non-compliant sections in draft order."""
+    scanner = ComplianceScannerAgent()
+    verdicts = {"A": "compliant", "B": "non_compliant", "C": "partially_compliant"}
+
+    async def acheck_compliance(input_data):
+        return SimpleNamespace(compliance_status=verdicts[input_data.rule_text],
+                               justification="", referenced_clauses=[])
+
+    scanner.compliance_agent.acheck_compliance = acheck_compliance
+    draft = [{"External Regulation": [{"One": "A"}, {"Two": "B"}], "Internal Rulebook": [{"Three": "C"}]}]
+
+    result = asyncio.run(scanner.ascan_draft(draft))
+
+    assert [field.location for field in result.problematic_fields] == [
+        "External Regulation > Two", "Internal Rulebook > Three"
+    ]
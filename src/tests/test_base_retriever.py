@@ -0,0 +1,161 @@
+"""
+Test suite for the shared BaseRetriever features, run against the local index backend.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core.vector_index import LocalVectorIndex
+from src.agents.ss_retiever import SSRetriever
+
+# Each query text maps onto one axis of a tiny 3-d embedding space
+QUERY_VECTORS = {
+    "murabahah": [1.0, 0.0, 0.0],
+    "ijarah": [0.0, 1.0, 0.0],
+    "musharakah": [0.0, 0.0, 1.0],
+}
+
+
+def fake_embed_many(queries):
+    """Embed queries with the fixed vectors above."""
+    return [QUERY_VECTORS[query] for query in queries]
+
+
+@pytest.fixture
+def backend():
+    """Fixture to create a small local SS index."""
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": "ss8#0", "values": [1.0, 0.1, 0.0], "metadata": {
+            "text": "Murabahah to the purchase orderer", "document_type": "SS_8_Murabahah",
+            "section_heading": "Procedures", "chunk_index": 0, "total_chunks": 1}},
+        {"id": "ss9#0", "values": [0.0, 1.0, 0.1], "metadata": {
+            "text": "Ijarah Muntahia Bittamleek", "document_type": "SS_9_Ijarah_Ijarah_Muntahia_Bittamleek",
+            "section_heading": "Ownership", "chunk_index": 0, "total_chunks": 1}},
+        {"id": "ss12#0", "values": [0.1, 0.0, 1.0], "metadata": {
+            "text": "Musharakah partners", "document_type": "SS_12_Musharakah",
+            "section_heading": "Profit", "chunk_index": 0, "total_chunks": 1}},
+    ])
+    return index
+
+
+@pytest.fixture
+def retriever(backend):
+    """Fixture to create an SSRetriever on the local backend."""
+    return SSRetriever(backend=backend)
+
+
+def test_retrieve_many_keeps_input_order(retriever):
+    """Test that retrieve_many embeds once and returns results in query order."""
+    queries = ["musharakah", "murabahah", "ijarah", "murabahah"]
+    with patch.object(SSRetriever, "embed_queries", side_effect=fake_embed_many) as embed:
+        results = retriever.retrieve_many(queries, top_n=1)
+
+    assert embed.call_count == 1
+    assert [docs[0].id for docs in results] == ["ss12#0", "ss8#0", "ss9#0", "ss8#0"]
+
+
+def test_retrieve_many_applies_filters(retriever):
+    """Test that filters apply to every query in the batch."""
+    with patch.object(SSRetriever, "embed_queries", side_effect=fake_embed_many):
+        results = retriever.retrieve_many(["murabahah", "ijarah"], top_n=3, document_types="SS_12_Musharakah")
+
+    assert [[doc.id for doc in docs] for docs in results] == [["ss12#0"], ["ss12#0"]]
+
+
+def test_retrieve_many_empty(retriever):
+    """Test that no queries means no embedding call."""
+    with patch.object(SSRetriever, "embed_queries") as embed:
+        assert retriever.retrieve_many([]) == []
+    embed.assert_not_called()
+
+
+def test_retrieve_serves_repeated_queries_from_cache(retriever):
+    """Test that an identical retrieve() call skips embedding and index query."""
+    with patch.object(SSRetriever, "embed_query", return_value=[1.0, 0.0, 0.0]) as embed:
+        first = retriever.retrieve("murabahah", top_n=2, document_types=["SS_8_Murabahah"])
+        second = retriever.retrieve("murabahah", top_n=2, document_types=["SS_8_Murabahah"])
+        retriever.retrieve("murabahah", top_n=1, document_types=["SS_8_Murabahah"])
+
+    assert [doc.id for doc in first] == [doc.id for doc in second]
+    assert embed.call_count == 2
+    stats = retriever.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_cache_invalidated_when_index_repopulated(retriever, backend):
+    """Test that an upsert changes the version stamp and drops cached results."""
+    with patch.object(SSRetriever, "embed_query", return_value=[1.0, 0.0, 0.0]) as embed:
+        retriever.retrieve("murabahah", top_n=1)
+        backend.upsert([{"id": "ss8#1", "values": [1.0, 0.0, 0.0], "metadata": {"text": "new"}}])
+        results = retriever.retrieve("murabahah", top_n=1)
+
+    assert embed.call_count == 2
+    assert results[0].id == "ss8#1"
+    assert retriever.cache_stats()["invalidations"] == 1
+
+
+def test_retrieve_many_uses_cache_per_query(retriever):
+    """Test that retrieve_many only embeds the queries that missed the cache."""
+    with patch.object(SSRetriever, "embed_queries", side_effect=fake_embed_many) as embed:
+        retriever.retrieve_many(["murabahah", "ijarah"], top_n=1)
+        results = retriever.retrieve_many(["ijarah", "musharakah"], top_n=1)
+
+    assert embed.call_args_list[1].args[0] == ["musharakah"]
+    assert [docs[0].id for docs in results] == ["ss9#0", "ss12#0"]
+
+
+def test_construction_does_not_wait_for_index(backend):
+    """Test that the index connection and stats probe happen off the constructor."""
+    import threading
+    from src.agents import base_retriever
+
+    connected = threading.Event()
+
+    def slow_backend(index_name):
+        connected.wait(timeout=5)
+        return backend
+
+    with patch.object(base_retriever, "create_index_backend", side_effect=slow_backend):
+        retriever = SSRetriever()
+        assert retriever.index_status()["connected"] is False
+
+        connected.set()
+        retriever._stats_probe.join(timeout=5)
+
+    assert retriever.index_stats()["total_vector_count"] == 3
+    assert retriever.index_status()["vector_count"] == 3
+
+
+def test_retrieve_across_namespaces(backend):
+    """Test fan-out over namespaces with one embedding and a global merge."""
+    backend.upsert([
+        {"id": "ss8#9", "values": [0.9, 0.0, 0.5], "metadata": {"text": "Murabahah annex", "document_type": "SS_8_Murabahah"}},
+    ], namespace="annex")
+    retriever = SSRetriever(backend=backend)
+
+    with patch.object(SSRetriever, "embed_query", return_value=[1.0, 0.0, 0.0]) as embed:
+        results = retriever.retrieve_across_namespaces("murabahah", ["default", "annex", "empty"], top_n=2)
+
+    assert embed.call_count == 1
+    assert list(results.results_by_namespace) == ["default", "annex", "empty"]
+    assert results.results_by_namespace["empty"] == []
+    assert [doc.id for doc in results.results_by_namespace["annex"]] == ["ss8#9"]
+    assert [doc.id for doc in results.merged] == ["ss8#0", "ss8#9"]
+
+
+def test_retrieve_across_all_namespaces_by_default(backend):
+    """Test that namespaces default to those in the index stats."""
+    backend.upsert([{"id": "x", "values": [1.0, 0.0, 0.0], "metadata": {"text": "x"}}], namespace="annex")
+    retriever = SSRetriever(backend=backend)
+    retriever._stats_probe.join(timeout=5)
+
+    with patch.object(SSRetriever, "embed_query", return_value=[1.0, 0.0, 0.0]):
+        results = retriever.retrieve_across_namespaces("murabahah", top_n=1)
+
+    assert set(results.results_by_namespace) == {"default", "annex"}
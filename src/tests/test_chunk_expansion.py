@@ -0,0 +1,121 @@
+"""
+Test suite for neighbouring-chunk expansion of retrieval hits.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core.chunk_expansion import ChunkExpander, chunk_id_width, neighbour_chunk_id, stitch_chunks
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever, FASHit
+from src.ingestion import split_text
+
+TOTAL_CHUNKS = 10
+
+
+@pytest.fixture
+def backend():
+    """Fixture to create a local FAS index holding one ten-chunk document."""
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": f"fas28#{i}", "values": [1.0, float(i), 0.0], "metadata": {
+            "text": f"clause {i}", "document_type": "FAS_28_Murabaha_Deferred_Payment_Sales",
+            "section_heading": "Scope", "chunk_index": i, "total_chunks": TOTAL_CHUNKS}}
+        for i in range(TOTAL_CHUNKS)
+    ])
+    return index
+
+
+@pytest.fixture
+def retriever(backend):
+    """Fixture to create a FASRetriever on the local backend."""
+    return FASRetriever(backend=backend)
+
+
+def make_hit(index, score):
+    """Build a hit for chunk index of the fixture document."""
+    return FASHit(f"fas28#{index}", score, {
+        "text": f"clause {index}", "document_type": "FAS_28_Murabaha_Deferred_Payment_Sales",
+        "section_heading": "Scope", "chunk_index": index, "total_chunks": TOTAL_CHUNKS})
+
+
+def test_neighbour_chunk_id_keeps_padding():
+    """Test that neighbour ids swap the trailing index and keep zero padding."""
+    assert neighbour_chunk_id("fas28#4", 4, 5) == "fas28#5"
+    assert neighbour_chunk_id("fas28_chunk_009", 9, 10) == "fas28_chunk_010"
+    assert neighbour_chunk_id("fas28#4", 3, 5) is None
+    assert neighbour_chunk_id("summary", 0, 1) is None
+    assert neighbour_chunk_id("fas28_chunk_100", 100, 99, width=3) == "fas28_chunk_099"
+    assert [chunk_id_width(i, n) for i, n in [("c_012", 12), ("c#7", 7), ("c_100", 100)]] == [3, 0, None]
+
+
+def test_expand_finds_padded_neighbours_of_unpadded_looking_id():
+    """Test that a hit on chunk 100 of a zero-padded scheme still finds chunk 099."""
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": f"fas28_chunk_{i:03d}", "values": [1.0, 0.0, 0.0], "metadata": {"text": f"clause {i}"}}
+        for i in (99, 100, 101)
+    ])
+    hit = FASHit("fas28_chunk_100", 0.9, {"text": "clause 100", "chunk_index": 100, "total_chunks": 150})
+
+    expanded = ChunkExpander(overlap=0).expand([hit], 1, index, "default")
+
+    assert expanded[0].text == "clause 99\nclause 100\nclause 101"
+
+
+def test_stitching_drops_chunker_overlap():
+    """Test that expanded text does not repeat the overlap the chunker put between chunks."""
+    text = " ".join(f"Sentence {i} of the Murabaha disclosure section." for i in range(12))
+    chunks = split_text(text, chunk_size=120, overlap=40)
+
+    assert len(chunks) > 2
+    assert " ".join(stitch_chunks(chunks, 40).split()) == text
+    assert stitch_chunks([chunks[0], None, chunks[2]], 40) == f"{chunks[0]}\n{chunks[2]}"
+
+
+def test_expand_merges_overlapping_windows(retriever, backend):
+    """Test that overlapping windows merge into one hit anchored on the best hit, with one fetch."""
+    hits = [make_hit(4, 0.9), make_hit(6, 0.8), make_hit(0, 0.5)]
+    with patch.object(backend, "fetch", wraps=backend.fetch) as fetch:
+        expanded = retriever.expand_hits(hits, 1)
+
+    assert fetch.call_count == 1
+    assert [hit.id for hit in expanded] == ["fas28#4", "fas28#0"]
+    assert expanded[0].text == "\n".join(f"clause {i}" for i in range(3, 8))
+    assert expanded[0].metadata["chunk_range"] == [3, 7]
+    assert expanded[0].metadata["expanded_from"] == ["fas28#4", "fas28#6"]
+    assert expanded[1].metadata["chunk_range"] == [0, 1]
+    assert isinstance(expanded[0], FASHit)
+    assert hits[0].text == "clause 4"
+
+
+def test_expand_serves_repeated_chunks_from_cache(retriever, backend):
+    """Test that a second expansion over the same chunks does not fetch again."""
+    retriever.expand_hits([make_hit(4, 0.9)], 2)
+    with patch.object(backend, "fetch", wraps=backend.fetch) as fetch:
+        expanded = retriever.expand_hits([make_hit(5, 0.9)], 1)
+
+    assert fetch.call_count == 0
+    assert expanded[0].metadata["chunk_range"] == [4, 6]
+
+
+def test_expand_clamps_to_document_bounds(retriever):
+    """Test that windows do not run past the first or last chunk."""
+    expanded = retriever.expand_hits([make_hit(9, 0.7)], 3)
+    assert expanded[0].metadata["chunk_range"] == [6, 9]
+
+
+def test_retrieve_with_expansion(retriever):
+    """Test that retrieve() expands hits when asked and caches expanded results separately."""
+    with patch.object(FASRetriever, "embed_query", return_value=[0.0, 1.0, 0.0]):
+        plain = retriever.retrieve("deferred payment", top_n=1)
+        expanded = retriever.retrieve("deferred payment", top_n=1, expand_neighbors=1)
+
+    assert "chunk_range" not in plain[0].metadata
+    assert expanded[0].id == plain[0].id
+    assert expanded[0].metadata["chunk_range"][1] - expanded[0].metadata["chunk_range"][0] >= 1
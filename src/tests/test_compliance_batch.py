@@ -0,0 +1,156 @@
+"""
+Test suite for batched Shariah compliance checking.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.agents.shariah_compliance_agent import (
+    BATCH_ANSWER_TOKENS_PER_RULE, BATCH_INSTRUCTIONS, ShariahComplianceAgent, ComplianceInput, ComplianceResult
+)
+from src.orchestators.update_revision.compliance_scanner_agent import ComplianceScannerAgent
+
+SS = "SS 3: late payment penalties must be donated to charity."
+
+
+def completion(payload):
+    content = payload if payload is None or isinstance(payload, str) else json.dumps(payload)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def verdict(status, rule_id=None):
+    item = {"compliance_status": status, "justification": f"{status} verdict", "referenced_clauses": ["SS 3"]}
+    return {"id": rule_id, **item} if rule_id else item
+
+
+def batch_answer(request, statuses=None):
+    """Answer every [R<n>] in the request, with statuses overriding the default per id."""
+    ids = re.findall(r"^\[(R\d+)\]$", request["messages"][1]["content"], re.M)
+    return completion({"results": [verdict((statuses or {}).get(i, "compliant"), i) for i in ids]})
+
+
+@pytest.fixture
+def agent():
+    """Fixture for a compliance agent with a mocked gateway and no semantic cache."""
+    agent = ShariahComplianceAgent()
+    agent.semantic_cache = None
+    agent.client = Mock()
+    agent.client.chat_completion.return_value = completion(verdict("partially_compliant"))
+    return agent
+
+
+def rules(count, ss_summary=SS):
+    return [ComplianceInput(rule_text=f"Rule {i}: " + "profit terms " * 20, ss_summary=ss_summary) for i in range(count)]
+
+
+def test_plan_groups_by_summary_and_respects_budget(agent, monkeypatch):
+    """Test that batches never mix SS summaries and close at the token budget or rule cap."""
+    monkeypatch.setattr("src.agents.shariah_compliance_agent.settings.COMPLIANCE_BATCH_MAX_RULES", 4)
+    inputs = rules(6) + rules(2, ss_summary="SS 8: Murabaha")
+
+    batches = agent._plan_batches(inputs, list(range(len(inputs))), max_batch_tokens=100000)
+    assert batches == [[0, 1, 2, 3], [4, 5], [6, 7]]
+
+    # Room for exactly two rules per request
+    overhead = (len(agent.system_prompt) + len(BATCH_INSTRUCTIONS) + len(SS)) // 4
+    per_rule = len(inputs[0].rule_text) // 4 + BATCH_ANSWER_TOKENS_PER_RULE
+    tight = agent._plan_batches(inputs, list(range(6)), max_batch_tokens=overhead + 2 * per_rule)
+    assert tight == [[0, 1], [2, 3], [4, 5]]
+
+
+def test_batch_returns_results_in_order_with_one_request(agent):
+    """Test that several rules are checked in one request and results map back by id."""
+    agent.client.chat_completion.side_effect = lambda **request: batch_answer(request, {"R2": "non_compliant"})
+
+    results = agent.check_compliance_batch(rules(3))
+
+    assert agent.client.chat_completion.call_count == 1
+    request = agent.client.chat_completion.call_args.kwargs
+    assert request["messages"][1]["content"].count(SS) == 1
+    assert [r.compliance_status for r in results] == ["compliant", "non_compliant", "compliant"]
+    assert all(isinstance(r, ComplianceResult) for r in results)
+
+
+def test_invalid_sub_results_retried_individually(agent):
+    """Test that a missing or invalid rule in the batch answer is re-checked on its own."""
+    answers = [
+        completion({"results": [verdict("compliant", "R1"), verdict("maybe", "R2")]}),  # R2 invalid, R3 missing
+        completion(verdict("non_compliant")),
+        completion(verdict("partially_compliant")),
+    ]
+    agent.client.chat_completion.side_effect = answers
+
+    results = agent.check_compliance_batch(rules(3))
+
+    assert [r.compliance_status for r in results] == ["compliant", "non_compliant", "partially_compliant"]
+    assert agent.client.chat_completion.call_count == 3
+    retried = agent.client.chat_completion.call_args.kwargs["messages"][1]["content"]
+    assert "[R" not in retried and "Rule 2:" in retried
+
+
+def test_unparsable_batch_answer_falls_back(agent):
+    """Test that a batch answer that is not JSON sends every rule individually."""
+    agent.client.chat_completion.side_effect = [completion("not json")] + [completion(verdict("compliant"))] * 2
+
+    results = agent.check_compliance_batch(rules(2))
+
+    assert [r.compliance_status for r in results] == ["compliant", "compliant"]
+    assert agent.client.chat_completion.call_count == 3
+
+
+@pytest.mark.parametrize("payload, individual", [
+    (None, 3),  # content=None, e.g. a refusal
+    ({"results": [verdict("compliant", "R1")]}, 2),  # short array
+    ({"results": 7}, 3),
+    ([verdict("compliant", "R1")], 3),
+])
+def test_malformed_batch_answer_falls_back_per_rule(agent, payload, individual):
+    """Test that rules a malformed batch answer does not cover are checked individually."""
+    agent.client.chat_completion.side_effect = [completion(payload)] + [completion(verdict("non_compliant"))] * individual
+
+    results = agent.check_compliance_batch(rules(3))
+
+    assert agent.client.chat_completion.call_count == 1 + individual
+    assert [r.compliance_status for r in results][-individual:] == ["non_compliant"] * individual
+    assert all(isinstance(r, ComplianceResult) for r in results)
+
+
+def test_async_batch(agent):
+    """Test that acheck_compliance_batch sends batches concurrently and keeps input order."""
+    inputs = rules(2) + rules(2, ss_summary="SS 8: Murabaha")
+
+    async def achat_completion(**request):
+        statuses = {"R1": "non_compliant"} if "Murabaha" in request["messages"][1]["content"] else {}
+        return batch_answer(request, statuses)
+
+    agent.client.achat_completion = AsyncMock(side_effect=achat_completion)
+
+    results = asyncio.run(agent.acheck_compliance_batch(inputs))
+
+    assert agent.client.achat_completion.call_count == 2
+    assert [r.compliance_status for r in results] == ["compliant", "compliant", "non_compliant", "compliant"]
+
+
+def test_scanner_opts_into_batches():
+    """Test that a batching scanner checks the whole draft through check_compliance_batch."""
+    scanner = ComplianceScannerAgent(batch=True)
+    scanner.compliance_agent = Mock()
+    scanner.compliance_agent.check_compliance_batch.return_value = [
+        ComplianceResult(**verdict("compliant")), ComplianceResult(**verdict("non_compliant"))
+    ]
+    draft = [{"External Regulation": [{"One": "A"}], "Internal Rulebook": [{"Two": "B"}]}]
+
+    result = scanner.scan_draft(draft)
+
+    scanner.compliance_agent.check_compliance.assert_not_called()
+    assert [i.rule_text for i in scanner.compliance_agent.check_compliance_batch.call_args.args[0]] == ["A", "B"]
+    assert [field.location for field in result.problematic_fields] == ["Internal Rulebook > Two"]
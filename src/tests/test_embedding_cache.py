@@ -0,0 +1,80 @@
+"""
+Test suite for the persistent EmbeddingCache.
+"""
+
+import sys
+import os
+import time
+from unittest.mock import Mock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+import pytest
+from src.core.embedding_cache import EmbeddingCache, embedding_key
+from src.core.embeddings import EmbeddingService
+
+
+def make_response(texts):
+    """Build a mock embeddings response."""
+    return Mock(data=[Mock(index=i, embedding=[float(len(text)), 0.5]) for i, text in enumerate(texts)])
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Fixture for a temporary cache file."""
+    return str(tmp_path / "embeddings.sqlite")
+
+
+def test_key_normalizes_whitespace():
+    """Test that whitespace variants share one key while models do not."""
+    assert embedding_key("m", "Late  payment\n fees ") == embedding_key("m", "Late payment fees")
+    assert embedding_key("m", "Late payment fees") != embedding_key("other", "Late payment fees")
+
+
+def test_warm_start_after_reopen(cache_path):
+    """Test that entries survive a restart and the most recent ones are loaded on first lookup."""
+    cache = EmbeddingCache(path=cache_path, max_entries=10, memory_entries=10)
+    for key, vector in (("k1", [0.25, 0.5]), ("k2", [1.0, 2.0]), ("k3", [3.0, 4.0])):
+        cache.set_many({key: vector})
+        time.sleep(0.01)
+    cache.close()
+
+    reopened = EmbeddingCache(path=cache_path, max_entries=10, memory_entries=10, warm_entries=2)
+    assert len(reopened._memory) == 0
+
+    assert reopened.get_many(["absent"]) == {}
+    assert set(reopened._memory) == {"k2", "k3"}
+    assert reopened.get_many(["k1"]) == {"k1": [0.25, 0.5]}
+    assert isinstance(reopened._memory["k2"], np.ndarray)
+    assert reopened._memory["k2"].dtype == np.float32
+
+
+def test_lru_eviction(cache_path):
+    """Test that the least recently used entry is evicted from disk."""
+    cache = EmbeddingCache(path=cache_path, max_entries=2, memory_entries=1)
+    cache.set_many({"old": [1.0]})
+    cache.set_many({"mid": [2.0]})
+    cache.get_many(["old"])
+    cache.store.flush()
+    cache.set_many({"new": [3.0]})
+
+    assert len(cache.store) == 2
+    assert cache.store.get("mid") is None
+    assert cache.store.get("old") is not None
+
+
+def test_rerun_makes_no_api_calls(cache_path):
+    """Test that embedding an unchanged rulebook twice only calls the API once."""
+    rules = ["Late payment fees are charged", "Profit is shared pro rata", "Late payment fees are charged"]
+    service = EmbeddingService(api_key="test-key", cache=EmbeddingCache(path=cache_path))
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = lambda input, model: make_response(input)
+
+    first = service.embed_many(rules)
+    second = service.embed_many(rules)
+
+    assert first == second
+    assert service.api_calls == 1
+    assert service.client.embeddings.create.call_args.kwargs["input"] == rules[:2]
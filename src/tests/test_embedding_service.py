@@ -0,0 +1,200 @@
+"""
+Test suite for the shared EmbeddingService.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, AsyncMock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core import embeddings
+from src.core.embeddings import EmbeddingService, get_embedding_service, shorten_embedding
+
+
+def make_response(texts):
+    """Build a mock embeddings response, returned out of order on purpose."""
+    data = [Mock(index=i, embedding=[float(len(text)), float(i)]) for i, text in enumerate(texts)]
+    return Mock(data=list(reversed(data)))
+
+
+@pytest.fixture
+def service():
+    """Fixture to create an EmbeddingService with a mocked client."""
+    service = EmbeddingService(api_key="test-key", batch_size=2)
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = lambda input, model: make_response(input)
+    return service
+
+
+def test_embed_many_preserves_order_and_batches(service):
+    """Test that embed_many splits into batches and keeps input order."""
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    vectors = service.embed_many(texts)
+
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert service.client.embeddings.create.call_count == 3
+
+
+def test_embed_single(service):
+    """Test that embed returns one vector."""
+    assert service.embed("abc") == [3.0, 0.0]
+
+
+def test_aembed_many(service):
+    """Test the async API."""
+    async def run():
+        create = service.async_client.embeddings.create = AsyncMock(
+            side_effect=lambda input, model: make_response(input)
+        )
+        return await service.aembed_many(["a", "bb", "ccc"]), create.await_count
+
+    vectors, requests = asyncio.run(run())
+
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0]
+    assert requests == 2
+
+
+class EmbeddingsHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive /embeddings endpoint."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        texts = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["input"]
+        body = json.dumps({
+            "object": "list", "model": "test", "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            "data": [{"object": "embedding", "index": i, "embedding": [float(len(t))]} for i, t in enumerate(texts)]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_aembed_across_successive_event_loops(monkeypatch):
+    """Test that a second asyncio.run() gets a fresh client instead of the closed loop's pooled connections."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EmbeddingsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    service = EmbeddingService(api_key="test-key", batch_window_ms=0)
+
+    async def embed(texts):
+        return await service.aembed_many(texts), service.async_client
+
+    try:
+        first, first_client = asyncio.run(embed(["a", "bb"]))
+        second, second_client = asyncio.run(embed(["ccc"]))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first == [[1.0], [2.0]]
+    assert second == [[3.0]]
+    # The SDK's own retry would mask a reused client's "Event loop is closed" error
+    assert first_client is not second_client
+    assert first_client.is_closed() and second_client.is_closed()
+
+
+def test_get_embedding_service_is_shared(monkeypatch):
+    """Test that the process-wide service is created once."""
+    monkeypatch.setattr(embeddings, "_service", None)
+    monkeypatch.setattr(embeddings.settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(embeddings.settings, "EMBEDDING_CACHE_ENABLED", False)
+
+    assert get_embedding_service() is get_embedding_service()
+
+
+def test_reduced_dimensions_are_requested_and_cached_separately(tmp_path):
+    """Test that dimensions is sent to the API and reduced vectors get their own cache entries."""
+    from src.core.embedding_cache import EmbeddingCache
+    cache = EmbeddingCache(path=str(tmp_path / "cache.sqlite"))
+    service = EmbeddingService(api_key="test-key", cache=cache)
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = lambda input, model, **options: make_response(input)
+
+    service.embed("murabaha")
+    service.embed("murabaha", dimensions=256)
+    service.embed("murabaha", dimensions=256)
+
+    calls = service.client.embeddings.create.call_args_list
+    assert len(calls) == 2
+    assert "dimensions" not in calls[0].kwargs
+    assert calls[1].kwargs["dimensions"] == 256
+    cache.close()
+
+
+def test_shorten_embedding():
+    """Test truncation with renormalization."""
+    assert shorten_embedding([3.0, 4.0, 12.0], 2) == pytest.approx([0.6, 0.8])
+    assert shorten_embedding([3.0, 4.0], None) == [3.0, 4.0]
+
+
+def test_concurrent_embeds_share_one_request():
+    """Test that single-text requests inside one window are sent as one batch."""
+    service = EmbeddingService(api_key="test-key", batch_window_ms=50)
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = lambda input, model: make_response(input)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        vectors = list(executor.map(service.embed, texts))
+
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0]
+    assert service.client.embeddings.create.call_count == 1
+    assert service.batcher.requests == 4 and service.batcher.batches == 1
+    service.close()
+
+
+def test_async_embeds_share_one_request():
+    """Test that coroutines awaiting aembed are batched without blocking the event loop."""
+    service = EmbeddingService(api_key="test-key", batch_window_ms=50)
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = lambda input, model, **options: make_response(input)
+
+    async def embed_all():
+        return await asyncio.gather(
+            service.aembed("a", dimensions=256), service.aembed("bb", dimensions=256), service.aembed("ccc")
+        )
+
+    vectors = asyncio.run(embed_all())
+
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0]
+    # One request per distinct dimension
+    assert service.client.embeddings.create.call_count == 2
+    service.close()
+
+
+def test_batched_embed_propagates_errors():
+    """Test that a failed batch raises in every waiting caller."""
+    service = EmbeddingService(api_key="test-key", batch_window_ms=20)
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = RuntimeError("rate limited")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(service.embed, text) for text in ("a", "b")]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+    service.close()
+
+
+def test_zero_window_disables_batching():
+    """Test that a zero window sends each request immediately."""
+    service = EmbeddingService(api_key="test-key", batch_window_ms=0)
+    service.client = Mock()
+    service.client.embeddings.create.side_effect = lambda input, model: make_response(input)
+
+    assert service.batcher is None
+    assert service.embed("abc") == [3.0, 0.0]
@@ -0,0 +1,210 @@
+"""
+Test suite for the standards ingestion pipeline, run against the local index backend.
+"""
+
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core.vector_index import LocalVectorIndex
+from src.ingestion import IngestionCheckpoint, IngestionPipeline, ManifestStore, chunk_document, split_text
+
+MARKDOWN = """Preamble text.
+
+# Scope
+
+The standard applies to Murabaha transactions. It covers deferred payment sales.
+
+# Disclosure
+
+The institution shall disclose the cost. The institution shall disclose the profit.
+"""
+
+
+class CountingEmbeddings:
+    """Embedding service double that returns fixed-length vectors and counts requests."""
+
+    def __init__(self, fail_on=None):
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def embed_many(self, texts, dimensions=None):
+        self.calls += 1
+        if self.fail_on and any(self.fail_on in text for text in texts):
+            raise RuntimeError("embedding failed")
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+
+class BlockingDeleteIndex(LocalVectorIndex):
+    """Local index whose deletes wait until the pipeline saves another completed document."""
+
+    def __init__(self):
+        super().__init__()
+        self.saved = threading.Event()
+        self.saved_during_delete = None
+
+    def delete(self, ids, namespace="default"):
+        self.saved_during_delete = self.saved.wait(timeout=2)
+        super().delete(ids, namespace=namespace)
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Fixture writing three markdown standards into a directory."""
+    for name in ("FAS_4", "FAS_7", "FAS_10"):
+        (tmp_path / f"{name}.md").write_text(MARKDOWN.replace("Murabaha", name), encoding="utf-8")
+    return tmp_path
+
+
+def test_chunk_document_metadata(documents):
+    """Test that chunks carry section, position and source metadata and addressable ids."""
+    records = chunk_document(str(documents / "FAS_4.md"), chunk_size=60, overlap=0)
+
+    assert [record["id"] for record in records] == [f"FAS_4#{i}" for i in range(len(records))]
+    assert {record["metadata"]["section_heading"] for record in records} == {"", "Scope", "Disclosure"}
+    assert all(record["metadata"]["total_chunks"] == len(records) for record in records)
+    assert all(record["metadata"]["document_type"] == "FAS_4" for record in records)
+    assert all(len(record["metadata"]["text"]) <= 60 for record in records)
+
+
+def test_split_text_overlap():
+    """Test that consecutive chunks share the configured overlap."""
+    chunks = split_text("one two three. four five six. seven eight nine.", chunk_size=20, overlap=10)
+    assert len(chunks) > 1
+    assert chunks[0] == "one two three."
+    assert chunks[1].startswith("three. four")
+
+
+def test_pipeline_upserts_in_batches_and_resumes(documents, tmp_path):
+    """Test that every chunk is upserted in batches and a second run skips completed documents."""
+    index = LocalVectorIndex()
+    embeddings = CountingEmbeddings()
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    pipeline = IngestionPipeline(
+        index, checkpoint=IngestionCheckpoint(checkpoint_path), embedding_service=embeddings,
+        embed_batch_size=4, upsert_batch_size=2
+    )
+    report = pipeline.run([str(documents)])
+
+    assert report.documents == 3
+    assert index.describe_index_stats()["total_vector_count"] == report.chunks
+    assert embeddings.calls == report.embedding_batches == -(-report.chunks // 4)
+    assert report.failed_documents == []
+
+    rerun = IngestionPipeline(
+        index, checkpoint=IngestionCheckpoint(checkpoint_path), embedding_service=embeddings
+    ).run([str(documents)])
+    assert rerun.skipped_documents == 3
+    assert rerun.documents == 0
+
+
+def test_pipeline_does_not_checkpoint_failed_documents(documents, tmp_path):
+    """Test that a document whose batch failed is reported and left for the next run."""
+    checkpoint = IngestionCheckpoint(str(tmp_path / "checkpoint.json"))
+    pipeline = IngestionPipeline(
+        LocalVectorIndex(), checkpoint=checkpoint, embedding_service=CountingEmbeddings(fail_on="FAS_7"),
+        embed_batch_size=3
+    )
+    with patch("src.ingestion.pipeline.settings.INGEST_MAX_RETRIES", 1):
+        report = pipeline.run([str(documents)])
+
+    assert report.failed_documents == [str(documents / "FAS_7.md")]
+    assert len(checkpoint.completed) == 2
+
+
+def test_pipeline_batches_index_saves(documents, tmp_path):
+    """Test that the index is saved every persist_every documents and at the end, before their checkpoint."""
+    checkpoint = IngestionCheckpoint(str(tmp_path / "checkpoint.json"))
+    checkpointed_at_save = []
+    pipeline = IngestionPipeline(
+        LocalVectorIndex(), checkpoint=checkpoint, embedding_service=CountingEmbeddings(),
+        upsert_batch_size=1, upsert_workers=1,
+        persist=lambda: checkpointed_at_save.append(len(checkpoint.completed)),
+        persist_every=2, persist_interval=3600
+    )
+    report = pipeline.run([str(documents)])
+
+    assert report.failed_documents == []
+    assert checkpointed_at_save == [0, 2]
+    assert len(IngestionCheckpoint(checkpoint.path).completed) == 3
+
+
+def test_reindex_embeds_only_changed_chunks(documents, tmp_path):
+    """Test that re-indexing a revised document embeds new text only, reuses moved chunks and deletes stale ones."""
+    index = LocalVectorIndex()
+    manifests = ManifestStore(str(tmp_path / "manifests"))
+    source = documents / "FAS_4.md"
+    IngestionPipeline(index, manifests=manifests, embedding_service=CountingEmbeddings()).run([str(source)])
+    before = index.describe_index_stats()["total_vector_count"]
+
+    # Revision: a new section is inserted first, shifting every existing chunk by one,
+    # and the closing section is dropped
+    source.write_text(
+        "Preamble text.\n\n# Definitions\n\nDeferred payment means payment after delivery.\n\n"
+        "# Scope\n\nThe standard applies to FAS_4 transactions. It covers deferred payment sales.\n",
+        encoding="utf-8"
+    )
+    embeddings = CountingEmbeddings()
+    report = IngestionPipeline(index, manifests=manifests, embedding_service=embeddings).run([str(source)])
+
+    assert report.chunks_embedded == 1
+    assert report.chunks_reused == 1
+    assert report.chunks_unchanged == 1
+    assert report.embeddings_saved == 2
+    assert report.chunks_deleted == 0
+    records = {record["id"]: record["metadata"] for record in index.iter_records()}
+    assert len(records) == before
+    assert records["FAS_4#2"]["section_heading"] == "Scope"
+
+    # Second revision drops the new section again: nothing to embed, one chunk left over
+    source.write_text(
+        "Preamble text.\n\n# Scope\n\nThe standard applies to FAS_4 transactions. It covers deferred payment sales.\n",
+        encoding="utf-8"
+    )
+    report = IngestionPipeline(index, manifests=manifests, embedding_service=embeddings).run([str(source)])
+
+    assert report.chunks_embedded == 0
+    assert report.chunks_deleted == 1
+    assert sorted(record["id"] for record in index.iter_records()) == ["FAS_4#0", "FAS_4#1"]
+
+
+def test_stale_deletes_run_outside_the_pipeline_lock(documents, tmp_path):
+    """Test that other documents complete and are saved while a document's stale chunks are deleted."""
+    index = BlockingDeleteIndex()
+    manifests = ManifestStore(str(tmp_path / "manifests"))
+    source = documents / "FAS_4.md"
+    IngestionPipeline(index, manifests=manifests, embedding_service=CountingEmbeddings()).run([str(source)])
+
+    # Revision: the Scope section changes and the Disclosure section is dropped
+    source.write_text(
+        "Preamble text.\n\n# Scope\n\nThe standard applies to FAS_4 transactions only.\n", encoding="utf-8"
+    )
+    report = IngestionPipeline(
+        index, manifests=manifests, embedding_service=CountingEmbeddings(),
+        embed_batch_size=1, upsert_batch_size=1, upsert_workers=2,
+        persist=index.saved.set, persist_every=1
+    ).run([str(source), str(documents / "FAS_7.md")])
+
+    assert index.saved_during_delete is True
+    assert report.failed_documents == []
+    assert report.chunks_deleted == 1
+    assert "FAS_4#2" not in {record["id"] for record in index.iter_records()}
+
+
+def test_reindex_rebuilds_missing_manifest_from_index(documents, tmp_path):
+    """Test that without a manifest file the previous chunks are read back from the index."""
+    index = LocalVectorIndex()
+    IngestionPipeline(
+        index, manifests=ManifestStore(str(tmp_path / "first")), embedding_service=CountingEmbeddings()
+    ).run([str(documents / "FAS_7.md")])
+
+    report = IngestionPipeline(
+        index, manifests=ManifestStore(str(tmp_path / "second")), embedding_service=CountingEmbeddings()
+    ).run([str(documents / "FAS_7.md")])
+    assert report.chunks_embedded == 0
+    assert report.chunks_unchanged == report.chunks
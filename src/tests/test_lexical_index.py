@@ -0,0 +1,94 @@
+"""
+Test suite for the BM25 lexical index and hybrid keyword retrieval.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core.lexical_index import BM25Index, tokenize
+from src.core.reranking import reciprocal_rank_fusion
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever
+
+RECORDS = [
+    {"id": "fas4#0", "values": [1.0, 0.0], "metadata": {
+        "text": "The Musharaka partners share profit according to the agreed ratio.",
+        "document_type": "FAS_4_Musharaka", "section_heading": "Profit"}},
+    {"id": "fas4#1", "values": [0.9, 0.1], "metadata": {
+        "text": "Losses in a Musharaka are borne in proportion to capital.",
+        "document_type": "FAS_4_Musharaka", "section_heading": "Losses"}},
+    {"id": "fas30#0", "values": [0.0, 1.0], "metadata": {
+        "text": "Displaced commercial risk arises when the bank forgoes its share of profit.",
+        "document_type": "FAS_30", "section_heading": "Risk"}},
+]
+
+
+@pytest.fixture
+def backend():
+    """Fixture to create a local index with chunk texts."""
+    index = LocalVectorIndex()
+    index.upsert(RECORDS)
+    return index
+
+
+def test_tokenize_drops_stopwords():
+    """Test lowercasing and stopword removal."""
+    assert tokenize("The Musharaka and the Partners") == ["musharaka", "partners"]
+
+
+def test_bm25_exact_term_match(backend):
+    """Test that a literal phrase ranks its chunk first."""
+    index = BM25Index()
+    index.add_namespace("default", backend.iter_records())
+
+    matches = index.query("displaced commercial risk", top_k=3)
+
+    assert matches[0]["id"] == "fas30#0"
+    assert index.query("Musharaka", top_k=5, filter={"section_heading": {"$eq": "Losses"}})[0]["id"] == "fas4#1"
+    assert index.query("nonexistentterm", top_k=5) == []
+
+
+def test_reciprocal_rank_fusion():
+    """Test that documents ranked well in both lists win."""
+    vector = [{"id": "a", "score": 0.9}, {"id": "b", "score": 0.8}, {"id": "c", "score": 0.7}]
+    lexical = [{"id": "c", "score": 9.0}, {"id": "b", "score": 5.0}]
+
+    fused = reciprocal_rank_fusion([vector, lexical], top_n=2)
+
+    assert [match["id"] for match in fused] == ["c", "b"]
+
+
+def test_lexical_mode_skips_embedding(backend):
+    """Test the pure-lexical fast path."""
+    retriever = FASRetriever(backend=backend)
+    with patch.object(FASRetriever, "embed_query") as embed:
+        results = retriever.retrieve_by_keywords(["Musharaka", "losses"], top_n=1, mode="lexical")
+
+    embed.assert_not_called()
+    assert results[0].id == "fas4#1"
+
+
+def test_hybrid_mode_fuses_rankings(backend):
+    """Test that hybrid mode brings in the literal match the vector ranking misses."""
+    retriever = FASRetriever(backend=backend)
+    with patch.object(FASRetriever, "embed_query", return_value=[1.0, 0.0]) as embed:
+        results = retriever.retrieve_by_keywords(["displaced", "commercial", "risk"], top_n=2, mode="hybrid")
+
+    assert embed.call_count == 1
+    assert "fas30#0" in [doc.id for doc in results]
+
+
+def test_lexical_index_rebuilt_after_upsert(backend):
+    """Test that new chunks become searchable lexically."""
+    retriever = FASRetriever(backend=backend)
+    retriever.retrieve_by_keywords(["Musharaka"], mode="lexical")
+    backend.upsert([{"id": "fas10#0", "values": [0.5, 0.5], "metadata": {"text": "Istisna contract"}}])
+
+    results = retriever.retrieve_by_keywords(["Istisna"], mode="lexical")
+
+    assert [doc.id for doc in results] == ["fas10#0"]
@@ -0,0 +1,133 @@
+"""
+Test suite for the persistent LLM response cache.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from openai.types.chat import ChatCompletion
+from src.core.disk_cache import DiskLRUCache
+from src.core.llm_cache import LLMResponseCache, llm_cache_key
+from src.core.llm_gateway import LLMGateway
+
+SYSTEM = {"role": "system", "content": "You are a Shariah Compliance Checker Agent."}
+USER = {"role": "user", "content": "Rule Text:\nLate fees are credited to income."}
+
+
+def completion(content="{}"):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4.1-mini",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    })
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture for a response cache in a temporary file."""
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"), max_entries=100, ttl_seconds=0)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def gateway(cache):
+    """Fixture for a gateway with a mocked client and the temporary cache."""
+    gateway = LLMGateway(api_key="test-key", max_retries=1, cache=cache)
+    gateway._client = Mock()
+    gateway._client.chat.completions.create.return_value = completion('{"compliance_status": "compliant"}')
+    return gateway
+
+
+def test_key_separates_prompt_message_and_params():
+    """Test that the key changes with the system prompt, the message and the parameters."""
+    base = llm_cache_key("gpt-4.1-mini", [SYSTEM, USER], {"temperature": 0.2})
+    edited_prompt = llm_cache_key("gpt-4.1-mini", [{**SYSTEM, "content": "Edited prompt"}, USER], {"temperature": 0.2})
+
+    assert base == llm_cache_key("gpt-4.1-mini", [SYSTEM, USER], {"temperature": 0.2})
+    assert base != llm_cache_key("gpt-4.1-mini", [SYSTEM, {**USER, "content": "Other rule"}], {"temperature": 0.2})
+    assert base != llm_cache_key("gpt-4.1-mini", [SYSTEM, USER], {"temperature": 0.7})
+    assert base != llm_cache_key("gpt-4o", [SYSTEM, USER], {"temperature": 0.2})
+    # Only the system-prompt segment differs, so other agents' entries are untouched
+    assert base.split(":")[1] != edited_prompt.split(":")[1]
+    assert base.split(":")[2:] == edited_prompt.split(":")[2:]
+
+
+def test_repeated_request_served_from_cache(gateway, cache):
+    """Test that an identical request skips the API on both the sync and async paths."""
+    first = gateway.chat_completion("gpt-4.1-mini", [SYSTEM, USER], temperature=0.2)
+    second = gateway.chat_completion("gpt-4.1-mini", [SYSTEM, USER], temperature=0.2)
+
+    async def run():
+        gateway.async_client.chat.completions.create = AsyncMock()
+        return await gateway.achat_completion("gpt-4.1-mini", [SYSTEM, USER], temperature=0.2)
+
+    third = asyncio.run(run())
+
+    assert gateway._client.chat.completions.create.call_count == 1
+    assert first == second == third
+    assert gateway.stats()["gpt-4.1-mini"]["cache_hits"] == 2
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 1}
+
+
+def test_async_cache_io_runs_off_the_loop(gateway, cache):
+    """Test that achat_completion reads and writes the SQLite cache outside the event loop thread."""
+    threads = []
+    get, put = cache.get, cache.set
+    cache.get = lambda key: threads.append(threading.get_ident()) or get(key)
+    cache.set = lambda key, response: threads.append(threading.get_ident()) or put(key, response)
+
+    async def run():
+        gateway.async_client.chat.completions.create = AsyncMock(return_value=completion())
+        await gateway.achat_completion("gpt-4.1-mini", [SYSTEM, USER])
+        await gateway.achat_completion("gpt-4.1-mini", [SYSTEM, USER])
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert len(threads) == 3
+    assert loop_thread not in threads
+    assert gateway.stats()["gpt-4.1-mini"]["cache_hits"] == 1
+
+
+def test_cache_opt_out_and_prompt_edit(gateway):
+    """Test that cache=False always calls the API and an edited prompt misses."""
+    gateway.chat_completion("gpt-4.1-mini", [SYSTEM, USER])
+    gateway.chat_completion("gpt-4.1-mini", [SYSTEM, USER], cache=False)
+    gateway.chat_completion("gpt-4.1-mini", [{**SYSTEM, "content": "Edited prompt"}, USER])
+
+    assert gateway._client.chat.completions.create.call_count == 3
+    assert "cache" not in gateway._client.chat.completions.create.call_args.kwargs
+
+
+def test_responses_survive_reopen(tmp_path):
+    """Test that cached responses are read back from disk after a restart."""
+    path = str(tmp_path / "llm.sqlite")
+    cache = LLMResponseCache(path=path, ttl_seconds=0)
+    cache.set("k", completion("persisted"))
+    cache.close()
+
+    reopened = LLMResponseCache(path=path, ttl_seconds=0)
+    assert reopened.get("k").choices[0].message.content == "persisted"
+    reopened.close()
+
+
+def test_disk_cache_ttl_expires_entries(tmp_path):
+    """Test that entries older than the TTL are no longer returned and are purged on write."""
+    store = DiskLRUCache(str(tmp_path / "ttl.sqlite"), table_name="entries", max_entries=10, ttl_seconds=0.05)
+    store.set("old", b"1")
+    time.sleep(0.1)
+    store.set("new", b"2")
+
+    assert store.get("old") is None
+    assert store.get("new") == b"2"
+    assert len(store) == 1
+    store.close()
@@ -0,0 +1,205 @@
+"""
+Test suite for the shared LLM gateway.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import httpx
+import pytest
+from openai import BadRequestError, InternalServerError, RateLimitError
+from src.core import llm_gateway
+from src.core.llm_gateway import LLMGateway, TokenBucket, get_llm_gateway
+
+MESSAGES = [{"role": "user", "content": "Is this Murabaha clause compliant?"}]
+
+
+def api_error(error_class, status, headers=None):
+    """Build an OpenAI status error with a real httpx response."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return error_class("error", response=response, body=None)
+
+
+def completion(total_tokens=50):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+                           usage=SimpleNamespace(total_tokens=total_tokens))
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """Fixture to create a gateway with a mocked client and no real backoff sleeps."""
+    monkeypatch.setattr(llm_gateway.settings, "LLM_RETRY_BASE_SECONDS", 0.001)
+    gateway = LLMGateway(api_key="test-key", max_retries=3)
+    gateway._client = Mock()
+    return gateway
+
+
+def test_token_bucket_delays_beyond_capacity():
+    """Test that reservations beyond the burst size wait for the refill rate."""
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)
+
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    # Third request waits one refill interval (600/min = one every 0.1 s)
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+
+
+def test_retries_rate_limits_and_server_errors(gateway):
+    """Test that 429 and 5xx responses are retried, honouring Retry-After."""
+    gateway._client.chat.completions.create.side_effect = [
+        api_error(RateLimitError, 429, {"retry-after": "0.01"}),
+        api_error(InternalServerError, 503),
+        completion(),
+    ]
+
+    response = gateway.chat_completion("gpt-4.1-mini", MESSAGES, temperature=0.2)
+
+    assert response.choices[0].message.content == "{}"
+    assert gateway._client.chat.completions.create.call_count == 3
+    assert gateway.stats()["gpt-4.1-mini"]["retries"] == 2
+    assert gateway._client.chat.completions.create.call_args.kwargs["temperature"] == 0.2
+
+
+def test_client_errors_are_not_retried(gateway):
+    """Test that a 400 fails immediately and gives up after max_retries on persistent 429s."""
+    gateway._client.chat.completions.create.side_effect = api_error(BadRequestError, 400)
+    with pytest.raises(BadRequestError):
+        gateway.chat_completion("gpt-4.1-mini", MESSAGES)
+    assert gateway._client.chat.completions.create.call_count == 1
+
+    gateway._client.chat.completions.create.side_effect = api_error(RateLimitError, 429)
+    with pytest.raises(RateLimitError):
+        gateway.chat_completion("gpt-4.1-mini", MESSAGES)
+    assert gateway._client.chat.completions.create.call_count == 4
+
+
+def test_in_flight_cap_per_model(gateway):
+    """Test that no more than max_in_flight requests of a model run at once."""
+    gateway.model_limits = {"gpt-4.1-mini": {"max_in_flight": 2}}
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow_create(**kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return completion()
+
+    gateway._client.chat.completions.create.side_effect = slow_create
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: gateway.chat_completion("gpt-4.1-mini", MESSAGES), range(8)))
+
+    assert peak[0] == 2
+    assert gateway.stats()["gpt-4.1-mini"]["calls"] == 8
+
+
+def test_request_rate_limit_throttles(gateway):
+    """Test that the request bucket spaces calls out instead of sending a burst."""
+    gateway.model_limits = {"gpt-4o": {"rpm": 600}}
+    limits = gateway.limits_for("gpt-4o")
+    limits.requests = TokenBucket(600, capacity=1)
+    gateway._client.chat.completions.create.return_value = completion()
+
+    start = time.perf_counter()
+    for _ in range(3):
+        gateway.chat_completion("gpt-4o", MESSAGES)
+
+    assert time.perf_counter() - start >= 0.18
+    assert gateway.stats()["gpt-4o"]["throttled_seconds"] > 0
+
+
+def test_async_retries_rate_limits(gateway):
+    """Test that achat_completion retries 429s on the event loop like the sync path."""
+    async def run():
+        gateway.async_client.chat.completions.create = AsyncMock(side_effect=[
+            api_error(RateLimitError, 429, {"retry-after": "0.01"}),
+            completion(),
+        ])
+        response = await gateway.achat_completion("gpt-4.1-mini", MESSAGES, temperature=0.2)
+        return response, gateway.async_client.chat.completions.create.call_count
+
+    response, calls = asyncio.run(run())
+
+    assert response.choices[0].message.content == "{}"
+    assert calls == 2
+    assert gateway.stats()["gpt-4.1-mini"]["retries"] == 1
+
+
+def test_async_in_flight_cap_per_model(gateway):
+    """Test that concurrent coroutines respect the same in-flight cap as threads."""
+    gateway.model_limits = {"gpt-4.1-mini": {"max_in_flight": 3}}
+    active, peak = [0], [0]
+
+    async def slow_create(**kwargs):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        return completion()
+
+    async def run():
+        gateway.async_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+        await asyncio.gather(*[gateway.achat_completion("gpt-4.1-mini", MESSAGES) for _ in range(12)])
+
+    asyncio.run(run())
+
+    assert peak[0] == 3
+    assert gateway.stats()["gpt-4.1-mini"]["calls"] == 12
+
+
+def test_async_waiters_do_not_starve_thread_pool(gateway):
+    """Test that coroutines queued for an in-flight slot hold no executor threads."""
+    gateway.model_limits = {"gpt-4.1-mini": {"max_in_flight": 1}}
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.02)
+        return completion()
+
+    async def run():
+        gateway.async_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+        calls = asyncio.gather(*[gateway.achat_completion("gpt-4.1-mini", MESSAGES) for _ in range(100)])
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        await asyncio.to_thread(lambda: None)
+        unrelated = time.perf_counter() - start
+        calls.cancel()
+        await asyncio.gather(calls, return_exceptions=True)
+        return unrelated
+
+    assert asyncio.run(run()) < 0.1
+    assert gateway.stats()["gpt-4.1-mini"]["max_in_flight"] == 1
+
+
+def test_async_clients_per_loop_closed_with_loop(gateway):
+    """Test that each event loop gets its own async client, closed when the loop shuts down."""
+    async def client():
+        return gateway.async_client, gateway.async_client
+
+    first, same = asyncio.run(client())
+    second, _ = asyncio.run(client())
+
+    assert first is same
+    assert first is not second
+    assert first.is_closed() and second.is_closed()
+    assert len(gateway._async_clients) == 0
+
+
+def test_get_llm_gateway_is_shared(monkeypatch):
+    """Test that every agent gets the same gateway."""
+    monkeypatch.setattr(llm_gateway, "_gateway", None)
+    from src.agents.shariah_compliance_agent import ShariahComplianceAgent
+    from src.agents.gap_agent import GapDetectionAgent
+
+    assert ShariahComplianceAgent().client is GapDetectionAgent().client is get_llm_gateway()
@@ -0,0 +1,193 @@
+"""
+Test suite for the LocalVectorIndex backend and its use by the retrievers.
+"""
+
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+import pytest
+from src.core.vector_index import LocalVectorIndex, matches_filter
+from src.agents.fas_retriever import FASRetriever, FASDocument, FASHit
+
+RECORDS = [
+    {"id": "fas4#0", "values": [1.0, 0.0, 0.0], "metadata": {
+        "text": "Musharaka profit sharing", "document_type": "FAS_4_Musharaka",
+        "section_heading": "Scope", "chunk_index": 0, "total_chunks": 2}},
+    {"id": "fas4#1", "values": [0.9, 0.1, 0.0], "metadata": {
+        "text": "Musharaka losses", "document_type": "FAS_4_Musharaka",
+        "section_heading": "Measurement", "chunk_index": 1, "total_chunks": 2}},
+    {"id": "fas28#0", "values": [0.0, 1.0, 0.0], "metadata": {
+        "text": "Murabaha deferred payment", "document_type": "FAS_28_Murabaha_Deferred_Payment_Sales",
+        "section_heading": "Scope", "chunk_index": 0, "total_chunks": 1}},
+    {"id": "fas10#0", "values": [0.0, 0.0, 1.0], "metadata": {
+        "text": "Istisna contracts", "document_type": "FAS_10_Istisna",
+        "section_heading": "Scope", "chunk_index": 0, "total_chunks": 1}},
+]
+
+
+@pytest.fixture
+def index():
+    """Fixture to create a populated LocalVectorIndex."""
+    index = LocalVectorIndex()
+    index.upsert(RECORDS, namespace="default")
+    index.upsert(RECORDS[:1], namespace="other")
+    return index
+
+
+def test_query_orders_by_cosine(index):
+    """Test that matches come back best first with cosine scores."""
+    matches = index.query([1.0, 0.0, 0.0], top_k=2)
+
+    assert [m["id"] for m in matches] == ["fas4#0", "fas4#1"]
+    assert matches[0]["score"] == pytest.approx(1.0)
+
+
+def test_eq_and_in_filters(index):
+    """Test the document_type $eq/$in filters built by retrieve()."""
+    eq = index.query([1.0, 1.0, 1.0], top_k=10, filter={"document_type": {"$eq": "FAS_10_Istisna"}})
+    in_ = index.query([1.0, 1.0, 1.0], top_k=10, filter={
+        "document_type": {"$in": ["FAS_10_Istisna", "FAS_28_Murabaha_Deferred_Payment_Sales"]}})
+
+    assert [m["id"] for m in eq] == ["fas10#0"]
+    assert {m["id"] for m in in_} == {"fas10#0", "fas28#0"}
+
+
+def test_and_section_heading_filter(index):
+    """Test the combined document_type + section_heading filter."""
+    flt = FASRetriever._build_filter(["FAS_4_Musharaka"], "Measurement")
+    matches = index.query([1.0, 0.0, 0.0], top_k=10, filter=flt)
+
+    assert [m["id"] for m in matches] == ["fas4#1"]
+    assert all(matches_filter(m["metadata"], flt) for m in matches)
+
+
+def test_namespaces_are_isolated(index):
+    """Test that queries only see their namespace."""
+    assert [m["id"] for m in index.query([0.0, 1.0, 0.0], top_k=10, namespace="other")] == ["fas4#0"]
+    assert index.query([0.0, 1.0, 0.0], top_k=10, namespace="missing") == []
+
+
+def test_upsert_replaces_and_delete_removes(index):
+    """Test that upserting an existing id replaces it and delete compacts."""
+    version = index.version
+    index.upsert([{"id": "fas10#0", "values": [0.0, 1.0, 0.0], "metadata": {"text": "new"}}])
+    index.delete(["fas28#0"])
+
+    assert index.fetch(["fas10#0"])["fas10#0"]["metadata"]["text"] == "new"
+    assert index.fetch(["fas28#0"]) == {}
+    assert index.describe_index_stats()["namespaces"]["default"]["vector_count"] == 3
+    assert index.version == version + 2
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    """Test persistence of all namespaces."""
+    index.save(str(tmp_path))
+    loaded = LocalVectorIndex.load(str(tmp_path))
+
+    assert loaded.describe_index_stats() == index.describe_index_stats()
+    assert loaded.query([0.0, 0.0, 1.0], top_k=1)[0]["id"] == "fas10#0"
+
+
+def test_retriever_with_local_backend(index):
+    """Test that FASRetriever works unchanged on the local backend."""
+    retriever = FASRetriever(backend=index)
+    with patch.object(FASRetriever, "embed_query", return_value=[0.0, 1.0, 0.0]):
+        results = retriever.retrieve("Murabaha", top_n=1, document_types="FAS_28_Murabaha_Deferred_Payment_Sales")
+
+    assert len(results) == 1
+    assert isinstance(results[0], FASHit)
+    assert results[0].text == "Murabaha deferred payment"
+    assert isinstance(results[0].to_document(), FASDocument)
+
+
+def test_partitions_are_contiguous_slices(index):
+    """Test that rows are grouped by document type, then section heading, in insertion order."""
+    index.upsert([{"id": "fas4#2", "values": [0.8, 0.2, 0.0], "metadata": {
+        "text": "Musharaka scope", "document_type": "FAS_4_Musharaka", "section_heading": "Scope"}}])
+    index.query([1.0, 0.0, 0.0], top_k=1)
+    store = index.namespaces["default"]
+
+    start, stop, sections = store.partitions["FAS_4_Musharaka"]
+    assert store.ids[start:stop] == ["fas4#0", "fas4#2", "fas4#1"]
+    assert sections == {"Scope": (start, start + 2), "Measurement": (start + 2, stop)}
+    assert all(store.rows[vector_id] == row for row, vector_id in enumerate(store.ids))
+
+
+def test_partitioned_query_matches_flat_query(index):
+    """Test that partition pruning returns exactly what scoring every row returns."""
+    flat = LocalVectorIndex(partition_field="")
+    flat.upsert(RECORDS)
+    filters = [
+        {"document_type": {"$eq": "FAS_4_Musharaka"}},
+        {"document_type": {"$in": ["FAS_4_Musharaka", "FAS_10_Istisna", "FAS_missing"]}},
+        FASRetriever._build_filter(["FAS_4_Musharaka", "FAS_10_Istisna"], "Scope"),
+        {"section_heading": "Scope"},
+        {"$and": [{"document_type": "FAS_4_Musharaka"}, {"chunk_index": {"$gte": 1}}]},
+        {"document_type": {"$ne": "FAS_4_Musharaka"}},
+    ]
+
+    for flt in filters:
+        expected = flat.query([1.0, 0.5, 0.2], top_k=10, filter=flt)
+        matches = index.query([1.0, 0.5, 0.2], top_k=10, filter=flt)
+        assert [m["id"] for m in matches] == [m["id"] for m in expected]
+        assert [m["score"] for m in matches] == pytest.approx([m["score"] for m in expected])
+
+
+def test_partition_plan_prunes_slices(index):
+    """Test that $eq/$in on the partition fields select slices and leave no residual filter."""
+    index.query([1.0, 0.0, 0.0], top_k=1)
+    store = index.namespaces["default"]
+
+    ranges, residual = store.plan(FASRetriever._build_filter("FAS_4_Musharaka", "Measurement"))
+    assert [store.ids[row] for start, stop in ranges for row in range(start, stop)] == ["fas4#1"]
+    assert residual is None
+
+    ranges, residual = store.plan({"chunk_index": {"$gte": 1}})
+    assert ranges is None and residual == {"chunk_index": {"$gte": 1}}
+
+
+def test_queries_stay_consistent_during_writes():
+    """Test that queries racing upserts and re-partitioning never pair a score or id with the wrong row."""
+    rng = np.random.default_rng(0)
+    index = LocalVectorIndex(dimension=16)
+    vectors = {}
+
+    def record(i):
+        vector = rng.standard_normal(16)
+        vectors[f"doc{i}"] = vector / np.linalg.norm(vector)
+        return {"id": f"doc{i}", "values": vector.tolist(), "metadata": {
+            "document_type": f"FAS_{i % 5}", "section_heading": f"S{i % 3}", "i": i}}
+
+    index.upsert([record(i) for i in range(200)])
+    pending = [record(i) for i in range(200, 1200)]
+    errors, done = [], threading.Event()
+
+    def writer():
+        for start in range(0, len(pending), 20):
+            index.upsert(pending[start:start + 20])
+        done.set()
+
+    def reader(seed):
+        query = np.random.default_rng(seed).standard_normal(16)
+        query /= np.linalg.norm(query)
+        while not done.is_set():
+            for match in index.query(query.tolist(), top_k=5, filter={"document_type": "FAS_2"}):
+                if match["metadata"]["document_type"] != "FAS_2" or match["id"] != f"doc{match['metadata']['i']}":
+                    errors.append(match)
+                elif abs(match["score"] - float(vectors[match["id"]] @ query)) > 1e-4:
+                    errors.append(match)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(seed,)) for seed in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert index.describe_index_stats()["total_vector_count"] == 1200
@@ -0,0 +1,85 @@
+"""
+Test suite for the memory-mapped quantized vector store.
+"""
+
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+import pytest
+from src.core.mapped_index import MappedVectorIndex, write_mapped_index
+from src.core.vector_index import LocalVectorIndex
+
+DOCUMENT_TYPES = ["FAS_4_Musharaka", "FAS_28_Murabaha_Deferred_Payment_Sales"]
+
+
+@pytest.fixture
+def local_index():
+    """Fixture to create a local index with two namespaces and mixed metadata."""
+    rng = np.random.default_rng(7)
+    index = LocalVectorIndex()
+    for namespace, count in (("default", 40), ("fas_4", 10)):
+        index.upsert([
+            {"id": f"{namespace}#{i}", "values": rng.standard_normal(32).tolist(), "metadata": {
+                "text": f"Clause {i} of {namespace} — عقد", "document_type": DOCUMENT_TYPES[i % 2],
+                "section_heading": f"Section {i % 3}", "chunk_index": i, "total_chunks": count}}
+            for i in range(count)
+        ], namespace=namespace)
+    return index
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_mapped_index_matches_float32_results(local_index, tmp_path, dtype):
+    """Test that quantized search returns the float32 ranking and metadata, with and without filters."""
+    write_mapped_index(local_index, str(tmp_path / "mapped"), dtype=dtype)
+    mapped = MappedVectorIndex(str(tmp_path / "mapped"))
+    assert isinstance(mapped.namespaces["default"].vectors, np.memmap)
+
+    query = np.random.default_rng(1).standard_normal(32).tolist()
+    for query_filter in (None, {"document_type": {"$eq": DOCUMENT_TYPES[0]}}, {"chunk_index": {"$gte": 30}}):
+        expected = local_index.query(query, top_k=3, filter=query_filter)
+        actual = mapped.query(query, top_k=3, filter=query_filter)
+        assert [match["id"] for match in actual] == [match["id"] for match in expected]
+        assert actual[0]["metadata"] == expected[0]["metadata"]
+        assert actual[0]["score"] == pytest.approx(expected[0]["score"], abs=0.02)
+
+    assert mapped.describe_index_stats() == local_index.describe_index_stats()
+    assert mapped.fetch(["fas_4#3"], namespace="fas_4")["fas_4#3"]["metadata"]["section_heading"] == "Section 0"
+
+
+def test_mapped_index_is_read_only_and_replaced_atomically(local_index, tmp_path):
+    """Test that writes are refused and a rebuilt store replaces the previous one."""
+    directory = str(tmp_path / "mapped")
+    write_mapped_index(local_index, directory)
+    first = MappedVectorIndex(directory)
+    with pytest.raises(NotImplementedError):
+        first.upsert([{"id": "x", "values": [0.0] * 32}])
+    version = first.version_stamp()
+
+    local_index.delete(["default#0"])
+    write_mapped_index(local_index, directory)
+    second = MappedVectorIndex(directory)
+    assert second.version_stamp() != version
+    assert second.describe_index_stats()["namespaces"]["default"]["vector_count"] == 39
+    assert sorted(os.listdir(tmp_path)) == ["mapped"]
+
+
+def test_open_index_remaps_rebuilt_store(local_index, tmp_path):
+    """Test that an index opened before a rebuild serves the new store and reports a new version."""
+    directory = str(tmp_path / "mapped")
+    write_mapped_index(local_index, directory)
+    mapped = MappedVectorIndex(directory)
+    version = mapped.version_stamp()
+    assert "default#0" in mapped.fetch(["default#0"])
+
+    local_index.delete(["default#0"])
+    write_mapped_index(local_index, directory)
+
+    assert mapped.version_stamp() != version
+    assert mapped.fetch(["default#0"]) == {}
+    assert mapped.describe_index_stats() == local_index.describe_index_stats()
+    query = local_index.fetch(["default#1"])["default#1"]["values"]
+    assert mapped.query(query, top_k=1)[0]["id"] == "default#1"
@@ -0,0 +1,99 @@
+"""
+Test suite for MMR re-ranking and its use in the retrievers.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.core.reranking import adaptive_cutoff, mmr_select
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever
+from src.agents.ss_retiever import SSRetriever
+from src.orchestators.orch_drafting_shariah_compliant_regulations import SS_CONTEXT_OPTIONS
+
+
+def test_mmr_prefers_diverse_candidates():
+    """Test that a near-duplicate of the best candidate loses to a different one."""
+    query = [1.0, 1.0]
+    candidates = [[1.0, 0.9], [1.0, 0.89], [0.6, 1.0]]
+    assert mmr_select(query, candidates, 2, lambda_mult=0.5) == [0, 2]
+    assert mmr_select(query, candidates, 2, lambda_mult=1.0) == [0, 1]
+
+
+def test_mmr_drops_duplicates():
+    """Test that candidates above the duplicate threshold are never selected."""
+    candidates = [[1.0, 0.0], [0.999, 0.01], [0.0, 1.0]]
+    assert mmr_select([1.0, -0.2], candidates, 3, duplicate_threshold=0.95) == [0, 2]
+    assert mmr_select([1.0, 0.2], [], 3) == []
+
+
+def test_retrieve_diversify_returns_light_hits():
+    """Test that diversified retrieval skips duplicate chunks and drops the fetched vectors."""
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": f"fas4#{i}", "values": values, "metadata": {"text": f"chunk {i}", "chunk_index": i}}
+        for i, values in enumerate([[1.0, 0.0, 0.0], [1.0, 0.01, 0.0], [0.7, 0.7, 0.0], [0.0, 0.0, 1.0]])
+    ])
+    retriever = FASRetriever(backend=index)
+    with patch.object(FASRetriever, "embed_query", return_value=[1.0, 0.3, 0.0]):
+        plain = retriever.retrieve("musharaka", top_n=2)
+        diverse = retriever.retrieve("musharaka", top_n=2, diversify=True)
+
+    assert [hit.id for hit in plain] == ["fas4#1", "fas4#0"]
+    assert [hit.id for hit in diverse] == ["fas4#1", "fas4#2"]
+    assert all(hit.values is None for hit in diverse)
+
+
+def test_adaptive_cutoff_at_score_cliff():
+    """Test that the list is cut at the first large drop and below the minimum score."""
+    assert adaptive_cutoff([0.82, 0.80, 0.61, 0.60, 0.59], min_score=0.3, max_gap=0.05) == 2
+    assert adaptive_cutoff([0.62, 0.60, 0.58, 0.28, 0.27], min_score=0.3, max_gap=0.05) == 3
+    assert adaptive_cutoff([0.62, 0.60, 0.58], min_score=0.3, max_gap=0.05) == 3
+
+
+def test_adaptive_cutoff_keeps_min_results():
+    """Test that at least min_results survive even when every score is weak."""
+    assert adaptive_cutoff([0.2, 0.1], min_score=0.3, max_gap=0.05) == 1
+    assert adaptive_cutoff([0.9, 0.5, 0.4], min_score=0.3, max_gap=0.05, min_results=2) == 2
+    assert adaptive_cutoff([], min_score=0.3, max_gap=0.05) == 0
+
+
+def test_retrieve_adaptive_returns_fewer_hits():
+    """Test that adaptive retrieval drops the chunks after the score cliff and caches separately."""
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": "fas28#0", "values": [1.0, 0.0, 0.0], "metadata": {"text": "deferred profit"}},
+        {"id": "fas28#1", "values": [0.98, 0.2, 0.0], "metadata": {"text": "deferred profit recognition"}},
+        {"id": "fas4#0", "values": [0.5, 0.0, 0.86], "metadata": {"text": "musharaka"}},
+        {"id": "fas10#0", "values": [0.3, 0.95, 0.0], "metadata": {"text": "istisna"}},
+    ])
+    retriever = FASRetriever(backend=index)
+
+    with patch.object(FASRetriever, "embed_query", return_value=[1.0, 0.0, 0.0]):
+        fixed = retriever.retrieve("Murabaha deferred profit", top_n=4)
+        adaptive = retriever.retrieve("Murabaha deferred profit", top_n=4, adaptive=True)
+
+    assert len(fixed) == 4
+    assert [hit.id for hit in adaptive] == ["fas28#0", "fas28#1"]
+
+
+def test_drafting_context_never_exceeds_previous_count():
+    """Test that a typical, gently declining score profile yields at most the five chunks update prompts used to get."""
+    # Cosine scores typical of text-embedding-3-small: 0.62 down to 0.44 in steps of 0.02, no cliff
+    scores = [0.62 - 0.02 * i for i in range(10)]
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": f"ss8#{i}", "values": [score, (1 - score ** 2) ** 0.5, 0.0], "metadata": {"text": f"clause {i}"}}
+        for i, score in enumerate(scores)
+    ])
+    retriever = SSRetriever(backend=index)
+
+    with patch.object(SSRetriever, "embed_queries", return_value=[[1.0, 0.0, 0.0]]):
+        [hits] = retriever.retrieve_many(["late payment penalties"], **SS_CONTEXT_OPTIONS)
+
+    assert len(hits) == 5
+    assert [hit.id for hit in hits] == [f"ss8#{i}" for i in range(5)]
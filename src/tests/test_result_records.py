@@ -0,0 +1,52 @@
+"""
+Test suite for the slotted retrieval hit records.
+"""
+
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.agents.fas_retriever import FASHit, FASDocument
+from src.agents.ss_retiever import SSHit, SSDocument
+
+METADATA = {
+    "text": "Murabaha deferred payment sale",
+    "document_type": "FAS_28_Murabaha_Deferred_Payment_Sales",
+    "section_heading": "Scope",
+    "source_filename": "FAS_28.pdf",
+    "chunk_index": 3.0,
+    "total_chunks": 12.0,
+}
+
+
+def test_hit_exposes_document_fields_without_copying():
+    """Test attribute access and that metadata is shared, not copied."""
+    hit = FASHit("fas28#3", 0.87, METADATA)
+
+    assert hit.text == METADATA["text"]
+    assert hit.document_type == "FAS_28_Murabaha_Deferred_Payment_Sales"
+    assert (hit.chunk_index, hit.total_chunks) == (3, 12)
+    assert hit.metadata is METADATA
+    assert not hasattr(hit, "__dict__")
+
+
+def test_hit_materializes_on_serialization():
+    """Test that dict()/to_document() produce the Pydantic model output."""
+    hit = SSHit("ss8#0", 0.5, METADATA)
+
+    document = hit.to_document()
+
+    assert isinstance(document, SSDocument)
+    assert hit.dict() == document.model_dump()
+    assert hit.dict()["relevance_score"] == pytest.approx(0.5)
+
+
+def test_hit_defaults_for_missing_metadata():
+    """Test the same defaults the document formatting used before."""
+    hit = FASHit("x", 0.1, {})
+
+    assert (hit.text, hit.section_heading, hit.chunk_index) == ("", "", 0)
+    assert isinstance(hit.to_document(), FASDocument)
@@ -0,0 +1,43 @@
+"""
+Test suite for the RetrievalCache.
+"""
+
+import sys
+import os
+import time
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.core.retrieval_cache import RetrievalCache
+
+
+def test_ttl_expiry():
+    """Test that entries expire after the TTL."""
+    cache = RetrievalCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("q", 1, ["doc"])
+    assert cache.get("q", 1) == ["doc"]
+    time.sleep(0.1)
+    assert cache.get("q", 1) is None
+
+
+def test_max_entries_eviction():
+    """Test that the cache never exceeds max_entries and counts evictions."""
+    cache = RetrievalCache(max_entries=2, ttl_seconds=60)
+    for i in range(5):
+        cache.set(f"q{i}", 1, [i])
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 3
+
+
+def test_version_change_clears_entries():
+    """Test version-stamp invalidation and the hit/miss counters."""
+    cache = RetrievalCache(max_entries=10, ttl_seconds=60)
+    cache.set("q", "v1", ["doc"])
+    assert cache.get("q", "v1") == ["doc"]
+    assert cache.get("q", "v2") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 1, 1)
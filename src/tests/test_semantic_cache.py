@@ -0,0 +1,135 @@
+"""
+Test suite for the semantic near-duplicate cache and its use by the ShariahComplianceAgent.
+"""
+
+import sys
+import os
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import numpy as np
+import pytest
+from src.core.semantic_cache import SemanticCache
+from src.agents.shariah_compliance_agent import ShariahComplianceAgent, ComplianceInput
+
+RULE = "Late payment penalties are credited to the bank's income."
+REWORDED = "Late payment penalties shall be credited to the bank's income."
+OTHER = "Profit is distributed according to a pre-agreed ratio."
+SS = "SS 3: late payment penalties must be donated to charity."
+
+# Near-duplicate rules get nearly identical vectors, unrelated rules orthogonal ones
+VECTORS = {RULE: [1.0, 0.0, 0.0], REWORDED: [0.99, 0.1, 0.0], OTHER: [0.0, 0.0, 1.0]}
+
+
+def fake_embeddings():
+    service = Mock()
+    service.embed.side_effect = lambda text: VECTORS[text]
+    service.aembed = AsyncMock(side_effect=lambda text: VECTORS[text])
+    return service
+
+
+def completion(payload):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))])
+
+
+@pytest.fixture
+def agent():
+    """Fixture for a compliance agent with a semantic cache and a mocked gateway."""
+    cache = SemanticCache(threshold=0.97, max_entries=10, embedding_service=fake_embeddings())
+    agent = ShariahComplianceAgent(semantic_cache=cache)
+    agent.client = Mock()
+    agent.client.chat_completion.return_value = completion({
+        "compliance_status": "non_compliant",
+        "justification": "Penalties may not be recognised as income.",
+        "referenced_clauses": ["SS 3/2/1"]
+    })
+    return agent
+
+
+def test_match_respects_threshold_and_context():
+    """Test that only close texts under the same (whitespace-normalized) context are matched."""
+    cache = SemanticCache(threshold=0.97, max_entries=10, embedding_service=fake_embeddings())
+    cache.add(cache.vector(RULE), RULE, SS, {"verdict": 1})
+
+    match = cache.match(cache.vector(REWORDED), "  " + SS.replace(" ", "\n", 1))
+    assert match.payload == {"verdict": 1}
+    assert match.matched_text == RULE
+    assert match.similarity == pytest.approx(0.995, abs=1e-3)
+    assert cache.match(cache.vector(OTHER), SS) is None
+    assert cache.match(cache.vector(REWORDED), "SS 8: Murabaha") is None
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("flipped", [
+    "Late payment penalties are not credited to the bank's income.",
+    "Late payment penalties above 5% are credited to the bank's income.",
+    "Late payment penalties are never credited to the bank's income.",
+])
+def test_flipped_rule_never_matches(flipped):
+    """Test that a negated or re-numbered rule misses even when it embeds identically."""
+    cache = SemanticCache(threshold=0.97, max_entries=10, embedding_service=fake_embeddings())
+    vector = cache.vector(RULE)
+    cache.add(vector, RULE, SS, {"verdict": 1})
+
+    assert cache.match(vector, SS, text=flipped) is None
+    assert cache.match(vector, SS, text=REWORDED).payload == {"verdict": 1}
+
+
+def test_oldest_entries_evicted():
+    """Test that entries beyond max_entries are evicted oldest first."""
+    cache = SemanticCache(threshold=0.97, max_entries=2, embedding_service=fake_embeddings())
+    for index, context in enumerate(["a", "b", "c"]):
+        cache.add(np.array([1.0, 0.0, 0.0], dtype=np.float32), RULE, context, {"i": index})
+
+    assert len(cache) == 2
+    assert cache.match(np.array([1.0, 0.0, 0.0], dtype=np.float32), "a") is None
+    assert cache.match(np.array([1.0, 0.0, 0.0], dtype=np.float32), "c").payload == {"i": 2}
+
+
+def test_near_duplicate_rule_reuses_verdict(agent):
+    """Test that a reworded rule is served from the cache with provenance and no LLM call."""
+    first = agent.check_compliance(ComplianceInput(rule_text=RULE, ss_summary=SS))
+    second = agent.check_compliance(ComplianceInput(rule_text=REWORDED, ss_summary=SS))
+
+    assert agent.client.chat_completion.call_count == 1
+    assert first.cache_provenance is None
+    assert second.compliance_status == first.compliance_status
+    assert second.referenced_clauses == first.referenced_clauses
+    assert second.cache_provenance.source == "semantic_cache"
+    assert second.cache_provenance.matched_rule_text == RULE
+    assert second.cache_provenance.similarity >= 0.97
+
+
+def test_different_rule_or_summary_calls_llm(agent):
+    """Test that unrelated rules and different SS summaries are checked by the LLM."""
+    agent.check_compliance(ComplianceInput(rule_text=RULE, ss_summary=SS))
+    agent.check_compliance(ComplianceInput(rule_text=OTHER, ss_summary=SS))
+    agent.check_compliance(ComplianceInput(rule_text=REWORDED, ss_summary="SS 8: Murabaha"))
+
+    assert agent.client.chat_completion.call_count == 3
+
+
+def test_async_check_uses_cache(agent):
+    """Test that acheck_compliance shares the semantic cache with the sync path."""
+    agent.check_compliance(ComplianceInput(rule_text=RULE, ss_summary=SS))
+    agent.client.achat_completion = AsyncMock()
+
+    result = asyncio.run(agent.acheck_compliance(ComplianceInput(rule_text=REWORDED, ss_summary=SS)))
+
+    assert result.cache_provenance.matched_rule_text == RULE
+    agent.client.achat_completion.assert_not_called()
+
+
+def test_embedding_failure_falls_back_to_llm(agent):
+    """Test that the check still runs when the rule cannot be embedded."""
+    agent.semantic_cache.embedding_service.embed.side_effect = RuntimeError("embeddings down")
+
+    result = agent.check_compliance(ComplianceInput(rule_text=RULE, ss_summary=SS))
+
+    assert result.compliance_status == "non_compliant"
+    assert agent.client.chat_completion.call_count == 1
@@ -0,0 +1,79 @@
+"""
+Test suite for the joint FAS+SS StandardsRetriever.
+"""
+
+import sys
+import os
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core.vector_index import LocalVectorIndex
+from src.agents.fas_retriever import FASRetriever, FASDocument
+from src.agents.ss_retiever import SSRetriever, SSDocument
+from src.agents.standards_retriever import StandardsContext, StandardsRetriever
+
+
+def make_index(doc_id, document_type):
+    """Build a one-chunk local index."""
+    index = LocalVectorIndex()
+    index.upsert([{"id": doc_id, "values": [1.0, 0.0], "metadata": {
+        "text": f"{document_type} text", "document_type": document_type}}])
+    return index
+
+
+def test_retrieve_embeds_once_and_returns_both():
+    """Test that one embedding serves both indexes and typed lists come back."""
+    retriever = StandardsRetriever(
+        fas_retriever=FASRetriever(backend=make_index("fas28#0", "FAS_28_Murabaha_Deferred_Payment_Sales")),
+        ss_retriever=SSRetriever(backend=make_index("ss8#0", "SS_8_Murabahah"))
+    )
+
+    with patch.object(FASRetriever, "embed_query", return_value=[1.0, 0.0]) as fas_embed, \
+            patch.object(SSRetriever, "embed_query", return_value=[1.0, 0.0]) as ss_embed:
+        context = retriever.retrieve("Late payment in Murabaha", top_n=1)
+
+    assert fas_embed.call_count + ss_embed.call_count == 1
+    assert isinstance(context.fas_documents[0], FASDocument)
+    assert isinstance(context.ss_documents[0], SSDocument)
+    assert context.fas_documents[0].id == "fas28#0"
+    assert context.ss_documents[0].id == "ss8#0"
+
+
+def test_context_round_trips_through_json():
+    """Test that a retrieved context serializes to JSON and back, e.g. in an API response."""
+    retriever = StandardsRetriever(
+        fas_retriever=FASRetriever(backend=make_index("fas28#0", "FAS_28_Murabaha_Deferred_Payment_Sales")),
+        ss_retriever=SSRetriever(backend=make_index("ss8#0", "SS_8_Murabahah"))
+    )
+
+    with patch.object(FASRetriever, "embed_query", return_value=[1.0, 0.0]), \
+            patch.object(SSRetriever, "embed_query", return_value=[1.0, 0.0]):
+        context = retriever.retrieve("Late payment in Murabaha", top_n=1)
+
+    restored = StandardsContext.model_validate_json(context.model_dump_json())
+    assert restored == context
+    assert restored.ss_documents[0].document_type == "SS_8_Murabahah"
+
+
+def test_retrieve_shortens_query_for_smaller_index():
+    """Test that the query is embedded for the larger index and shortened for the smaller one."""
+    fas_index = LocalVectorIndex()
+    fas_index.upsert([{"id": "fas28#0", "values": [0.0, 1.0, 0.0, 0.0], "metadata": {"text": "fas"}}])
+    ss_index = LocalVectorIndex()
+    ss_index.upsert([{"id": "ss8#0", "values": [0.0, 1.0], "metadata": {"text": "ss"}}])
+    fas_retriever = FASRetriever(backend=fas_index)
+    ss_retriever = SSRetriever(backend=ss_index)
+    fas_retriever.dimensions, ss_retriever.dimensions = 4, 2
+    retriever = StandardsRetriever(fas_retriever=fas_retriever, ss_retriever=ss_retriever)
+
+    with patch.object(FASRetriever, "embed_query", return_value=[0.0, 0.6, 0.8, 0.0]) as fas_embed, \
+            patch.object(SSRetriever, "embed_query") as ss_embed:
+        context = retriever.retrieve("Late payment in Murabaha", top_n=1)
+
+    assert fas_embed.call_count == 1 and ss_embed.call_count == 0
+    assert context.fas_documents[0].relevance_score == pytest.approx(0.6)
+    # [0.0, 0.6] renormalized to [0.0, 1.0]
+    assert context.ss_documents[0].relevance_score == pytest.approx(1.0)
@@ -0,0 +1,99 @@
+"""
+Test suite for the background retriever warm-up.
+"""
+
+import sys
+import os
+import json
+from unittest.mock import patch
+
+# Add the src directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import pytest
+from src.core.vector_index import LocalVectorIndex
+from src.core.warmup import RetrieverWarmup, load_popular_queries
+from src.agents.fas_retriever import FASRetriever
+from src.agents.ss_retiever import SSRetriever
+from src.orchestators.orch_drafting_shariah_compliant_regulations import SS_CONTEXT_OPTIONS
+
+QUERY_VECTORS = {
+    "liquidity": [1.0, 0.0],
+    "murabaha payment terms": [0.0, 1.0],
+}
+
+
+def fake_embed_many(queries):
+    return [QUERY_VECTORS[query] for query in queries]
+
+
+def make_index():
+    index = LocalVectorIndex()
+    index.upsert([
+        {"id": "a#0", "values": [1.0, 0.1], "metadata": {"text": "liquidity", "document_type": "A"}},
+        {"id": "b#0", "values": [0.1, 1.0], "metadata": {"text": "murabaha", "document_type": "B"}},
+    ])
+    return index
+
+
+@pytest.fixture
+def retrievers():
+    """Fixture to create FAS and SS retrievers on local indexes."""
+    return {"fas": FASRetriever(backend=make_index()), "ss": SSRetriever(backend=make_index())}
+
+
+def test_warmup_fills_result_caches(retrievers):
+    """Test that warmed queries are served from the cache without embedding again."""
+    entries = [
+        {"query": "liquidity"},
+        {"query": "murabaha payment terms", "indexes": ["ss"], "top_n": 1, "adaptive": True},
+    ]
+    with patch.object(FASRetriever, "embed_queries", side_effect=fake_embed_many), \
+            patch.object(SSRetriever, "embed_queries", side_effect=fake_embed_many):
+        warmup = RetrieverWarmup(retrievers, entries)
+        warmup.start()
+        warmup.join(timeout=10)
+
+    status = warmup.status()
+    assert status["state"] == "done"
+    assert status["queries"] == 3 and status["warmed"] == 3 and status["coverage"] == 1.0
+
+    with patch.object(SSRetriever, "embed_query") as embed:
+        hits = retrievers["ss"].retrieve_many(["murabaha payment terms"], top_n=1, adaptive=True)[0]
+    assert embed.call_count == 0
+    assert hits[0].id == "b#0"
+    assert retrievers["fas"].cache_stats()["size"] == 1
+
+
+def test_warmed_query_is_a_hit_for_the_drafting_orchestrator(retrievers):
+    """Test that warming with the orchestrator's SS options serves its retrieve_many call from the cache."""
+    with patch.object(FASRetriever, "embed_queries", side_effect=fake_embed_many), \
+            patch.object(SSRetriever, "embed_queries", side_effect=fake_embed_many):
+        RetrieverWarmup(retrievers, [{"query": "liquidity"}], options={"ss": SS_CONTEXT_OPTIONS}).run()
+
+    with patch.object(SSRetriever, "embed_queries") as embed:
+        hits = retrievers["ss"].retrieve_many(["liquidity"], **SS_CONTEXT_OPTIONS)[0]
+    assert embed.call_count == 0
+    assert hits[0].id == "a#0"
+    assert retrievers["ss"].cache_stats()["hits"] == 1
+
+
+def test_warmup_counts_failures(retrievers):
+    """Test that embedding failures are reported as partial coverage, not raised."""
+    with patch.object(FASRetriever, "embed_queries", side_effect=RuntimeError("no key")), \
+            patch.object(SSRetriever, "embed_queries", side_effect=fake_embed_many):
+        warmup = RetrieverWarmup(retrievers, [{"query": "liquidity"}])
+        warmup.run()
+
+    assert warmup.status()["state"] == "done"
+    assert warmup.warmed == 1 and warmup.failed == 1
+    assert warmup.status()["coverage"] == 0.5
+
+
+def test_load_popular_queries(tmp_path):
+    """Test loading entries and plain strings, and a missing file."""
+    path = tmp_path / "popular_queries.json"
+    path.write_text(json.dumps(["liquidity", {"query": "AML", "indexes": ["ss"]}]))
+
+    assert load_popular_queries(str(path)) == [{"query": "liquidity"}, {"query": "AML", "indexes": ["ss"]}]
+    assert load_popular_queries(str(tmp_path / "missing.json")) == []